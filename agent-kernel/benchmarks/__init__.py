@@ -0,0 +1,4 @@
+"""
+Benchmarks - Performance suite for the agent kernel
+Run `python -m benchmarks.runner` from agent-kernel/; see runner.py.
+"""
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Daemon Benchmark - Cold CLI invocations against the kernel daemon
+Times `cli.py execute` without a daemon, the same command served by a
+running daemon, and requests sent over one persistent client connection.
+
+Usage: python benchmarks/bench_daemon.py [--runs N] [--requests N]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from kernel_client import KernelClient, DaemonUnavailable
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cli.py')
+INPUT = '{"action": "echo", "params": {"message": "bench"}}'
+
+
+def time_cli(runs: int, extra_args) -> float:
+    """Return mean ms per `cli.py execute` process"""
+    command = [sys.executable, CLI, "execute", "--module", "example_module",
+               "--input", INPUT] + extra_args
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000 / runs
+
+
+def time_client(socket_path: str, requests: int) -> float:
+    """Return mean ms per request over one connection"""
+    with KernelClient(socket_path) as client:
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.execute("example_module", "echo", {"message": "bench"})
+        return (time.perf_counter() - start) * 1000 / requests
+
+
+def start_daemon(socket_path: str) -> subprocess.Popen:
+    daemon = subprocess.Popen(
+        [sys.executable, CLI, "serve", "--socket", socket_path],
+        stdout=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            with KernelClient(socket_path) as client:
+                if client.ping():
+                    return daemon
+        except DaemonUnavailable:
+            time.sleep(0.05)
+    daemon.kill()
+    raise RuntimeError("Kernel daemon did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kernel daemon benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="CLI processes per variant")
+    parser.add_argument("--requests", type=int, default=5000,
+                        help="Requests over a persistent connection")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory(prefix="kernel-bench-") as workdir:
+        socket_path = os.path.join(workdir, "kernel.sock")
+        
+        cold = time_cli(args.runs, ["--no-daemon", "--socket", socket_path])
+        daemon = start_daemon(socket_path)
+        try:
+            served = time_cli(args.runs, ["--socket", socket_path])
+            persistent = time_client(socket_path, args.requests)
+        finally:
+            with KernelClient(socket_path) as client:
+                client.shutdown()
+            daemon.wait(timeout=10)
+    
+    print(f"cold CLI (in-process)      {cold:8.2f} ms/call")
+    print(f"CLI via daemon             {served:8.2f} ms/call   {(served - cold) / cold * 100:+6.1f}%")
+    print(f"persistent client          {persistent:8.3f} ms/call   {(persistent - cold) / cold * 100:+6.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
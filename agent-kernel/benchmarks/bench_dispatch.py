@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Dispatch Benchmark - Per-call overhead of KernelCore.execute
+Compares per-call instantiation with hasattr/getattr lookup against
+pooled instances and registration-time dispatch tables.
+
+Usage: python benchmarks/bench_dispatch.py [--calls N] [--init-work N]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from kernel_core import KernelCore, ExecutionResult
+from dispatch import build_dispatch_table
+
+
+class BenchModule:
+    init_work = 0
+    
+    def __init__(self):
+        self._config = {}
+        self._history = []
+        # Stand-in for real constructor work (lookup tables, clients, ...)
+        self._table = {i: str(i) for i in range(self.init_work)}
+    
+    def initialize(self, config):
+        self._config = config
+        return True
+    
+    def run(self, params, context):
+        return params
+
+
+class LegacyKernel:
+    """Kernel using the previous per-call instantiation and attribute lookup"""
+    
+    def __init__(self):
+        self.modules = {}
+        self.execution_count = 0
+    
+    def register_module(self, name, module_class):
+        self.modules[name] = module_class
+        return True
+    
+    def execute(self, module_name, action, params=None, context=None):
+        self.execution_count += 1
+        
+        if module_name not in self.modules:
+            return ExecutionResult.error(f"Module not found: {module_name}")
+        
+        try:
+            module = self.modules[module_name]()
+            
+            if not hasattr(module, action):
+                return ExecutionResult.error(f"Action not found: {action}")
+            
+            method = getattr(module, action)
+            result = method(params or {}, context or {})
+            
+            return ExecutionResult.ok(data=result, metadata={
+                "module": module_name,
+                "action": action,
+                "execution_id": self.execution_count
+            })
+        
+        except Exception as e:
+            return ExecutionResult.error(str(e), metadata={
+                "module": module_name,
+                "action": action,
+                "execution_id": self.execution_count
+            })
+
+
+def measure_dispatch(calls: int):
+    """Return ns per call for the action lookup alone, before and after"""
+    params, context, action = {"value": 1}, {}, "run"
+    
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        module = BenchModule()
+        if hasattr(module, action):
+            getattr(module, action)(params, context)
+    before = (time.perf_counter_ns() - start) / calls
+    
+    table = build_dispatch_table(BenchModule)
+    module = BenchModule()
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        spec = table.get(action)
+        if spec is not None:
+            spec.handler(module, params, context)
+    after = (time.perf_counter_ns() - start) / calls
+    
+    return before, after
+
+
+def measure_execute(kernel, calls: int) -> float:
+    """Return the mean cost of one execute call in nanoseconds"""
+    kernel.register_module("bench", BenchModule)
+    params = {"value": 1}
+    execute = kernel.execute
+    
+    for _ in range(min(calls, 1000)):
+        execute("bench", "run", params)
+    
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        execute("bench", "run", params)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def report(label: str, before: float, after: float):
+    change = (after - before) / before * 100
+    print(f"{label:<28} before {before:8.0f} ns/call   after {after:8.0f} ns/call   {change:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KernelCore.execute dispatch benchmark")
+    parser.add_argument("--calls", type=int, default=200000, help="Calls per variant")
+    parser.add_argument("--init-work", type=int, default=50,
+                        help="Entries built by the module constructor")
+    args = parser.parse_args()
+    
+    print(f"calls per variant: {args.calls}")
+    
+    BenchModule.init_work = 0
+    report("dispatch, trivial __init__", *measure_dispatch(args.calls))
+    report("execute, trivial __init__",
+           measure_execute(LegacyKernel(), args.calls),
+           measure_execute(KernelCore(), args.calls))
+    
+    BenchModule.init_work = args.init_work
+    report(f"dispatch, __init__ x{args.init_work}", *measure_dispatch(args.calls))
+    report(f"execute, __init__ x{args.init_work}",
+           measure_execute(LegacyKernel(), args.calls),
+           measure_execute(KernelCore(), args.calls))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Result Benchmark - Cost of building and serializing ExecutionResult
+Compares the previous dict-backed result with an eager ISO timestamp
+against the slotted result with a lazy timestamp and direct serializer.
+
+Usage: python benchmarks/bench_result.py [--results N]
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import tracemalloc
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from kernel_core import ExecutionResult
+import serialization
+
+
+class LegacyResult:
+    """ExecutionResult as it was before slots and lazy timestamps"""
+    
+    def __init__(self, success, data=None, error=None, metadata=None):
+        self.success = success
+        self.data = data
+        self.error = error
+        self.metadata = metadata or {}
+        self.timestamp = datetime.utcnow().isoformat()
+    
+    def to_dict(self):
+        return {
+            "success": self.success,
+            "data": self.data,
+            "error": self.error,
+            "metadata": self.metadata,
+            "timestamp": self.timestamp
+        }
+    
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+
+def measure_construct(result_class, count: int):
+    """Return (ns per result, bytes per retained result)"""
+    data = {"value": 42}
+    metadata = {"module": "bench", "action": "run"}
+    
+    start = time.perf_counter_ns()
+    for i in range(count):
+        result_class(True, data, None, metadata)
+    elapsed = (time.perf_counter_ns() - start) / count
+    
+    tracemalloc.start()
+    retained = [result_class(True, data, None, metadata) for _ in range(min(count, 100000))]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size / len(retained)
+
+
+def measure_serialize(result_class, count: int, to_buffer: bool = False) -> float:
+    """Return ns per serialized result"""
+    result = result_class(True, {"value": 42, "items": [1, 2, 3]}, None,
+                          {"module": "bench", "action": "run", "execution_id": 1})
+    if to_buffer:
+        buffer = io.StringIO()
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            result.write_json(buffer)
+        return (time.perf_counter_ns() - start) / count
+    
+    to_json = result.to_json
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        to_json()
+    return (time.perf_counter_ns() - start) / count
+
+
+def report(label: str, before: float, after: float, unit: str = "ns/result"):
+    change = (after - before) / before * 100
+    print(f"{label:<24} before {before:8.0f} {unit}   after {after:8.0f} {unit}   {change:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ExecutionResult benchmark")
+    parser.add_argument("--results", type=int, default=1000000, help="Results per variant")
+    args = parser.parse_args()
+    
+    print(f"results per variant: {args.results}   json backend: {serialization.BACKEND}")
+    
+    legacy_ns, legacy_bytes = measure_construct(LegacyResult, args.results)
+    new_ns, new_bytes = measure_construct(ExecutionResult, args.results)
+    report("construct", legacy_ns, new_ns)
+    report("memory per result", legacy_bytes, new_bytes, "bytes    ")
+    report("to_json", measure_serialize(LegacyResult, args.results),
+           measure_serialize(ExecutionResult, args.results))
+    report("write_json (buffer)", measure_serialize(LegacyResult, args.results),
+           measure_serialize(ExecutionResult, args.results, to_buffer=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
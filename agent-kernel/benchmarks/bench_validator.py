@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Validator Benchmark - Cost of validate_execution_request
+Compares the previous per-call re.match and set building against
+precompiled patterns, the cached name verdicts and trusted requests.
+
+Usage: python benchmarks/bench_validator.py [--requests N] [--names N]
+"""
+
+import sys
+import os
+import re
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from input_validator import InputValidator, TrustedRequest, ValidationError
+
+
+class LegacyValidator:
+    """validate_execution_request as it was before precompiled patterns"""
+    
+    @staticmethod
+    def validate_module_name(name):
+        if not isinstance(name, str):
+            raise ValidationError("Module name must be a string")
+        if not name:
+            raise ValidationError("Module name cannot be empty")
+        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_-]*$', name):
+            raise ValidationError("Invalid module name")
+        return True
+    
+    @staticmethod
+    def validate_action(action):
+        if not isinstance(action, str):
+            raise ValidationError("Action must be a string")
+        if not action:
+            raise ValidationError("Action cannot be empty")
+        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', action):
+            raise ValidationError("Invalid action")
+        return True
+    
+    @staticmethod
+    def validate_params(params):
+        if not isinstance(params, dict):
+            raise ValidationError("Parameters must be a dictionary")
+        return True
+    
+    @staticmethod
+    def validate_context(context):
+        if context is None:
+            return True
+        if not isinstance(context, dict):
+            raise ValidationError("Context must be a dictionary")
+        allowed_keys = {"user", "session", "request_id", "permissions", "environment"}
+        extra_keys = set(context.keys()) - allowed_keys
+        if extra_keys:
+            raise ValidationError(f"Unknown context keys: {extra_keys}")
+        return True
+    
+    @staticmethod
+    def validate_execution_request(request):
+        if not isinstance(request, dict):
+            raise ValidationError("Request must be a dictionary")
+        missing = {"module", "action"} - set(request.keys())
+        if missing:
+            raise ValidationError(f"Missing required fields: {missing}")
+        LegacyValidator.validate_module_name(request["module"])
+        LegacyValidator.validate_action(request["action"])
+        LegacyValidator.validate_params(request.get("params", {}))
+        LegacyValidator.validate_context(request.get("context"))
+        return True
+
+
+def build_requests(count: int, names: int):
+    """Requests cycling through `names` distinct module/action pairs"""
+    return [
+        {
+            "module": f"module_{i % names}",
+            "action": f"action_{i % 7}",
+            "params": {"value": i},
+            "context": {"user": "bench", "request_id": str(i)}
+        }
+        for i in range(count)
+    ]
+
+
+def measure(validate, requests) -> float:
+    """Return ns per validated request"""
+    start = time.perf_counter_ns()
+    for request in requests:
+        validate(request)
+    return (time.perf_counter_ns() - start) / len(requests)
+
+
+def report(label: str, before: float, after: float):
+    change = (after - before) / before * 100
+    print(f"{label:<24} before {before:8.0f} ns/request   after {after:8.0f} ns/request   {change:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InputValidator benchmark")
+    parser.add_argument("--requests", type=int, default=500000, help="Requests per variant")
+    parser.add_argument("--names", type=int, default=300, help="Distinct module names")
+    args = parser.parse_args()
+    
+    requests = build_requests(args.requests, args.names)
+    print(f"requests per variant: {args.requests}   distinct modules: {args.names}")
+    
+    legacy = measure(LegacyValidator.validate_execution_request, requests)
+    report("validate request", legacy, measure(InputValidator.validate_execution_request, requests))
+    
+    trusted = [
+        TrustedRequest(r["module"], r["action"], r["params"], r["context"])
+        for r in requests[:args.names * 7]
+    ]
+    trusted = (trusted * (args.requests // len(trusted) + 1))[:args.requests]
+    report("trusted request", legacy, measure(InputValidator.validate_execution_request, trusted))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Benchmark Suite - Kernel hot paths and CLI start-up
+Each case builds its fixture once and returns the operation to time,
+optionally with a teardown that removes the fixture.
+"""
+
+from typing import Callable, Dict, List
+import sys
+import os
+import json
+import shutil
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from kernel_core import KernelCore, ExecutionResult
+from input_validator import validate_input
+from permissions import Permissions
+
+
+class Case:
+    """
+    One benchmark: `setup()` returns the callable that is timed, or a
+    (callable, teardown) pair when the fixture needs cleaning up
+    """
+    
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]], unit: str, description: str):
+        self.name = name
+        self.setup = setup
+        self.unit = unit
+        self.description = description
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, unit: str = "ns"):
+    """Register a micro-benchmark; timings are reported per call"""
+    def register(setup):
+        CASES[name] = Case(name, setup, unit, (setup.__doc__ or "").strip())
+        return setup
+    return register
+
+
+class EchoModule:
+    def echo(self, params, context):
+        return params
+
+
+@case("execute")
+def execute_setup():
+    """KernelCore.execute of a pooled sync action"""
+    kernel = KernelCore()
+    kernel.register_module("bench", EchoModule)
+    params = {"message": "bench", "count": 3}
+    return lambda: kernel.execute("bench", "echo", params)
+
+
+@case("validate_input")
+def validate_input_setup():
+    """validate_input on a full execution request"""
+    request = {
+        "module": "example_module",
+        "action": "echo",
+        "params": {"message": "bench"},
+        "context": {"user": "bench", "request_id": "42"}
+    }
+    return lambda: validate_input(request)
+
+
+@case("check_access")
+def check_access_setup():
+    """Permissions.check_access against wildcard and exact rules"""
+    permissions = Permissions()
+    for index in range(50):
+        permissions.set_user_permissions(
+            f"user{index}", [f"module{index}:*", "shared:read", "reports:*:view"]
+        )
+    permissions.blacklist("user7", ["module7:delete"])
+    pairs = [(f"user{i % 50}", f"module{i % 50}", ("read", "write", "delete")[i % 3]) for i in range(300)]
+    state = {"index": 0}
+    
+    def check():
+        index = state["index"] = (state["index"] + 1) % len(pairs)
+        user, module, action = pairs[index]
+        return permissions.check_access(user, module, action)
+    return check
+
+
+@case("to_json")
+def to_json_setup():
+    """ExecutionResult.to_json of a typical result"""
+    result = ExecutionResult.ok(
+        data={"items": [{"id": i, "name": f"item{i}", "score": i * 0.5} for i in range(10)]},
+        metadata={"module": "example_module", "action": "echo", "execution_id": 1}
+    )
+    return result.to_json
+
+
+CLI_INPUT = '{"action": "echo", "params": {"message": "bench"}}'
+
+
+def cli_command(socket_path: str) -> List[str]:
+    return [
+        sys.executable, os.path.join(ROOT, "cli.py"), "execute",
+        "--module", "example_module", "--input", CLI_INPUT,
+        "--no-daemon", "--socket", socket_path
+    ]
+
+
+@case("cli_cold_start", unit="ms")
+def cli_cold_start_setup():
+    """`cli.py execute --no-daemon` as a fresh process"""
+    workdir = tempfile.mkdtemp(prefix="kernel-bench-")
+    command = cli_command(os.path.join(workdir, "kernel.sock"))
+    # Keep the module index out of the user's cache; the first run builds it
+    env = dict(os.environ, AGENT_KERNEL_INDEX=os.path.join(workdir, "index.json"))
+    
+    def run():
+        completed = subprocess.run(command, env=env, stdout=subprocess.PIPE)
+        if completed.returncode != 0 or not json.loads(completed.stdout)["success"]:
+            raise RuntimeError("cli.py execute failed")
+    
+    def teardown():
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    try:
+        run()
+    except Exception:
+        teardown()
+        raise
+    return run, teardown
@@ -9,23 +9,38 @@ This CLI provides interface to the Kernel agent functionality.
 import sys
 import os
 import json
+import time
 import argparse
+import threading
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from kernel_core import KernelCore, ExecutionResult
-from input_validator import validate_input, ValidationError
-from error_handler import error_handler
-from permissions import permissions
+# The kernel modules are imported lazily: when a daemon is running the CLI
+# only needs the standard-library client, which keeps cold starts short.
+from kernel_client import KernelClient, DaemonUnavailable, default_socket_path
+
+
+def build_kernel():
+    """Create a kernel that discovers installed modules on first use"""
+    from kernel_core import KernelCore
+    from module_locator import ModuleLocator
+    
+    return KernelCore(locator=ModuleLocator())
 
 
 def cmd_execute(args):
-    """Execute a module via Kernel"""
+    """Execute a module via Kernel, through the daemon when one is running"""
+    if args.batch:
+        return batch_execute(args)
+    if not args.module:
+        print(json.dumps({
+            "success": False,
+            "error": "--module is required without --batch"
+        }), file=sys.stderr)
+        return 1
     try:
         # Parse inputs
-        module_name = args.module
-        
         input_data = {}
         if args.input:
             input_data = json.loads(args.input)
@@ -34,64 +49,307 @@ def cmd_execute(args):
         if args.user:
             user_context = json.loads(args.user)
         
-        # Validate input
         request = {
-            "module": module_name,
+            "module": args.module,
             "action": input_data.get("action", "run"),
             "params": input_data.get("params", {}),
             "context": user_context
         }
         
-        validate_input(request)
+        if args.stream:
+            return stream_execute(args, request)
         
-        # Check permissions
-        if user_context.get("user"):
-            permission = f"{module_name}:execute"
-            if not permissions.has_permission(user_context["user"], permission):
-                print(json.dumps({
-                    "success": False,
-                    "error": f"Permission denied: {permission}"
-                }), file=sys.stderr)
-                return 1
+        reply = None
+        if not args.no_daemon:
+            try:
+                with KernelClient(args.socket) as client:
+                    reply = client.execute(**request)
+            except DaemonUnavailable:
+                pass
         
-        # Load and execute module
-        kernel = KernelCore()
+        if reply is None:
+            from kernel_server import execute_request
+            reply = execute_request(build_kernel(), request)
+            if reply["ok"]:
+                reply["result"] = reply["result"].to_dict()
         
-        # Import the module dynamically
-        module_path = os.path.join(os.path.dirname(__file__), 'src')
-        
-        # Try to load from agent-modules as example
-        try:
-            sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'agent-modules', 'src'))
-            from example_module import ExampleModule
-            kernel.register_module("example_module", ExampleModule)
-        except Exception:
-            pass
-        
-        # Execute
-        result = kernel.execute(
-            module_name,
-            input_data.get("action", "run"),
-            input_data.get("params", {}),
-            user_context
-        )
+        if not reply["ok"]:
+            print(json.dumps({
+                "success": False,
+                "error": reply["error"]
+            }), file=sys.stderr)
+            return 1
         
         # Output result
-        print(json.dumps(result.to_dict(), indent=2))
-        return 0 if result.success else 1
+        result = reply["result"]
+        print(json.dumps(result, indent=2))
+        return 0 if result["success"] else 1
         
-    except ValidationError as e:
+    except Exception as e:
         print(json.dumps({
             "success": False,
-            "error": f"Validation error: {str(e)}"
+            "error": f"Execution error: {str(e)}"
         }), file=sys.stderr)
         return 1
-    except Exception as e:
+
+
+def stream_execute(args, request):
+    """
+    Write each chunk as one JSON line as it arrives, then a trailer line
+    
+    The trailer, {"trailer": {...}}, holds the execution's success,
+    error and metadata (including the chunk count).
+    """
+    out = sys.stdout
+    reply = None
+    if not args.no_daemon:
+        try:
+            with KernelClient(args.socket) as client:
+                for message in client.stream(**request):
+                    if "chunk" in message:
+                        out.write(json.dumps(message["chunk"]) + "\n")
+                    else:
+                        reply = message
+        except DaemonUnavailable:
+            pass
+    
+    if reply is None:
+        from kernel_server import execute_request, write_stream
+        reply = execute_request(build_kernel(), request, stream=True)
+        if reply["ok"]:
+            trailer = write_stream(reply.pop("stream"), lambda chunk: out.write(chunk + "\n"))
+            reply["result"] = trailer.to_dict()
+    
+    if not reply["ok"]:
         print(json.dumps({
             "success": False,
-            "error": f"Execution error: {str(e)}"
+            "error": reply["error"]
         }), file=sys.stderr)
         return 1
+    
+    out.write(json.dumps({"trailer": reply["result"]}) + "\n")
+    return 0 if reply["result"]["success"] else 1
+
+
+def batch_request(line, args, user_context):
+    """
+    Request for one batch line
+    
+    Lines are full requests ({"module", "action", "params", "context"}) or,
+    like --input, just {"action", "params"}; --module and --user fill in
+    what a line leaves out.
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("a request must be a JSON object")
+    return {
+        "module": data.get("module", args.module),
+        "action": data.get("action", "run"),
+        "params": data.get("params", {}),
+        "context": data.get("context", user_context)
+    }
+
+
+def batch_executor(args):
+    """
+    Per-request execute function for a batch, and the mode it runs in
+    
+    With a daemon every worker thread keeps its own connection; otherwise
+    one in-process kernel serves all of them.
+    """
+    if not args.no_daemon:
+        try:
+            KernelClient(args.socket).connect().close()
+        except DaemonUnavailable:
+            pass
+        else:
+            local = threading.local()
+            clients = []
+            
+            def execute_remote(request):
+                client = getattr(local, "client", None)
+                if client is None:
+                    client = local.client = KernelClient(args.socket).connect()
+                    clients.append(client)
+                return client.execute(**request)
+            
+            def close():
+                for client in clients:
+                    client.close()
+            return execute_remote, close, "daemon"
+    
+    from kernel_server import execute_request
+    kernel = build_kernel()
+    
+    def execute_local(request):
+        reply = execute_request(kernel, request)
+        if reply["ok"]:
+            reply["result"] = reply["result"].to_dict()
+        return reply
+    return execute_local, kernel.shutdown, "in-process"
+
+
+def batch_execute(args):
+    """
+    Execute JSON Lines requests from a file or stdin in one process
+    
+    Results are written as JSON Lines in input order, or as they complete
+    with --unordered (each line then carries its request's "index").
+    Requests that are rejected before execution (invalid JSON or input,
+    permission denied) are written as {"success": false, "error": ...}.
+    The last line is {"summary": {...}} with counts, error codes and
+    throughput; the exit status is 1 unless every request succeeded.
+    """
+    from collections import deque
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    
+    try:
+        user_context = json.loads(args.user) if args.user else {}
+        source = sys.stdin if args.batch == "-" else open(args.batch, "r")
+    except (OSError, ValueError) as e:
+        print(json.dumps({"success": False, "error": str(e)}), file=sys.stderr)
+        return 1
+    
+    out = sys.stdout
+    execute, close, mode = batch_executor(args)
+    workers = max(1, args.workers)
+    counts = {"requests": 0, "succeeded": 0, "failed": 0, "rejected": 0}
+    error_codes = {}
+    
+    def run(index, line):
+        try:
+            reply = execute(batch_request(line, args, user_context))
+        except Exception as e:
+            reply = {"ok": False, "error": f"Invalid request on line {index + 1}: {e}"}
+        if not reply["ok"]:
+            return index, {"success": False, "error": reply["error"]}
+        return index, reply["result"]
+    
+    def emit(index, result):
+        counts["requests"] += 1
+        if "metadata" not in result:
+            counts["rejected"] += 1
+        elif result["success"]:
+            counts["succeeded"] += 1
+        else:
+            counts["failed"] += 1
+            code = result["metadata"].get("error_code", "unknown")
+            error_codes[code] = error_codes.get(code, 0) + 1
+        if args.unordered:
+            result = dict(result, index=index)
+        out.write(json.dumps(result) + "\n")
+    
+    lines = ((index, line) for index, line in enumerate(source) if line.strip())
+    started = time.perf_counter()
+    try:
+        if workers == 1:
+            for index, line in lines:
+                emit(*run(index, line))
+        else:
+            # Bounded window: the input is read only as fast as results are written
+            window = workers * 4
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                
+                def emit_completed():
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        emit(*future.result())
+                
+                for index, line in lines:
+                    pending.append(pool.submit(run, index, line))
+                    if len(pending) < window:
+                        continue
+                    if args.unordered:
+                        emit_completed()
+                    else:
+                        emit(*pending.popleft().result())
+                while pending:
+                    if args.unordered:
+                        emit_completed()
+                    else:
+                        emit(*pending.popleft().result())
+    finally:
+        close()
+        if source is not sys.stdin:
+            source.close()
+    
+    elapsed = time.perf_counter() - started
+    out.write(json.dumps({"summary": dict(
+        counts,
+        errors=error_codes,
+        mode=mode,
+        workers=workers,
+        elapsed_ms=round(elapsed * 1000, 3),
+        requests_per_second=round(counts["requests"] / elapsed, 1) if elapsed else 0.0
+    )}) + "\n")
+    return 0 if counts["succeeded"] == counts["requests"] else 1
+
+
+def cmd_serve(args):
+    """Run the kernel daemon in the foreground"""
+    import signal
+    from kernel_server import KernelServer
+    
+    server = KernelServer(build_kernel(), args.socket)
+    try:
+        server.bind()
+    except (RuntimeError, OSError) as e:
+        print(json.dumps({"serving": False, "error": str(e)}), file=sys.stderr)
+        return 1
+    
+    # Let `kill` stop the daemon cleanly and remove its socket
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop_async())
+    print(json.dumps({"serving": True, "socket": server.socket_path, "pid": os.getpid()}), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+    return 0
+
+
+def cmd_stop(args):
+    """Stop a running kernel daemon"""
+    try:
+        with KernelClient(args.socket, timeout=5.0) as client:
+            client.shutdown()
+    except DaemonUnavailable as e:
+        print(json.dumps({"stopped": False, "error": str(e)}), file=sys.stderr)
+        return 1
+    print(json.dumps({"stopped": True}))
+    return 0
+
+
+def cmd_stats(args):
+    """Print the latency histograms of a running kernel daemon"""
+    try:
+        with KernelClient(args.socket, timeout=5.0) as client:
+            status = client.status()
+    except DaemonUnavailable as e:
+        print(json.dumps({"success": False, "error": str(e)}), file=sys.stderr)
+        return 1
+    
+    latency = status.get("latency", {})
+    if args.module:
+        latency = {args.module: latency.get(args.module, {})}
+    print(json.dumps({
+        "execution_count": status.get("execution_count", 0),
+        "latency": latency
+    }, indent=2))
+    return 0
+
+
+def cmd_reload(args):
+    """Hot-reload a module's code in the running kernel daemon"""
+    try:
+        with KernelClient(args.socket) as client:
+            report = client.reload(args.module)
+    except DaemonUnavailable as e:
+        print(json.dumps({"success": False, "error": str(e)}), file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2))
+    return 0 if report.get("success") else 1
 
 
 def cmd_validate_module(args):
@@ -151,9 +409,32 @@ def main():
     
     # Execute command
     execute_parser = subparsers.add_parser("execute", help="Execute a module")
-    execute_parser.add_argument("--module", required=True, help="Module name to execute")
+    execute_parser.add_argument("--module", help="Module name to execute (default module in --batch mode)")
     execute_parser.add_argument("--input", help="JSON input data")
     execute_parser.add_argument("--user", help="JSON user context")
+    execute_parser.add_argument("--socket", help=f"Daemon socket (default: {default_socket_path()})")
+    execute_parser.add_argument("--no-daemon", action="store_true",
+                                help="Always execute in-process")
+    execute_parser.add_argument("--stream", action="store_true",
+                                help="Write chunks as JSON Lines, then a trailer line")
+    execute_parser.add_argument("--batch", metavar="FILE",
+                                help="Execute JSON Lines requests from FILE ('-' for stdin)")
+    execute_parser.add_argument("--workers", type=int, default=1,
+                                help="Parallel executions in --batch mode (default: 1)")
+    execute_parser.add_argument("--unordered", action="store_true",
+                                help="Write --batch results as they complete, tagged with their index")
+    
+    # Daemon commands
+    serve_parser = subparsers.add_parser("serve", help="Run the kernel daemon")
+    serve_parser.add_argument("--socket", help="Socket path to listen on")
+    stop_parser = subparsers.add_parser("stop", help="Stop the kernel daemon")
+    stop_parser.add_argument("--socket", help="Daemon socket")
+    stats_parser = subparsers.add_parser("stats", help="Show daemon latency percentiles")
+    stats_parser.add_argument("--socket", help="Daemon socket")
+    stats_parser.add_argument("--module", help="Only show this module")
+    reload_parser = subparsers.add_parser("reload", help="Hot-reload a module in the daemon")
+    reload_parser.add_argument("--module", required=True, help="Module name to reload")
+    reload_parser.add_argument("--socket", help="Daemon socket")
     
     # Validate-module command
     validate_parser = subparsers.add_parser("validate-module", help="Validate a module")
@@ -169,6 +450,14 @@ def main():
         return cmd_execute(args)
     elif args.command == "validate-module":
         return cmd_validate_module(args)
+    elif args.command == "serve":
+        return cmd_serve(args)
+    elif args.command == "stop":
+        return cmd_stop(args)
+    elif args.command == "stats":
+        return cmd_stats(args)
+    elif args.command == "reload":
+        return cmd_reload(args)
     
     return 0
 
@@ -0,0 +1,280 @@
+"""
+Admission - Admission control and backpressure
+Bounds the executions in flight per module and rejects overload early
+"""
+
+from typing import Any, Callable, Dict, Optional
+from collections import deque
+import asyncio
+import threading
+import time
+
+from error_handler import OverloadedError
+
+
+class AdmissionSettings:
+    """Admission limits for a single module"""
+    
+    DEFAULT_QUEUE_TIMEOUT = 1.0
+    DEFAULT_INCREASE = 1.0
+    DEFAULT_DECREASE = 0.9
+    
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = 0,
+        queue_timeout: Optional[float] = DEFAULT_QUEUE_TIMEOUT,
+        adaptive: bool = False,
+        target_latency: Optional[float] = None,
+        min_in_flight: int = 1,
+        increase: float = DEFAULT_INCREASE,
+        decrease: float = DEFAULT_DECREASE
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        if adaptive and not target_latency:
+            raise ValueError("Adaptive admission needs a target_latency")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.min_in_flight = max(1, min(min_in_flight, max_in_flight))
+        self.increase = increase
+        self.decrease = decrease
+    
+    @classmethod
+    def from_manifest(cls, manifest: Optional[Dict]) -> Optional["AdmissionSettings"]:
+        """Read settings from the manifest "runtime.admission" section; None when absent"""
+        runtime = (manifest or {}).get("runtime", {})
+        admission = runtime.get("admission")
+        if not admission:
+            return None
+        return cls(
+            max_in_flight=admission["max_in_flight"],
+            max_queue=admission.get("max_queue", 0),
+            queue_timeout=admission.get("queue_timeout", cls.DEFAULT_QUEUE_TIMEOUT),
+            adaptive=admission.get("adaptive", False),
+            target_latency=admission.get("target_latency"),
+            min_in_flight=admission.get("min_in_flight", 1),
+            increase=admission.get("increase", cls.DEFAULT_INCREASE),
+            decrease=admission.get("decrease", cls.DEFAULT_DECREASE)
+        )
+    
+    def to_dict(self) -> Dict:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "adaptive": self.adaptive,
+            "target_latency": self.target_latency,
+            "min_in_flight": self.min_in_flight
+        }
+
+
+class _Waiter:
+    """A queued thread; woken when a slot is handed to it"""
+    
+    __slots__ = ("_event",)
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def wake(self) -> None:
+        self._event.set()
+    
+    def wait(self, timeout: Optional[float]) -> bool:
+        return self._event.wait(timeout)
+
+
+class _AsyncWaiter:
+    """A queued coroutine; woken from any thread through its event loop"""
+    
+    __slots__ = ("_loop", "_future")
+    
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._future = self._loop.create_future()
+    
+    def wake(self) -> None:
+        self._loop.call_soon_threadsafe(self._set)
+    
+    def _set(self) -> None:
+        if not self._future.done():
+            self._future.set_result(True)
+    
+    async def wait(self, timeout: Optional[float]) -> bool:
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._future), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+
+class AdmissionController:
+    """
+    In-flight limit and bounded FIFO wait queue for one module
+    
+    An execution is admitted while fewer than `limit` are in flight.
+    Otherwise it waits in the queue for at most `queue_timeout` seconds;
+    when the queue is already full it is rejected at once. Both rejections
+    raise OverloadedError. A finished execution hands its slot directly
+    to the oldest waiter, so queued callers are served in arrival order.
+    
+    With `adaptive` set the limit follows AIMD between `min_in_flight` and
+    `max_in_flight`: every execution faster than `target_latency` adds
+    `increase / limit` (about +1 per limit's worth of executions), and a
+    slower one multiplies the limit by `decrease`, at most once per
+    `target_latency` interval.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        settings: AdmissionSettings,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.settings = settings
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._waiters: "deque[Any]" = deque()
+        self._limit = float(settings.max_in_flight)
+        self._in_flight = 0
+        self._next_decrease = 0.0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.peak_queue = 0
+    
+    @property
+    def limit(self) -> int:
+        """Current in-flight limit"""
+        return int(self._limit)
+    
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+    
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+    
+    def _try_enter(self, waiter_factory: Callable[[], Any]) -> Optional[Any]:
+        """Admit, queue or reject under the lock; returns the waiter when queued"""
+        with self._lock:
+            if self._in_flight < int(self._limit) and not self._waiters:
+                self._in_flight += 1
+                self.admitted += 1
+                return None
+            if len(self._waiters) >= self.settings.max_queue:
+                self.rejected += 1
+                raise self._overloaded("queue_full")
+            waiter = waiter_factory()
+            self._waiters.append(waiter)
+            self.queued += 1
+            self.peak_queue = max(self.peak_queue, len(self._waiters))
+            return waiter
+    
+    def _give_up(self, waiter: Any) -> None:
+        """Leave the queue after a timeout, unless a slot was handed over meanwhile"""
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                # Woken between the timeout and here: the slot is ours
+                self.admitted += 1
+                return
+            self.timed_out += 1
+            raise self._overloaded("queue_timeout")
+    
+    def acquire(self) -> None:
+        """Take an execution slot, waiting in the queue if needed"""
+        waiter = self._try_enter(_Waiter)
+        if waiter is None:
+            return
+        if waiter.wait(self.settings.queue_timeout):
+            with self._lock:
+                self.admitted += 1
+            return
+        self._give_up(waiter)
+    
+    async def acquire_async(self) -> None:
+        """acquire() for coroutines; waits without blocking the event loop"""
+        waiter = self._try_enter(_AsyncWaiter)
+        if waiter is None:
+            return
+        try:
+            woken = await waiter.wait(self.settings.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if woken:
+            with self._lock:
+                self.admitted += 1
+            return
+        self._give_up(waiter)
+    
+    def _abandon(self, waiter: Any) -> None:
+        """Drop a cancelled waiter, passing on a slot it was already handed"""
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                return
+            except ValueError:
+                pass
+        self.release()
+    
+    def release(self, elapsed: Optional[float] = None) -> None:
+        """Return a slot; `elapsed` is the execution time in seconds, used by AIMD"""
+        wake = []
+        with self._lock:
+            if elapsed is not None and self.settings.adaptive:
+                self._adapt(elapsed)
+            self._in_flight -= 1
+            # Hand slots straight to waiters: they count as in flight from here on
+            while self._waiters and self._in_flight < int(self._limit):
+                wake.append(self._waiters.popleft())
+                self._in_flight += 1
+        for waiter in wake:
+            waiter.wake()
+    
+    def _adapt(self, elapsed: float) -> None:
+        settings = self.settings
+        if elapsed <= settings.target_latency:
+            self._limit = min(
+                float(settings.max_in_flight),
+                self._limit + settings.increase / self._limit
+            )
+            return
+        now = self._clock()
+        if now >= self._next_decrease:
+            self._limit = max(float(settings.min_in_flight), self._limit * settings.decrease)
+            self._next_decrease = now + settings.target_latency
+    
+    def _overloaded(self, reason: str) -> OverloadedError:
+        return OverloadedError(self.name, reason, {
+            "in_flight": self._in_flight,
+            "limit": int(self._limit),
+            "queued": len(self._waiters),
+            "max_queue": self.settings.max_queue
+        })
+    
+    def get_status(self) -> Dict:
+        """Get admission counters"""
+        with self._lock:
+            return {
+                "settings": self.settings.to_dict(),
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "queue_depth": len(self._waiters),
+                "peak_queue": self.peak_queue,
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out
+            }
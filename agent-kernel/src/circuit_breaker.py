@@ -0,0 +1,289 @@
+"""
+Circuit Breaker - Fail fast while a module keeps failing
+Per-module and per-action breakers tripped by failure-rate windows
+"""
+
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import threading
+import time
+
+from error_handler import CircuitOpenError, ErrorCode
+
+
+# Error codes that count as failures; rejected or invalid calls say nothing
+# about the health of the module's dependencies
+TRIPPING_CODES = frozenset({ErrorCode.EXECUTION_FAILED, ErrorCode.TIMEOUT})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BreakerSettings:
+    """Trip and recovery thresholds of one circuit breaker"""
+    
+    DEFAULT_FAILURE_RATE = 0.5
+    DEFAULT_WINDOW = 30.0
+    DEFAULT_MIN_CALLS = 10
+    DEFAULT_COOL_OFF = 5.0
+    DEFAULT_MAX_COOL_OFF = 300.0
+    DEFAULT_BACKOFF = 2.0
+    DEFAULT_HALF_OPEN_CALLS = 1
+    
+    def __init__(
+        self,
+        failure_rate: float = DEFAULT_FAILURE_RATE,
+        window: float = DEFAULT_WINDOW,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        cool_off: float = DEFAULT_COOL_OFF,
+        max_cool_off: float = DEFAULT_MAX_COOL_OFF,
+        backoff: float = DEFAULT_BACKOFF,
+        half_open_calls: int = DEFAULT_HALF_OPEN_CALLS
+    ):
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be between 0 and 1")
+        if window <= 0 or cool_off <= 0:
+            raise ValueError("window and cool_off must be positive")
+        if min_calls < 1 or half_open_calls < 1:
+            raise ValueError("min_calls and half_open_calls must be at least 1")
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1")
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.cool_off = cool_off
+        self.max_cool_off = max(cool_off, max_cool_off)
+        self.backoff = backoff
+        self.half_open_calls = half_open_calls
+    
+    @classmethod
+    def from_dict(cls, options: Mapping) -> "BreakerSettings":
+        return cls(
+            failure_rate=options.get("failure_rate", cls.DEFAULT_FAILURE_RATE),
+            window=options.get("window", cls.DEFAULT_WINDOW),
+            min_calls=options.get("min_calls", cls.DEFAULT_MIN_CALLS),
+            cool_off=options.get("cool_off", cls.DEFAULT_COOL_OFF),
+            max_cool_off=options.get("max_cool_off", cls.DEFAULT_MAX_COOL_OFF),
+            backoff=options.get("backoff", cls.DEFAULT_BACKOFF),
+            half_open_calls=options.get("half_open_calls", cls.DEFAULT_HALF_OPEN_CALLS)
+        )
+    
+    def to_dict(self) -> Dict:
+        return {
+            "failure_rate": self.failure_rate,
+            "window": self.window,
+            "min_calls": self.min_calls,
+            "cool_off": self.cool_off,
+            "max_cool_off": self.max_cool_off,
+            "backoff": self.backoff,
+            "half_open_calls": self.half_open_calls
+        }
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker over a sliding failure-rate window
+    
+    Closed, outcomes are counted in `window` seconds split into buckets;
+    once at least `min_calls` calls are in the window and the failure rate
+    reaches `failure_rate`, the breaker opens. Open, every call is refused
+    until the cool-off ends; the cool-off starts at `cool_off` seconds and
+    is multiplied by `backoff` each time the breaker re-opens without
+    having closed in between, up to `max_cool_off`. Half-open, up to
+    `half_open_calls` trial calls run: one failure re-opens the breaker,
+    `half_open_calls` successes close it and reset the backoff.
+    
+    acquire() returns a token that release() hands back with the outcome;
+    outcomes of calls started before the last state change are ignored.
+    """
+    
+    BUCKETS = 10
+    
+    def __init__(
+        self,
+        module: str,
+        action: Optional[str],
+        settings: BreakerSettings,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.module = module
+        self.action = action
+        self.settings = settings
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._width = settings.window / self.BUCKETS
+        # [bucket number, calls, failures] per slot of the ring
+        self._buckets: List[List[int]] = [[-1, 0, 0] for _ in range(self.BUCKETS)]
+        self._state = CLOSED
+        self._generation = 0
+        self._retry_at = 0.0
+        self._opens = 0
+        self._trials = 0
+        self._successes = 0
+        self.trips = 0
+        self.rejected = 0
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() >= self._retry_at:
+                return HALF_OPEN
+            return self._state
+    
+    def acquire(self) -> int:
+        """Let a call through or raise CircuitOpenError; returns the token for release()"""
+        with self._lock:
+            if self._state == CLOSED:
+                return self._generation
+            now = self._clock()
+            if self._state == OPEN:
+                if now < self._retry_at:
+                    self.rejected += 1
+                    raise self._open_error(self._retry_at - now)
+                self._change(HALF_OPEN)
+            if self._trials >= self.settings.half_open_calls:
+                self.rejected += 1
+                raise self._open_error(0.0)
+            self._trials += 1
+            return self._generation
+    
+    def release(self, token: int, failed: Optional[bool]) -> None:
+        """Record a call's outcome: True failed, False succeeded, None says nothing"""
+        with self._lock:
+            if token != self._generation:
+                return
+            if self._state == HALF_OPEN:
+                self._trials -= 1
+                if failed:
+                    self._trip()
+                elif failed is not None:
+                    self._successes += 1
+                    if self._successes >= self.settings.half_open_calls:
+                        self._opens = 0
+                        for bucket in self._buckets:
+                            bucket[:] = [-1, 0, 0]
+                        self._change(CLOSED)
+                return
+            if self._state != CLOSED or failed is None:
+                return
+            number = int(self._clock() / self._width)
+            bucket = self._buckets[number % self.BUCKETS]
+            if bucket[0] != number:
+                bucket[:] = [number, 0, 0]
+            bucket[1] += 1
+            if failed:
+                bucket[2] += 1
+                calls, failures = self._window(number)
+                if calls >= self.settings.min_calls and failures >= self.settings.failure_rate * calls:
+                    self._trip()
+    
+    def _window(self, number: int) -> Tuple[int, int]:
+        calls = failures = 0
+        for start, bucket_calls, bucket_failures in self._buckets:
+            if number - self.BUCKETS < start <= number:
+                calls += bucket_calls
+                failures += bucket_failures
+        return calls, failures
+    
+    def _trip(self) -> None:
+        settings = self.settings
+        cool_off = min(settings.max_cool_off, settings.cool_off * settings.backoff ** self._opens)
+        self._opens += 1
+        self.trips += 1
+        self._retry_at = self._clock() + cool_off
+        self._change(OPEN)
+    
+    def _change(self, state: str) -> None:
+        self._state = state
+        self._generation += 1
+        self._trials = 0
+        self._successes = 0
+    
+    def _open_error(self, retry_after: float) -> CircuitOpenError:
+        return CircuitOpenError(self.module, self.action, retry_after)
+    
+    def get_status(self) -> Dict:
+        """Get breaker state and counters"""
+        with self._lock:
+            now = self._clock()
+            state = self._state
+            if state == OPEN and now >= self._retry_at:
+                state = HALF_OPEN
+            calls, failures = self._window(int(now / self._width))
+            status = {
+                "state": state,
+                "calls": calls,
+                "failures": failures,
+                "failure_rate": failures / calls if calls else 0.0,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "consecutive_opens": self._opens,
+                "settings": self.settings.to_dict()
+            }
+            if state == OPEN:
+                status["retry_after_ms"] = round((self._retry_at - now) * 1000, 3)
+            return status
+
+
+def build_breakers(
+    module: str,
+    manifest: Optional[Dict],
+    actions: Sequence[str],
+    clock: Callable[[], float] = time.monotonic
+) -> Dict[str, Tuple[CircuitBreaker, ...]]:
+    """
+    Breakers guarding each action of a module, innermost first
+    
+    The manifest "runtime.circuit_breaker" section sets up one breaker
+    shared by every action of the module. "runtime.actions.<action>.
+    circuit_breaker" gives an action a breaker of its own, with options
+    taken over the module-wide ones; false exempts the action from the
+    module breaker. Actions without breakers are left out.
+    """
+    runtime = (manifest or {}).get("runtime", {})
+    options = runtime.get("circuit_breaker")
+    shared = CircuitBreaker(module, None, BreakerSettings.from_dict(options), clock) if options else None
+    breakers: Dict[str, Tuple[CircuitBreaker, ...]] = {}
+    for action in actions:
+        own = runtime.get("actions", {}).get(action, {}).get("circuit_breaker")
+        if own is False:
+            continue
+        guards = []
+        if own:
+            settings = BreakerSettings.from_dict(dict(options or {}, **own))
+            guards.append(CircuitBreaker(module, action, settings, clock))
+        if shared is not None:
+            guards.append(shared)
+        if guards:
+            breakers[action] = tuple(guards)
+    return breakers
+
+
+def enter(breakers: Sequence[CircuitBreaker]) -> List[int]:
+    """Pass every breaker or raise CircuitOpenError; returns their tokens"""
+    tokens: List[int] = []
+    try:
+        for breaker in breakers:
+            tokens.append(breaker.acquire())
+    except CircuitOpenError:
+        for breaker, token in zip(breakers, tokens):
+            breaker.release(token, None)
+        raise
+    return tokens
+
+
+def leave(
+    breakers: Sequence[CircuitBreaker],
+    tokens: Sequence[int],
+    success: Optional[bool],
+    error_code: Optional[str] = None
+) -> None:
+    """Report a call's outcome to its breakers; `success` None when it never ran"""
+    if success is None:
+        failed = None
+    elif success:
+        failed = False
+    else:
+        failed = True if error_code in TRIPPING_CODES else None
+    for breaker, token in zip(breakers, tokens):
+        breaker.release(token, failed)
@@ -0,0 +1,125 @@
+"""
+Coalescing - Single-flight execution of identical requests
+Concurrent identical requests wait for one execution and share its result
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import threading
+
+
+def _resolve(future: "asyncio.Future[bool]") -> None:
+    if not future.done():
+        future.set_result(True)
+
+
+class Flight:
+    """
+    One execution in flight that identical requests wait on
+    
+    Waiters may be threads or coroutines on any event loop; all of them
+    are woken when the leader lands the result.
+    """
+    
+    __slots__ = ("key", "result", "_event", "_lock", "_futures")
+    
+    def __init__(self, key: str):
+        self.key = key
+        self.result: Any = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._futures: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[bool]"]] = []
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the result lands; False on timeout"""
+        return self._event.wait(timeout)
+    
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """wait() for coroutines; waits without blocking the event loop"""
+        with self._lock:
+            if self._event.is_set():
+                return True
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures.append((loop, future))
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def _land(self, result: Any) -> None:
+        with self._lock:
+            self.result = result
+            self._event.set()
+            futures, self._futures = self._futures, []
+        for loop, future in futures:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # The waiter's loop is closed: nobody is left to wake
+                pass
+
+
+class SingleFlight:
+    """
+    Table of in-flight executions by canonical request key
+    
+    join() makes the first caller for a key the leader; callers arriving
+    while it runs become followers of the same Flight. The leader calls
+    land() with its result, which removes the flight, so the next request
+    for the key starts a fresh execution.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, Flight] = {}
+        self._counters: Dict[Tuple[str, str], List[int]] = {}
+    
+    def join(self, key: str, module: str, action: str) -> Tuple[Flight, bool]:
+        """The flight for `key`, and whether the caller leads it"""
+        with self._lock:
+            counters = self._counters.get((module, action))
+            if counters is None:
+                counters = self._counters[(module, action)] = [0, 0, 0]
+            flight = self._flights.get(key)
+            if flight is not None:
+                counters[1] += 1
+                return flight, False
+            flight = self._flights[key] = Flight(key)
+            counters[0] += 1
+            return flight, True
+    
+    def land(self, flight: Flight, result: Any) -> None:
+        """Publish the leader's result and wake every follower"""
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+        flight._land(result)
+    
+    def gave_up(self, module: str, action: str) -> None:
+        """Count a follower that stopped waiting before the result landed"""
+        with self._lock:
+            self._counters[(module, action)][2] += 1
+    
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+    
+    def get_status(self) -> Dict:
+        """Coalescing counters by module, then action"""
+        with self._lock:
+            counters = sorted((key, list(values)) for key, values in self._counters.items())
+            in_flight = len(self._flights)
+        actions: Dict[str, Dict[str, Dict]] = {}
+        for (module, action), (executions, hits, timed_out) in counters:
+            actions.setdefault(module, {})[action] = {
+                "executions": executions,
+                "hits": hits,
+                "timed_out": timed_out
+            }
+        return {
+            "in_flight": in_flight,
+            "hits": sum(values[1] for _, values in counters),
+            "actions": actions
+        }
@@ -0,0 +1,108 @@
+"""
+Concurrency - Lock-free primitives for the kernel hot path
+Atomic counters and copy-on-write tables shared between threads
+"""
+
+from typing import Any, Dict, Generic, Iterator, List, Mapping, Optional, TypeVar
+from types import MappingProxyType
+import itertools
+import threading
+
+
+V = TypeVar("V")
+
+
+class AtomicCounter:
+    """
+    Monotonic counter safe to increment from many threads without a lock
+    
+    Each increment is a single next() call on itertools.count, which runs
+    entirely in C and cannot be interleaved with another thread's call, so
+    concurrent callers never receive the same value.
+    
+    itertools.count does not expose its position, so the last value handed
+    out is recorded next to it for `value`. The record is a plain store
+    made after next() returns: while increments race, `value` may trail
+    by the ones still being recorded.
+    """
+    
+    def __init__(self, start: int = 0):
+        self._counter = itertools.count(start + 1)
+        self._last = start
+    
+    def increment(self) -> int:
+        """Increment and return the new value"""
+        value = next(self._counter)
+        if value > self._last:
+            self._last = value
+        return value
+    
+    def reserve(self, count: int) -> List[int]:
+        """Increment `count` times and return the values handed out"""
+        values = list(itertools.islice(self._counter, count))
+        if values and values[-1] > self._last:
+            self._last = values[-1]
+        return values
+    
+    @property
+    def value(self) -> int:
+        """Last value handed out"""
+        return self._last
+
+
+class CopyOnWriteMap(Generic[V]):
+    """
+    Read-mostly mapping whose readers never take a lock
+    
+    Writers serialize on a lock, build a new dict and publish it with a
+    single attribute assignment. Readers always see a complete snapshot.
+    """
+    
+    def __init__(self, initial: Optional[Dict[str, V]] = None):
+        self._lock = threading.Lock()
+        self._data: Mapping[str, V] = MappingProxyType(dict(initial or {}))
+    
+    def get(self, key: str, default: Any = None) -> Optional[V]:
+        return self._data.get(key, default)
+    
+    def snapshot(self) -> Mapping[str, V]:
+        """Current immutable view of the mapping"""
+        return self._data
+    
+    def set_if_absent(self, key: str, value: V) -> bool:
+        """Insert `key` unless present; returns True when inserted"""
+        with self._lock:
+            if key in self._data:
+                return False
+            data = dict(self._data)
+            data[key] = value
+            self._data = MappingProxyType(data)
+            return True
+    
+    def replace(self, key: str, value: V) -> Optional[V]:
+        """Insert or replace `key`; returns the previous value"""
+        with self._lock:
+            previous = self._data.get(key)
+            data = dict(self._data)
+            data[key] = value
+            self._data = MappingProxyType(data)
+            return previous
+    
+    def remove(self, key: str) -> Optional[V]:
+        """Remove `key`; returns the removed value"""
+        with self._lock:
+            if key not in self._data:
+                return None
+            data = dict(self._data)
+            value = data.pop(key)
+            self._data = MappingProxyType(data)
+            return value
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
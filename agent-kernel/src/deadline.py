@@ -0,0 +1,62 @@
+"""
+Deadline - Execution deadlines and cooperative cancellation
+Tracks the time budget of one execution and lets actions observe it
+"""
+
+from typing import Optional
+from contextlib import contextmanager
+import threading
+import time
+
+
+class Deadline:
+    """Time budget for one execution"""
+    
+    __slots__ = ("timeout", "started", "cancelled")
+    
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.started = time.monotonic()
+        self.cancelled = False
+    
+    def elapsed(self) -> float:
+        """Seconds since the execution started"""
+        return time.monotonic() - self.started
+    
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative"""
+        return max(0.0, self.timeout - self.elapsed())
+    
+    @property
+    def expired(self) -> bool:
+        """True once the deadline passed or the kernel abandoned the execution"""
+        return self.cancelled or self.elapsed() >= self.timeout
+    
+    def cancel(self) -> None:
+        """Mark the execution as abandoned"""
+        self.cancelled = True
+
+
+_local = threading.local()
+
+
+def current_deadline() -> Optional[Deadline]:
+    """
+    Deadline of the execution running on this thread, if any
+    
+    Long-running sync actions should poll `current_deadline().expired` and
+    stop early: the kernel cannot interrupt a thread, so a timed-out sync
+    action keeps running until it returns on its own.
+    """
+    return getattr(_local, "deadline", None)
+
+
+@contextmanager
+def bind_deadline(deadline: Optional[Deadline]):
+    """Make `deadline` the current deadline for this thread"""
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
@@ -0,0 +1,149 @@
+"""
+Dispatch - Action dispatch tables
+Resolves module actions to callables once, at registration time
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from types import FunctionType, GeneratorType, MappingProxyType
+import inspect
+
+from param_schema import CompiledSchema, compile_schema
+
+
+# BaseModule lifecycle and introspection methods are never exposed as actions
+RESERVED_METHODS = frozenset({
+    "get_manifest",
+    "initialize",
+    "execute",
+    "validate_manifest",
+    "is_initialized",
+    "get_info"
+})
+
+
+class ActionSpec:
+    """
+    Resolved action: the callable invoked as handler(instance, params, context)
+    
+    `is_async` is set for `async def` actions, including async generators;
+    `streams` for generator and async generator actions, whose chunks
+    execute_stream() hands out one at a time. `coalesce` lets identical
+    concurrent requests share a single execution.
+    """
+    
+    __slots__ = (
+        "name", "handler", "is_async", "streams", "timeout", "pure", "cache_ttl", "coalesce", "validator"
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any, Dict, Dict], Any],
+        timeout: Optional[float] = None,
+        pure: bool = False,
+        cache_ttl: Optional[float] = None,
+        validator: Optional[CompiledSchema] = None,
+        coalesce: bool = False
+    ):
+        self.name = name
+        self.handler = handler
+        self.is_async = inspect.iscoroutinefunction(handler) or inspect.isasyncgenfunction(handler)
+        self.streams = inspect.isgeneratorfunction(handler) or inspect.isasyncgenfunction(handler)
+        self.timeout = timeout
+        self.pure = pure
+        self.cache_ttl = cache_ttl
+        self.coalesce = coalesce
+        self.validator = validator
+    
+    def __repr__(self):
+        return f"ActionSpec({self.name})"
+
+
+async def collect_async(chunks: Any) -> List[Any]:
+    """Gather every chunk of an async iterator"""
+    return [chunk async for chunk in chunks]
+
+
+def awaitable(result: Any) -> Awaitable[Any]:
+    """The awaitable behind an async action's return: its coroutine, or all its chunks"""
+    if hasattr(result, "__anext__"):
+        return collect_async(result)
+    return result
+
+
+def materialize(result: Any) -> Any:
+    """A sync action's result, with generator output gathered into a list"""
+    if isinstance(result, GeneratorType):
+        return list(result)
+    return result
+
+
+def _execute_adapter(action: str, is_async: bool = False) -> Callable[[Any, Dict, Dict], Any]:
+    """Route an action through BaseModule.execute(action, params, context)"""
+    if is_async:
+        async def handler(instance, params, context):
+            return await instance.execute(action, params, context)
+    else:
+        def handler(instance, params, context):
+            return instance.execute(action, params, context)
+    handler.__name__ = f"execute_{action}"
+    return handler
+
+
+def build_dispatch_table(
+    module_class: type,
+    manifest: Optional[Dict] = None
+) -> MappingProxyType:
+    """
+    Build a frozen action -> ActionSpec table for a module class
+    
+    Public methods defined on the class are dispatched directly. Actions
+    listed in the manifest without a method of the same name are routed
+    through the module's execute(action, params, context). Methods may be
+    plain functions or `async def` coroutines.
+    
+    Per-action options come from the manifest "runtime" section: module-wide
+    defaults at its top level, overrides under "runtime.actions.<action>".
+    Param schemas under the manifest "params" section are compiled into
+    validators here; an invalid schema raises SchemaError.
+    """
+    manifest = manifest or {}
+    handlers: Dict[str, Callable] = {}
+    
+    for name in dir(module_class):
+        if name.startswith("_") or name in RESERVED_METHODS:
+            continue
+        attr = inspect.getattr_static(module_class, name)
+        if isinstance(attr, FunctionType):
+            handlers[name] = attr
+    
+    execute = getattr(module_class, "execute", None)
+    execute_is_async = inspect.iscoroutinefunction(execute)
+    for action in manifest.get("actions", []):
+        if action in handlers or not callable(execute):
+            continue
+        handlers[action] = _execute_adapter(action, execute_is_async)
+    
+    runtime = manifest.get("runtime", {})
+    schemas = manifest.get("params", {})
+    table = {
+        name: ActionSpec(
+            name,
+            handler,
+            timeout=action_option(runtime, name, "timeout"),
+            pure=bool(action_option(runtime, name, "pure", False)),
+            cache_ttl=action_option(runtime, name, "cache_ttl"),
+            validator=compile_schema(schemas.get(name)),
+            coalesce=bool(action_option(runtime, name, "coalesce", False))
+        )
+        for name, handler in handlers.items()
+    }
+    return MappingProxyType(table)
+
+
+def action_option(runtime: Dict, action: str, key: str, default: Any = None) -> Any:
+    """Look up a per-action runtime option, falling back to the module-wide value"""
+    options = runtime.get("actions", {}).get(action, {})
+    if key in options:
+        return options[key]
+    return runtime.get(key, default)
@@ -3,10 +3,13 @@ Error Handler - Uniform error handling
 Provides consistent error handling across all modules
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
 from datetime import datetime
 import traceback
 import json
+import threading
+import time
 
 
 class ErrorCode:
@@ -19,10 +22,16 @@ class ErrorCode:
     EXECUTION_FAILED = "E005"
     TIMEOUT = "E006"
     INVALID_INPUT = "E007"
+    OVERLOADED = "E008"
+    CIRCUIT_OPEN = "E009"
 
 
 class KernelError(Exception):
-    """Base exception for kernel errors"""
+    """
+    Base exception for kernel errors
+    
+    The timestamp is recorded as an epoch number and formatted on first read.
+    """
     
     def __init__(
         self,
@@ -34,7 +43,11 @@ class KernelError(Exception):
         self.message = message
         self.code = code
         self.details = details or {}
-        self.timestamp = datetime.utcnow().isoformat()
+        self.created = time.time()
+    
+    @property
+    def timestamp(self) -> str:
+        return datetime.utcfromtimestamp(self.created).isoformat()
     
     def to_dict(self) -> Dict:
         return {
@@ -47,12 +60,14 @@ class KernelError(Exception):
 
 class ValidationError(KernelError):
     """Validation error"""
+    
     def __init__(self, message: str, details: Optional[Dict] = None):
         super().__init__(message, ErrorCode.VALIDATION, details)
 
 
 class ModuleNotFoundError(KernelError):
     """Module not found error"""
+    
     def __init__(self, module_name: str):
         super().__init__(
             f"Module not found: {module_name}",
@@ -63,6 +78,7 @@ class ModuleNotFoundError(KernelError):
 
 class ActionNotFoundError(KernelError):
     """Action not found error"""
+    
     def __init__(self, module_name: str, action: str):
         super().__init__(
             f"Action not found: {action} in {module_name}",
@@ -71,8 +87,20 @@ class ActionNotFoundError(KernelError):
         )
 
 
+class ModuleLoadError(KernelError):
+    """Module could not be imported or registered"""
+    
+    def __init__(self, module_name: str, error: Exception, details: Optional[Dict] = None):
+        super().__init__(
+            f"Module failed to load: {module_name}: {error}",
+            ErrorCode.EXECUTION_FAILED,
+            dict(details or {}, module=module_name)
+        )
+
+
 class PermissionDeniedError(KernelError):
     """Permission denied error"""
+    
     def __init__(self, required_permission: str):
         super().__init__(
             f"Permission denied: {required_permission}",
@@ -81,11 +109,140 @@ class PermissionDeniedError(KernelError):
         )
 
 
+class ExecutionTimeoutError(KernelError):
+    """Execution exceeded its deadline"""
+    
+    def __init__(self, module_name: str, action: str, timeout: float, elapsed: float):
+        super().__init__(
+            f"Execution timed out: {action} in {module_name} after {elapsed * 1000:.0f} ms",
+            ErrorCode.TIMEOUT,
+            {
+                "module": module_name,
+                "action": action,
+                "timeout_ms": round(timeout * 1000, 3),
+                "elapsed_ms": round(elapsed * 1000, 3)
+            }
+        )
+
+
+class OverloadedError(KernelError):
+    """Execution rejected by admission control"""
+    
+    def __init__(self, module_name: str, reason: str, details: Optional[Dict] = None):
+        super().__init__(
+            f"Module overloaded: {module_name} ({reason})",
+            ErrorCode.OVERLOADED,
+            dict(details or {}, module=module_name, reason=reason)
+        )
+
+
+class CircuitOpenError(KernelError):
+    """Execution refused by an open circuit breaker"""
+    
+    def __init__(self, module_name: str, action: Optional[str], retry_after: float):
+        scope = f"{module_name}.{action}" if action else module_name
+        super().__init__(
+            f"Circuit open: {scope}",
+            ErrorCode.CIRCUIT_OPEN,
+            {"module": module_name, "action": action, "retry_after_ms": round(retry_after * 1000, 3)}
+        )
+
+
+class ErrorRecord:
+    """
+    One logged error
+    
+    The stack is captured as frame summaries without source lines; the
+    traceback text is only formatted when the record is read.
+    """
+    
+    __slots__ = (
+        "created", "type", "message", "code", "details", "context",
+        "occurrence", "_stack", "_exception_lines", "_traceback"
+    )
+    
+    def __init__(
+        self,
+        exception: BaseException,
+        code: str,
+        details: Dict,
+        context: Dict,
+        occurrence: int,
+        created: float
+    ):
+        self.created = created
+        self.type = type(exception).__name__
+        self.message = str(exception)
+        self.code = code
+        self.details = details
+        self.context = context
+        self.occurrence = occurrence
+        tb = exception.__traceback__
+        self._stack = traceback.StackSummary.extract(
+            traceback.walk_tb(tb), lookup_lines=False
+        ) if tb is not None else None
+        self._exception_lines = traceback.format_exception_only(type(exception), exception)
+        self._traceback: Optional[str] = None
+    
+    @property
+    def traceback(self) -> str:
+        if self._traceback is None:
+            lines = []
+            if self._stack:
+                lines.append("Traceback (most recent call last):\n")
+                lines.extend(self._stack.format())
+            lines.extend(self._exception_lines)
+            self._traceback = "".join(lines)
+            self._stack = None
+        return self._traceback
+    
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": datetime.utcfromtimestamp(self.created).isoformat(),
+            "type": self.type,
+            "message": self.message,
+            "traceback": self.traceback,
+            "context": self.context,
+            "code": self.code,
+            "details": self.details,
+            "occurrence": self.occurrence
+        }
+
+
 class ErrorHandler:
-    """Centralized error handling"""
+    """
+    Centralized error handling
     
-    def __init__(self):
-        self.error_log = []
+    Memory stays bounded however many errors occur:
+    - the history is a ring buffer of the last `capacity` records
+    - every error is counted under (code, exception type, module), with at
+      most `max_aggregates` keys; further keys are counted as overflow
+    - per key, the first `sample_after` errors are recorded, then one in
+      every `sample_every`, so an error storm costs a counter increment
+    """
+    
+    DEFAULT_CAPACITY = 1000
+    DEFAULT_MAX_AGGREGATES = 1024
+    DEFAULT_SAMPLE_AFTER = 10
+    DEFAULT_SAMPLE_EVERY = 100
+    
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        max_aggregates: int = DEFAULT_MAX_AGGREGATES,
+        sample_after: int = DEFAULT_SAMPLE_AFTER,
+        sample_every: int = DEFAULT_SAMPLE_EVERY
+    ):
+        self.capacity = capacity
+        self.max_aggregates = max_aggregates
+        self.sample_after = sample_after
+        self.sample_every = max(1, sample_every)
+        self._lock = threading.Lock()
+        self.error_log: "deque[ErrorRecord]" = deque(maxlen=capacity)
+        self._aggregates: Dict[Tuple[str, str, Optional[str]], List] = {}
+        self.total = 0
+        self.sampled_out = 0
+        self.overflow = 0
     
     def handle(
         self,
@@ -93,37 +250,88 @@ class ErrorHandler:
         context: Optional[Dict] = None
     ) -> Dict:
         """Handle exception and return error response"""
-        error_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "type": type(exception).__name__,
-            "message": str(exception),
-            "traceback": traceback.format_exc(),
-            "context": context or {}
-        }
-        
+        context = context or {}
         if isinstance(exception, KernelError):
-            error_entry["code"] = exception.code
-            error_entry["details"] = exception.details
+            code = exception.code
+            details = exception.details
         else:
-            error_entry["code"] = ErrorCode.UNKNOWN
+            code = ErrorCode.UNKNOWN
+            details = {}
+        module = context.get("module") or details.get("module")
+        key = (code, type(exception).__name__, module)
+        message = str(exception)
+        created = time.time()
+        
+        with self._lock:
+            self.total += 1
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                if len(self._aggregates) < self.max_aggregates:
+                    # [count, first seen, last seen, last message]
+                    aggregate = self._aggregates[key] = [0, created, created, None]
+                else:
+                    self.overflow += 1
+            if aggregate is not None:
+                aggregate[0] += 1
+                aggregate[2] = created
+                aggregate[3] = message
+                occurrence = aggregate[0]
+            else:
+                occurrence = self.overflow
+            record = occurrence <= self.sample_after or occurrence % self.sample_every == 0
+            if not record:
+                self.sampled_out += 1
         
-        self.error_log.append(error_entry)
+        if record:
+            entry = ErrorRecord(exception, code, details, context, occurrence, created)
+            with self._lock:
+                self.error_log.append(entry)
         
         return {
             "success": False,
-            "error": error_entry["message"],
-            "code": error_entry.get("code", ErrorCode.UNKNOWN),
-            "details": error_entry.get("details", {}),
-            "timestamp": error_entry["timestamp"]
+            "error": message,
+            "code": code,
+            "details": details,
+            "timestamp": datetime.utcfromtimestamp(created).isoformat()
         }
     
     def get_error_history(self) -> list:
-        """Get error history"""
-        return self.error_log
+        """Get recorded errors, oldest first; tracebacks are formatted here"""
+        with self._lock:
+            records = list(self.error_log)
+        return [record.to_dict() for record in records]
+    
+    def get_error_stats(self) -> Dict:
+        """Get error counts by (code, type, module)"""
+        with self._lock:
+            aggregates = [
+                {
+                    "code": code,
+                    "type": type_name,
+                    "module": module,
+                    "count": count,
+                    "first_seen": datetime.utcfromtimestamp(first).isoformat(),
+                    "last_seen": datetime.utcfromtimestamp(last).isoformat(),
+                    "last_message": message
+                }
+                for (code, type_name, module), (count, first, last, message) in self._aggregates.items()
+            ]
+            return {
+                "total": self.total,
+                "recorded": len(self.error_log),
+                "sampled_out": self.sampled_out,
+                "overflow": self.overflow,
+                "errors": sorted(aggregates, key=lambda a: -a["count"])
+            }
     
     def clear_history(self):
-        """Clear error history"""
-        self.error_log = []
+        """Clear error history and counters"""
+        with self._lock:
+            self.error_log.clear()
+            self._aggregates.clear()
+            self.total = 0
+            self.sampled_out = 0
+            self.overflow = 0
 
 
 error_handler = ErrorHandler()
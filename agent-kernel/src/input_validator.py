@@ -4,14 +4,72 @@ Ensures all inputs conform to the kernel contract
 """
 
 from typing import Any, Dict, List, Optional
+from functools import lru_cache
 import re
 
+from param_schema import CompiledSchema
+
 
 class ValidationError(Exception):
     """Raised when validation fails"""
     pass
 
 
+MODULE_NAME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*$')
+ACTION_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_]*$')
+CONTEXT_KEYS = frozenset({"user", "session", "request_id", "permissions", "environment"})
+
+# Module and action names repeat across requests; their verdicts are cached
+NAME_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _module_name_error(name: str) -> Optional[str]:
+    if not name:
+        return "Module name cannot be empty"
+    if not MODULE_NAME_PATTERN.match(name):
+        return "Module name must start with letter and contain only alphanumeric, underscore, or hyphen"
+    return None
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _action_error(action: str) -> Optional[str]:
+    if not action:
+        return "Action cannot be empty"
+    if not ACTION_PATTERN.match(action):
+        return "Action must start with letter and contain only alphanumeric or underscore"
+    return None
+
+
+class TrustedRequest(dict):
+    """
+    Execution request validated once, when it is built
+    
+    In-process callers that issue the same request many times build it as
+    a TrustedRequest; validate_execution_request accepts it without checking
+    it again. It cannot be modified after construction.
+    """
+    
+    def __init__(
+        self,
+        module: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None
+    ):
+        request = {"module": module, "action": action, "params": params or {}}
+        if context is not None:
+            request["context"] = context
+        InputValidator.validate_execution_request(request)
+        super().__init__(request)
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("TrustedRequest cannot be modified")
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    update = pop = popitem = clear = setdefault = _readonly
+
+
 class InputValidator:
     """Validates input according to kernel standards"""
     
@@ -20,12 +78,9 @@ class InputValidator:
         """Validate module name format"""
         if not isinstance(name, str):
             raise ValidationError("Module name must be a string")
-        if not name:
-            raise ValidationError("Module name cannot be empty")
-        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_-]*$', name):
-            raise ValidationError(
-                "Module name must start with letter and contain only alphanumeric, underscore, or hyphen"
-            )
+        error = _module_name_error(name)
+        if error:
+            raise ValidationError(error)
         return True
     
     @staticmethod
@@ -33,17 +88,18 @@ class InputValidator:
         """Validate action name format"""
         if not isinstance(action, str):
             raise ValidationError("Action must be a string")
-        if not action:
-            raise ValidationError("Action cannot be empty")
-        if not re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', action):
-            raise ValidationError(
-                "Action must start with letter and contain only alphanumeric or underscore"
-            )
+        error = _action_error(action)
+        if error:
+            raise ValidationError(error)
         return True
     
     @staticmethod
-    def validate_params(params: Any, required_keys: Optional[List[str]] = None) -> bool:
-        """Validate parameters dictionary"""
+    def validate_params(
+        params: Any,
+        required_keys: Optional[List[str]] = None,
+        schema: Optional[CompiledSchema] = None
+    ) -> bool:
+        """Validate parameters dictionary, optionally against a compiled schema"""
         if not isinstance(params, dict):
             raise ValidationError("Parameters must be a dictionary")
         
@@ -52,6 +108,11 @@ class InputValidator:
             if missing:
                 raise ValidationError(f"Missing required keys: {missing}")
         
+        if schema is not None:
+            errors = schema.validate(params)
+            if errors:
+                raise ValidationError("; ".join(errors))
+        
         return True
     
     @staticmethod
@@ -62,8 +123,7 @@ class InputValidator:
         if not isinstance(context, dict):
             raise ValidationError("Context must be a dictionary")
         
-        allowed_keys = {"user", "session", "request_id", "permissions", "environment"}
-        extra_keys = set(context.keys()) - allowed_keys
+        extra_keys = context.keys() - CONTEXT_KEYS
         if extra_keys:
             raise ValidationError(f"Unknown context keys: {extra_keys}")
         
@@ -71,7 +131,9 @@ class InputValidator:
     
     @staticmethod
     def validate_execution_request(request: Dict) -> bool:
-        """Validate complete execution request"""
+        """Validate complete execution request; TrustedRequest instances are already valid"""
+        if type(request) is TrustedRequest:
+            return True
         if not isinstance(request, dict):
             raise ValidationError("Request must be a dictionary")
         
@@ -86,6 +148,23 @@ class InputValidator:
         InputValidator.validate_context(request.get("context"))
         
         return True
+    
+    @staticmethod
+    def validate_batch(requests: List[Any]) -> List[Optional[str]]:
+        """
+        Validate many execution requests in one pass
+        
+        Returns one entry per request: None when the request is valid,
+        otherwise the validation error message.
+        """
+        errors = []
+        for request in requests:
+            try:
+                InputValidator.validate_execution_request(request)
+                errors.append(None)
+            except ValidationError as e:
+                errors.append(str(e))
+        return errors
 
 
 def validate_input(request: Dict) -> bool:
@@ -0,0 +1,236 @@
+"""
+Interceptors - Middleware around kernel executions
+Composable hooks for permissions, error handling, logging and history
+"""
+
+from typing import Any, Callable, Sequence
+import asyncio
+import time
+
+from error_handler import KernelError, ErrorCode, PermissionDeniedError
+
+
+# An interceptor is called as
+#
+#     interceptor(call, module_name, action, params, context, timeout)
+#
+# and returns an ExecutionResult, normally the one returned by
+# call(module_name, action, params, context, timeout). It may change the
+# arguments, short-circuit with its own result, or inspect the result.
+#
+# The async entry points await an interceptor's
+#
+#     async def intercept_async(call, module_name, action, params, context, timeout)
+#
+# method when it has one, with `call` a coroutine function; the chain then
+# runs on the event loop and holds no thread. An interceptor without it
+# runs on a pool thread for as long as its call takes.
+
+Interceptor = Callable[..., Any]
+
+
+def compose(interceptors: Sequence[Interceptor], core: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Fold interceptors around `core` into one callable
+    
+    The first interceptor is the outermost. Composition happens once, when
+    the chain changes, so a call only pays for the interceptors themselves.
+    """
+    call = core
+    for interceptor in reversed(interceptors):
+        call = _link(interceptor, call)
+    return call
+
+
+def compose_async(
+    interceptors: Sequence[Interceptor],
+    core: Callable[..., Any],
+    executor: Callable[[], Any]
+) -> Callable[..., Any]:
+    """
+    Fold interceptors around the coroutine function `core`
+    
+    Interceptors with intercept_async are awaited on the running loop.
+    Plain ones run on the pool returned by executor(), and their call
+    waits there for the rest of the chain to finish on the loop.
+    """
+    call = core
+    for interceptor in reversed(interceptors):
+        call = _link_async(interceptor, call, executor)
+    return call
+
+
+def holds_threads(interceptors: Sequence[Interceptor]) -> bool:
+    """Whether an async chain of `interceptors` ties up a pool thread while it runs"""
+    return any(getattr(interceptor, "intercept_async", None) is None for interceptor in interceptors)
+
+
+def _link(interceptor: Interceptor, call: Callable[..., Any]) -> Callable[..., Any]:
+    def step(module_name, action, params=None, context=None, timeout=None):
+        return interceptor(call, module_name, action, params, context, timeout)
+    step.__name__ = getattr(interceptor, "__name__", type(interceptor).__name__)
+    return step
+
+
+def _link_async(interceptor: Interceptor, call: Callable[..., Any], executor: Callable[[], Any]) -> Callable[..., Any]:
+    intercept = getattr(interceptor, "intercept_async", None)
+    if intercept is not None:
+        async def step(module_name, action, params=None, context=None, timeout=None):
+            return await intercept(call, module_name, action, params, context, timeout)
+    else:
+        async def step(module_name, action, params=None, context=None, timeout=None):
+            loop = asyncio.get_running_loop()
+            
+            def blocking_call(module_name, action, params=None, context=None, timeout=None):
+                return asyncio.run_coroutine_threadsafe(
+                    call(module_name, action, params, context, timeout), loop
+                ).result()
+            
+            return await loop.run_in_executor(
+                executor(), interceptor, blocking_call, module_name, action, params, context, timeout
+            )
+    step.__name__ = getattr(interceptor, "__name__", type(interceptor).__name__)
+    return step
+
+
+def _error_from_result(result: Any) -> KernelError:
+    metadata = result.metadata or {}
+    return KernelError(
+        result.error or "Execution failed",
+        metadata.get("error_code", ErrorCode.EXECUTION_FAILED),
+        metadata.get("error_details")
+    )
+
+
+class PermissionInterceptor:
+    """
+    Deny executions the context's user may not run
+    
+    Checks `<module>:<action>` with Permissions.check_access. Requests
+    without a user are let through unless `require_user` is set.
+    """
+    
+    def __init__(self, permissions: Any = None, require_user: bool = False):
+        if permissions is None:
+            from permissions import permissions
+        self.permissions = permissions
+        self.require_user = require_user
+    
+    def __call__(self, call, module_name, action, params, context, timeout):
+        denied = self._check(module_name, action, context)
+        if denied is not None:
+            return denied
+        return call(module_name, action, params, context, timeout)
+    
+    async def intercept_async(self, call, module_name, action, params, context, timeout):
+        denied = self._check(module_name, action, context)
+        if denied is not None:
+            return denied
+        return await call(module_name, action, params, context, timeout)
+    
+    def _check(self, module_name, action, context) -> Any:
+        """The denial result, or None when the execution may run"""
+        user = (context or {}).get("user")
+        if user is None and not self.require_user:
+            return None
+        if user is None or not self.permissions.check_access(user, module_name, action, context):
+            from kernel_core import ExecutionResult
+            return ExecutionResult.from_exception(
+                PermissionDeniedError(f"{module_name}:{action}"),
+                {"module": module_name, "action": action}
+            )
+        return None
+
+
+class ErrorHandlerInterceptor:
+    """Report failed executions to an ErrorHandler"""
+    
+    def __init__(self, handler: Any = None):
+        if handler is None:
+            from error_handler import error_handler as handler
+        self.handler = handler
+    
+    def __call__(self, call, module_name, action, params, context, timeout):
+        return self._report(module_name, action, call(module_name, action, params, context, timeout))
+    
+    async def intercept_async(self, call, module_name, action, params, context, timeout):
+        return self._report(module_name, action, await call(module_name, action, params, context, timeout))
+    
+    def _report(self, module_name, action, result) -> Any:
+        if not result.success:
+            self.handler.handle(
+                _error_from_result(result),
+                {"module": module_name, "action": action, "execution_id": result.metadata.get("execution_id")}
+            )
+        return result
+
+
+class LoggingInterceptor:
+    """
+    Log every execution to an observability logger
+    
+    Any object with info() and error() methods taking (message, module,
+    execution_id, metadata) works, e.g. agent-observability's `logger`.
+    """
+    
+    def __init__(self, logger: Any):
+        self.logger = logger
+    
+    def __call__(self, call, module_name, action, params, context, timeout):
+        started = time.perf_counter()
+        result = call(module_name, action, params, context, timeout)
+        return self._log(module_name, action, started, result)
+    
+    async def intercept_async(self, call, module_name, action, params, context, timeout):
+        started = time.perf_counter()
+        result = await call(module_name, action, params, context, timeout)
+        return self._log(module_name, action, started, result)
+    
+    def _log(self, module_name, action, started, result) -> Any:
+        metadata = {
+            "action": action,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+        execution_id = result.metadata.get("execution_id")
+        execution_id = None if execution_id is None else str(execution_id)
+        if result.success:
+            self.logger.info(f"Executed {module_name}.{action}", module_name, execution_id, metadata)
+        else:
+            metadata["error"] = result.error
+            metadata["error_code"] = result.metadata.get("error_code")
+            self.logger.error(f"Failed {module_name}.{action}", module_name, execution_id, metadata)
+        return result
+
+
+class HistoryInterceptor:
+    """
+    Record every execution in an observability history
+    
+    Any object with start_execution(module, action, params, context) and
+    end_execution(execution_id, result, status, duration_ms) works, e.g.
+    agent-observability's `history`.
+    """
+    
+    def __init__(self, history: Any):
+        self.history = history
+    
+    def __call__(self, call, module_name, action, params, context, timeout):
+        execution_id = self.history.start_execution(module_name, action, params or {}, context or {})
+        started = time.perf_counter()
+        result = call(module_name, action, params, context, timeout)
+        return self._end(execution_id, started, result)
+    
+    async def intercept_async(self, call, module_name, action, params, context, timeout):
+        execution_id = self.history.start_execution(module_name, action, params or {}, context or {})
+        started = time.perf_counter()
+        result = await call(module_name, action, params, context, timeout)
+        return self._end(execution_id, started, result)
+    
+    def _end(self, execution_id, started, result) -> Any:
+        self.history.end_execution(
+            execution_id,
+            result.to_dict(),
+            "success" if result.success else "failed",
+            (time.perf_counter() - started) * 1000
+        )
+        return result
@@ -0,0 +1,158 @@
+"""
+Kernel Client - Client for the kernel daemon
+Sends JSON-lines requests to a running kernel server over a Unix socket
+"""
+
+from typing import Any, Dict, Iterator, Optional
+import json
+import os
+import socket
+import tempfile
+
+
+SOCKET_ENV = "AGENT_KERNEL_SOCKET"
+
+
+def default_socket_path() -> str:
+    """
+    Socket path from AGENT_KERNEL_SOCKET, else a path in the per-user
+    XDG_RUNTIME_DIR, else a per-user path in the temp dir
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "agent-kernel.sock")
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"agent-kernel-{user}.sock")
+
+
+class DaemonUnavailable(ConnectionError):
+    """No kernel daemon is listening on the socket"""
+
+
+class KernelClient:
+    """
+    Connection to a kernel daemon
+    
+    This module only imports the standard library, so a client pays for
+    neither the kernel imports nor module registration. One connection
+    carries any number of requests, answered in order.
+    """
+    
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+    
+    def connect(self) -> "KernelClient":
+        if self._sock is not None:
+            return self
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonUnavailable("Unix domain sockets are not supported on this platform")
+        if hasattr(os, "getuid"):
+            # The temp dir is shared: never talk to a socket another user planted
+            try:
+                owner = os.stat(self.socket_path).st_uid
+            except FileNotFoundError as e:
+                raise DaemonUnavailable(f"Kernel daemon not running at {self.socket_path}") from e
+            if owner != os.getuid():
+                raise DaemonUnavailable(f"Kernel daemon socket {self.socket_path} is owned by another user")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            sock.close()
+            raise DaemonUnavailable(f"Kernel daemon not running at {self.socket_path}") from e
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        return self
+    
+    def close(self) -> None:
+        if self._sock is None:
+            return
+        self._reader.close()
+        self._sock.close()
+        self._sock = None
+        self._reader = None
+    
+    def __enter__(self) -> "KernelClient":
+        return self.connect()
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def request(self, message: Dict) -> Dict:
+        """Send one request and return the server's reply envelope"""
+        self.connect()
+        self._sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("Kernel daemon closed the connection")
+        return json.loads(line)
+    
+    def execute(
+        self,
+        module: str,
+        action: str = "run",
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None
+    ) -> Dict:
+        """Execute an action on the daemon; returns the reply envelope"""
+        return self.request({
+            "op": "execute",
+            "module": module,
+            "action": action,
+            "params": params or {},
+            "context": context or {}
+        })
+    
+    def stream(
+        self,
+        module: str,
+        action: str = "run",
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None
+    ) -> Iterator[Dict]:
+        """
+        Execute a streaming action on the daemon
+        
+        Yields one {"chunk": ...} message per chunk as it arrives, then the
+        reply envelope holding the trailer. Consume it to the end, or close
+        the client: unread chunks would otherwise be taken as the replies
+        to later requests.
+        """
+        self.connect()
+        self._sock.sendall(json.dumps({
+            "op": "stream",
+            "module": module,
+            "action": action,
+            "params": params or {},
+            "context": context or {}
+        }).encode("utf-8") + b"\n")
+        while True:
+            line = self._reader.readline()
+            if not line:
+                self.close()
+                raise ConnectionError("Kernel daemon closed the connection")
+            message = json.loads(line)
+            yield message
+            if "chunk" not in message:
+                return
+    
+    def reload(self, module: str) -> Dict[str, Any]:
+        """Hot-reload a module's code in the daemon; returns the reload report"""
+        return self.request({"op": "reload", "module": module}).get("result", {})
+    
+    def ping(self) -> bool:
+        return self.request({"op": "ping"}).get("ok", False)
+    
+    def status(self) -> Dict[str, Any]:
+        return self.request({"op": "status"}).get("result", {})
+    
+    def shutdown(self) -> None:
+        self.request({"op": "shutdown"})
@@ -3,111 +3,1991 @@ Kernel Core - Official execution contract
 Defines the standard interface for all module executions
 """
 
-from typing import Any, Dict, Optional
-from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, TextIO, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from types import GeneratorType
+import asyncio
 import json
+import os
+import queue
+import threading
+import time
+
+from module_pool import ModulePool, PoolSettings
+from dispatch import awaitable, build_dispatch_table, materialize
+from input_validator import InputValidator
+from concurrency import AtomicCounter, CopyOnWriteMap
+from process_pool import IsolationSettings, ProcessPool
+from error_handler import (
+    ErrorCode, KernelError, ExecutionTimeoutError, ModuleLoadError, ModuleNotFoundError, OverloadedError,
+    ValidationError
+)
+from deadline import Deadline, bind_deadline
+from result_cache import ResultCache, MISS, canonical_key
+from serialization import format_timestamp
+from module_locator import ModuleLocator, reimport_class, release_import
+from interceptors import compose, compose_async, holds_threads
+from latency import LatencyRecorder
+from admission import AdmissionController, AdmissionSettings
+from circuit_breaker import build_breakers
+import circuit_breaker
+from coalescing import Flight, SingleFlight
+from workflow import Workflow, WorkflowResult
+import serialization
+
+
+_encode = json.JSONEncoder().encode
+
+# Returned by KernelCore._next_chunk once a generator is exhausted
+_END = object()
+
+
+def _action_not_found(module_name: str, action: str) -> KernelError:
+    # ActionNotFoundError words its message differently from what callers match on
+    return KernelError(
+        f"Action not found: {action}",
+        ErrorCode.ACTION_NOT_FOUND,
+        {"module": module_name, "action": action}
+    )
+
+
+def _settle(future: "asyncio.Future[Any]", value: Any) -> None:
+    if not future.done():
+        future.set_result(value)
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+async def _drain_loop() -> None:
+    """Stop the running loop once every other task on it is done"""
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    await asyncio.gather(*pending, return_exceptions=True)
+    asyncio.get_running_loop().stop()
+
+
+# Marks the threads of KernelCore's deadline pool
+_deadline_thread = threading.local()
+
+
+def _mark_deadline_thread() -> None:
+    _deadline_thread.active = True
+
+
+class _ErrorField:
+    """
+    `ExecutionResult.error(...)` builds an error result while `result.error`
+    holds the error message. A slotted class cannot keep both under one
+    name, so this descriptor dispatches on class versus instance access.
+    """
+    
+    def __get__(self, instance, owner):
+        if instance is None:
+            return owner._error_result
+        return instance._error
+    
+    def __set__(self, instance, value):
+        instance._error = value
 
 
 class ExecutionResult:
-    """Standardized execution result format"""
+    """
+    Standardized execution result format
+    
+    The timestamp is kept as an epoch number and only formatted as ISO 8601
+    when it is read or serialized.
+    """
+    
+    __slots__ = ("success", "data", "_error", "metadata", "created")
+    
+    error = _ErrorField()
     
     def __init__(
         self,
         success: bool,
         data: Any = None,
         error: Optional[str] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        timestamp: Optional[float] = None
     ):
         self.success = success
         self.data = data
-        self.error = error
+        self._error = error
         self.metadata = metadata or {}
-        self.timestamp = datetime.utcnow().isoformat()
+        self.created = time.time() if timestamp is None else timestamp
+    
+    @property
+    def timestamp(self) -> str:
+        return format_timestamp(self.created)
     
     def to_dict(self) -> Dict:
         return {
             "success": self.success,
             "data": self.data,
-            "error": self.error,
+            "error": self._error,
             "metadata": self.metadata,
             "timestamp": self.timestamp
         }
     
     def to_json(self) -> str:
-        return json.dumps(self.to_dict())
+        if serialization.orjson is not None:
+            return serialization.encode(self.to_dict())
+        return "".join(self._json_parts())
+    
+    def write_json(self, buffer: TextIO) -> None:
+        """Serialize straight into a text buffer without building the document string"""
+        if serialization.orjson is not None:
+            buffer.write(serialization.encode(self.to_dict()))
+            return
+        for part in self._json_parts():
+            buffer.write(part)
+    
+    def _json_parts(self) -> Tuple[str, ...]:
+        # Same output as json.dumps(self.to_dict()), without the intermediate dict
+        return (
+            '{"success": true, "data": ' if self.success else '{"success": false, "data": ',
+            _encode(self.data),
+            ', "error": ',
+            _encode(self._error),
+            ', "metadata": ',
+            _encode(self.metadata),
+            ', "timestamp": "',
+            self.timestamp,
+            '"}'
+        )
     
     @classmethod
     def ok(cls, data: Any = None, metadata: Optional[Dict] = None) -> "ExecutionResult":
         return cls(success=True, data=data, metadata=metadata)
     
     @classmethod
-    def error(cls, error: str, metadata: Optional[Dict] = None) -> "ExecutionResult":
+    def _error_result(cls, error: str, metadata: Optional[Dict] = None) -> "ExecutionResult":
         return cls(success=False, error=error, metadata=metadata)
+    
+    @classmethod
+    def from_exception(
+        cls,
+        exception: Exception,
+        metadata: Optional[Dict] = None,
+        timestamp: Optional[float] = None
+    ) -> "ExecutionResult":
+        """Error result carrying the exception's error code and details"""
+        metadata = dict(metadata or {})
+        if isinstance(exception, KernelError):
+            metadata["error_code"] = exception.code
+            if exception.details:
+                metadata["error_details"] = exception.details
+        else:
+            metadata["error_code"] = ErrorCode.EXECUTION_FAILED
+        return cls(success=False, error=str(exception), metadata=metadata, timestamp=timestamp)
+
+
+class ExecutionStream:
+    """
+    Output of one execution, handed out chunk by chunk
+    
+    The action runs as the caller iterates: each next() pulls one chunk
+    and the module instance stays leased until the stream ends or is
+    closed. Iteration never raises. Once it stops, `result` holds the
+    trailer, an ExecutionResult without data whose metadata carries the
+    chunk count and whose error explains an early end, if any.
+    """
+    
+    __slots__ = ("metadata", "chunks", "result", "_chunks", "_on_finish")
+    
+    def __init__(self, chunks: Any, metadata: Dict, on_finish: Optional[Callable[[ExecutionResult], None]] = None):
+        self.metadata = metadata
+        self.chunks = 0
+        self.result: Optional[ExecutionResult] = None
+        self._chunks = chunks
+        self._on_finish = on_finish
+    
+    @classmethod
+    def failed(cls, result: ExecutionResult) -> "ExecutionStream":
+        """A stream that produces nothing, for executions that could not start"""
+        stream = cls(None, result.metadata)
+        stream.result = result
+        return stream
+    
+    def __iter__(self) -> "ExecutionStream":
+        return self
+    
+    def __next__(self) -> Any:
+        if self._chunks is None:
+            raise StopIteration
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._finish()
+            raise
+        except Exception as e:
+            self._finish(e)
+            raise StopIteration
+        self.chunks += 1
+        return chunk
+    
+    def close(self) -> None:
+        """Stop early and release the module instance"""
+        if self._chunks is not None:
+            self._chunks.close()
+            self._finish(complete=False)
+    
+    def __enter__(self) -> "ExecutionStream":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def __del__(self):
+        if self._chunks is not None:
+            self.close()
+    
+    def _finish(self, error: Optional[Exception] = None, complete: bool = True) -> None:
+        self._chunks = None
+        metadata = dict(self.metadata, chunks=self.chunks)
+        if not complete:
+            metadata["complete"] = False
+        if error is None:
+            self.result = ExecutionResult(True, metadata=metadata)
+        else:
+            self.result = ExecutionResult.from_exception(error, metadata)
+        if self._on_finish is not None:
+            self._on_finish(self.result)
+
+
+class AsyncExecutionStream(ExecutionStream):
+    """ExecutionStream for coroutines: iterate with `async for`, stop early with aclose()"""
+    
+    __slots__ = ()
+    
+    def __aiter__(self) -> "AsyncExecutionStream":
+        return self
+    
+    async def __anext__(self) -> Any:
+        if self._chunks is None:
+            raise StopAsyncIteration
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._finish()
+            raise
+        except Exception as e:
+            self._finish(e)
+            raise StopAsyncIteration
+        self.chunks += 1
+        return chunk
+    
+    async def aclose(self) -> None:
+        if self._chunks is not None:
+            await self._chunks.aclose()
+            self._finish(complete=False)
+    
+    def close(self) -> None:
+        # The async generator is finalized by its event loop; only settle the trailer here
+        if self._chunks is not None:
+            self._finish(complete=False)
+    
+    async def __aenter__(self) -> "AsyncExecutionStream":
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+
+class ModuleEntry:
+    """Everything the kernel resolved for one registered module"""
+    
+    __slots__ = (
+        "name", "module_class", "manifest", "version", "pool", "dispatch", "workers", "admission", "circuits",
+        "_users"
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        module_class: type,
+        manifest: Dict,
+        pool: ModulePool,
+        dispatch: Mapping[str, Any],
+        workers: Optional[ProcessPool] = None,
+        admission: Optional[AdmissionController] = None,
+        circuits: Optional[Mapping[str, Tuple[Any, ...]]] = None
+    ):
+        self.name = name
+        self.module_class = module_class
+        self.manifest = manifest
+        self.version = str(manifest.get("version", ""))
+        self.pool = pool
+        self.dispatch = dispatch
+        self.workers = workers
+        self.admission = admission
+        # Circuit breakers by action; actions without any are absent
+        self.circuits = circuits or {}
+        # One token per execution using the entry: deque append and pop are
+        # atomic, so the execution path takes no lock
+        self._users: "deque[None]" = deque()
+    
+    def enter(self) -> None:
+        """Count an execution that resolved this entry"""
+        self._users.append(None)
+    
+    def leave(self) -> None:
+        self._users.pop()
+    
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no execution uses the entry; False after `timeout` seconds"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Polled: only reloads wait here
+        while self._users:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
 
 
 class KernelCore:
     """
     Main kernel interface for module execution
     Implements the official execution contract
+    
+    The kernel is safe to share between threads: execution ids come from an
+    atomic counter and the module table is copy-on-write, so executions
+    never take a lock to find their module. submit() runs executions on the
+    kernel's bounded thread pool.
     """
     
     VERSION = "1.0.0"
     
-    def __init__(self):
-        self.modules = {}
-        self.execution_count = 0
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        result_cache: Optional[ResultCache] = None,
+        locator: Optional[ModuleLocator] = None,
+        admission: Optional[AdmissionSettings] = None
+    ):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.result_cache = result_cache or ResultCache()
+        self.latency = LatencyRecorder()
+        self.single_flight = SingleFlight()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._deadline_executor: Optional[ThreadPoolExecutor] = None
+        self._intercept_executor: Optional[ThreadPoolExecutor] = None
+        self._stream_executor: Optional[ThreadPoolExecutor] = None
+        self._intercept_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stream_slots = threading.BoundedSemaphore(self.max_workers)
+        self._executor_lock = threading.Lock()
+        self._ids = AtomicCounter()
+        self._table: CopyOnWriteMap[ModuleEntry] = CopyOnWriteMap()
+        self.locator = locator
+        self.admission = admission
+        self._interceptors: Tuple[Any, ...] = ()
+        self._async_chain: Optional[Callable[..., Any]] = None
+        self._interceptors_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._reloads: Dict[str, Dict] = {}
+        self._reloads_lock = threading.Lock()
+    
+    @property
+    def execution_count(self) -> int:
+        """Number of executions started so far"""
+        return self._ids.value
     
-    def register_module(self, name: str, module_class: type) -> bool:
-        """Register a module with the kernel"""
+    @property
+    def modules(self) -> Dict[str, type]:
+        """Registered module classes by name"""
+        return {name: entry.module_class for name, entry in self._table.snapshot().items()}
+    
+    def register_module(
+        self,
+        name: str,
+        module_class: type,
+        config: Optional[Dict] = None,
+        manifest: Optional[Dict] = None
+    ) -> bool:
+        """
+        Register a module with the kernel
+        
+        Instances are pooled: they are created and initialized with `config`
+        once, then leased per execution. Pool settings are read from the
+        manifest "runtime.pool" section; when no manifest is given it is
+        taken from the module's get_manifest(), if any.
+        
+        The action dispatch table is resolved here, once, from the manifest
+        "actions" list plus the public methods of the class.
+        
+        Modules whose manifest sets "runtime.isolation" to "process" run in a
+        pool of pre-forked worker processes ("runtime.workers") instead.
+        
+        Actions marked "pure" in the manifest have their results memoized
+        in the kernel result cache, keyed by (module, version, action, params).
+        
+        Param schemas in the manifest "params" section are compiled here;
+        params that fail them are rejected with ErrorCode.VALIDATION and
+        every error listed under error_details["errors"].
+        
+        Admission limits come from the manifest "runtime.admission" section,
+        else from the kernel's `admission` default; executions over the
+        limit are rejected with ErrorCode.OVERLOADED.
+        
+        Circuit breakers come from the manifest "runtime.circuit_breaker"
+        section (one per module) and "runtime.actions.<action>.circuit_breaker"
+        (one per action); while one is open, calls fail fast with
+        ErrorCode.CIRCUIT_OPEN without touching the module.
+        
+        Actions marked "coalesce" run once for concurrent identical requests
+        (same module, version, action and params); the other callers wait
+        for that execution and share its result.
+        """
         if not name or not isinstance(name, str):
             return False
-        if name in self.modules:
+        if name in self._table:
+            return False
+        
+        entry = self._build_entry(name, module_class, config, manifest)
+        if not self._table.set_if_absent(name, entry):
+            self._close_entry(entry)
             return False
-        self.modules[name] = module_class
         return True
     
+    def _build_entry(
+        self,
+        name: str,
+        module_class: type,
+        config: Optional[Dict],
+        manifest: Optional[Dict]
+    ) -> ModuleEntry:
+        """Resolve the manifest, dispatch table, pools and admission of a module class"""
+        seed = None
+        if manifest is None and callable(getattr(module_class, "get_manifest", None)):
+            try:
+                seed = module_class()
+                manifest = seed.get_manifest()
+            except Exception:
+                seed = None
+        manifest = manifest or {}
+        dispatch = build_dispatch_table(module_class, manifest)
+        
+        pool = ModulePool(name, module_class, config, PoolSettings.from_manifest(manifest))
+        workers = None
+        isolation = IsolationSettings.from_manifest(manifest)
+        if isolation.mode == "process":
+            workers = ProcessPool(name, module_class, manifest, config, isolation)
+            workers.start()
+        elif seed is not None:
+            try:
+                pool.add_instance(seed)
+            except Exception:
+                pass
+        
+        admission = AdmissionSettings.from_manifest(manifest) or self.admission
+        return ModuleEntry(
+            name,
+            module_class,
+            manifest,
+            pool,
+            dispatch,
+            workers,
+            AdmissionController(name, admission) if admission is not None else None,
+            build_breakers(name, manifest, list(dispatch))
+        )
+    
+    @staticmethod
+    def _close_entry(entry: ModuleEntry) -> None:
+        entry.pool.close()
+        if entry.workers is not None:
+            entry.workers.close()
+    
+    def reload_module(
+        self,
+        name: str,
+        module_class: Optional[type] = None,
+        config: Optional[Dict] = None,
+        manifest: Optional[Dict] = None,
+        drain_timeout: Optional[float] = 30.0
+    ) -> Dict:
+        """
+        Replace a registered module's code without dropping traffic
+        
+        The new class is `module_class` when given; otherwise it is imported
+        again from its file (through the locator for indexed modules),
+        alongside the running version. Its pool is warmed to the old pool's
+        size and the module table entry is swapped in one step: executions
+        that already resolved the old entry finish on it, new ones get the
+        new code. The reload then waits, for up to `drain_timeout` seconds
+        overall, until no execution uses the old entry and its pool's leases
+        are back, closes the pool and drops the old code's fresh import from
+        sys.modules. `config` defaults to the old pool's config.
+        
+        Returns a report with the timings of each stage. A failed load or
+        warm-up leaves the running version in place and is reported with
+        its error and error_code. Cached results of pure actions are kept
+        unless the manifest version changes.
+        """
+        started = time.perf_counter()
+        report: Dict[str, Any] = {"module": name, "success": False}
+        with self._reload_lock:
+            old = self._table.get(name)
+            stage = "load"
+            entry = None
+            reimported = False
+            try:
+                if old is None:
+                    raise ModuleNotFoundError(name)
+                if module_class is None:
+                    module_class, located = self._reimport(old)
+                    reimported = True
+                    manifest = manifest or located
+                if config is None:
+                    config = old.pool.config
+                entry = self._build_entry(name, module_class, config, manifest)
+                loaded = time.perf_counter()
+                report["load_ms"] = round((loaded - started) * 1000, 3)
+                
+                stage = "warm"
+                if entry.workers is None:
+                    entry.pool.warm(max(1, old.pool.get_status()["alive"]))
+                    report["warmed"] = entry.pool.get_status()["alive"]
+                else:
+                    report["warmed"] = entry.workers.settings.workers
+                report["warm_ms"] = round((time.perf_counter() - loaded) * 1000, 3)
+            except Exception as e:
+                if entry is not None:
+                    self._close_entry(entry)
+                if reimported:
+                    release_import(module_class)
+                report.update(stage=stage, error=str(e))
+                report["error_code"] = e.code if isinstance(e, KernelError) else ErrorCode.EXECUTION_FAILED
+                entry = None
+            else:
+                self._table.replace(name, entry)
+        
+        if entry is None:
+            report["total_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self._record_reload(name, report)
+            return report
+        report.update(success=True, old_version=old.version, version=entry.version)
+        drain_started = time.perf_counter()
+        # Executions that resolved the old entry may not have leased yet
+        drained = old.wait_idle(drain_timeout)
+        if drain_timeout is not None:
+            drain_timeout = max(0.0, drain_timeout - (time.perf_counter() - drain_started))
+        report["drained"] = (old.workers or old.pool).drain(drain_timeout) and drained
+        if old.workers is not None:
+            old.pool.close()
+        if old.module_class.__module__ != entry.module_class.__module__:
+            release_import(old.module_class)
+        finished = time.perf_counter()
+        report["drain_ms"] = round((finished - drain_started) * 1000, 3)
+        report["total_ms"] = round((finished - started) * 1000, 3)
+        self._record_reload(name, report)
+        return report
+    
+    def _reimport(self, entry: ModuleEntry) -> Tuple[type, Optional[Dict]]:
+        """Fresh class for a registered module, and the manifest to register it with"""
+        located = None
+        if self.locator is not None and self.locator.find(entry.name) is not None:
+            located = self.locator.reload(entry.name)
+        if located is not None:
+            module_class, manifest = located
+        else:
+            module_class, manifest = reimport_class(entry.module_class), entry.manifest
+        # Modules that describe themselves through get_manifest() keep their own manifest
+        if callable(getattr(module_class, "get_manifest", None)):
+            manifest = None
+        return module_class, manifest
+    
+    def _record_reload(self, name: str, report: Dict) -> None:
+        with self._reloads_lock:
+            stats = self._reloads.setdefault(name, {"reloads": 0, "failures": 0})
+            stats["reloads"] += 1
+            if not report["success"]:
+                stats["failures"] += 1
+            stats["last"] = report
+    
+    def get_manifest(self, name: str) -> Optional[Dict]:
+        """Get the manifest a module was registered with"""
+        entry = self._table.get(name)
+        return entry.manifest if entry else None
+    
+    def get_actions(self, name: str) -> list:
+        """Get the actions a module can dispatch"""
+        entry = self._table.get(name)
+        return list(entry.dispatch) if entry else []
+    
+    def evict_idle(self) -> int:
+        """Evict idle module instances from every pool"""
+        return sum(entry.pool.evict_idle() for entry in self._table.snapshot().values())
+    
+    @property
+    def interceptors(self) -> Tuple[Any, ...]:
+        """Installed interceptors, outermost first"""
+        return self._interceptors
+    
+    def add_interceptor(self, interceptor: Any) -> None:
+        """
+        Install an interceptor around every execution entry point
+        
+        Interceptors are called as interceptor(call, module_name, action,
+        params, context, timeout) and return an ExecutionResult; the first
+        one added is the outermost. The chain is composed here into a single
+        callable that replaces execute on this instance, so with no
+        interceptors installed execute() is the plain method. The other
+        entry points apply the chain themselves; see execute_async(),
+        execute_stream() and execute_batch(). The async entry points await
+        an interceptor's intercept_async() method when it has one.
+        """
+        with self._interceptors_lock:
+            self._interceptors = self._interceptors + (interceptor,)
+            self._compose_interceptors()
+    
+    def remove_interceptor(self, interceptor: Any) -> bool:
+        """Uninstall an interceptor; returns False when it was not installed"""
+        with self._interceptors_lock:
+            if interceptor not in self._interceptors:
+                return False
+            chain = list(self._interceptors)
+            chain.remove(interceptor)
+            self._interceptors = tuple(chain)
+            self._compose_interceptors()
+            return True
+    
+    def _compose_interceptors(self) -> None:
+        if not self._interceptors:
+            self.__dict__.pop("execute", None)
+            self._async_chain = None
+            return
+        core = type(self).execute.__get__(self, type(self))
+        self.execute = compose(self._interceptors, core)
+        self._async_chain = compose_async(self._interceptors, self._execute_async, self._get_intercept_executor)
+    
+    def _lookup(self, name: str) -> Optional[ModuleEntry]:
+        """
+        Registered entry for a module, registering it from the locator on first use
+        
+        Raises ModuleLoadError when an indexed module fails to import or to
+        register, e.g. over a bad manifest or a failing get_manifest().
+        """
+        entry = self._table.get(name)
+        if entry is not None or self.locator is None:
+            return entry
+        try:
+            located = self.locator.load(name)
+            if located is None:
+                return None
+            module_class, manifest = located
+            # Modules that describe themselves through get_manifest() keep their own manifest
+            if callable(getattr(module_class, "get_manifest", None)):
+                manifest = None
+            self.register_module(name, module_class, manifest=manifest)
+        except ModuleLoadError:
+            raise
+        except Exception as e:
+            raise ModuleLoadError(name, e) from e
+        return self._table.get(name)
+    
+    def _checkout(self, name: str) -> Optional[ModuleEntry]:
+        """
+        _lookup() that counts the caller as a user of the entry
+        
+        The caller must call leave() on the entry once its execution is
+        over. An entry replaced by reload_module() between the lookup and
+        the count is given up for the new one, so a reload that has seen
+        its old entry go idle can close it safely.
+        """
+        table = self._table
+        while True:
+            entry = table.get(name)
+            if entry is None:
+                entry = self._lookup(name)
+                if entry is None:
+                    return None
+            entry.enter()
+            if table.get(name) is entry:
+                return entry
+            entry.leave()
+    
     def execute(
         self,
         module_name: str,
         action: str,
         params: Optional[Dict] = None,
-        context: Optional[Dict] = None
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
     ) -> ExecutionResult:
-        """Execute a module action through the kernel"""
-        self.execution_count += 1
+        """
+        Execute a module action through the kernel
         
-        if module_name not in self.modules:
-            return ExecutionResult.error(f"Module not found: {module_name}")
+        `timeout` is a per-call deadline in seconds. Without it the action's
+        default from the manifest ("runtime.actions.<action>.timeout", then
+        "runtime.timeout") applies. An execution past its deadline returns
+        an ErrorCode.TIMEOUT error carrying the elapsed time.
+        """
+        execution_id = self._ids.increment()
         
         try:
-            module = self.modules[module_name]()
-            
-            if not hasattr(module, action):
-                return ExecutionResult.error(f"Action not found: {action}")
-            
-            method = getattr(module, action)
-            result = method(params or {}, context or {})
+            entry = self._checkout(module_name)
+        except KernelError as e:
+            return ExecutionResult.from_exception(e)
+        if entry is None:
+            return ExecutionResult.from_exception(
+                ModuleNotFoundError(module_name),
+                {"module": module_name, "action": action, "execution_id": execution_id}
+            )
+        
+        try:
+            spec = entry.dispatch.get(action)
+            if spec is None:
+                return ExecutionResult.from_exception(
+                    _action_not_found(module_name, action),
+                    {"module": module_name, "action": action, "execution_id": execution_id}
+                )
             
-            return ExecutionResult.ok(data=result, metadata={
+            metadata = {
                 "module": module_name,
                 "action": action,
-                "execution_id": self.execution_count
-            })
-            
+                "execution_id": execution_id
+            }
+            params = params or {}
+            context = context or {}
+            if spec.coalesce:
+                key = canonical_key(module_name, entry.version, action, params)
+                if key is not None:
+                    return self._execute_coalesced(key, entry, spec, params, context, timeout, metadata)
+            return self._execute_admitted(entry, spec, params, context, timeout, metadata)
+        finally:
+            entry.leave()
+    
+    def _execute_admitted(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        timeout: Optional[float],
+        metadata: Dict
+    ) -> ExecutionResult:
+        circuits = entry.circuits.get(spec.name)
+        if circuits is not None:
+            try:
+                tokens = circuit_breaker.enter(circuits)
+            except KernelError as e:
+                return ExecutionResult.from_exception(e, metadata)
+        admission = entry.admission
+        result = None
+        try:
+            if admission is not None:
+                try:
+                    admission.acquire()
+                except KernelError as e:
+                    result = ExecutionResult.from_exception(e, metadata)
+                    return result
+            started = time.perf_counter_ns()
+            try:
+                result = self._execute_spec(entry, spec, params, context, timeout, metadata)
+            finally:
+                elapsed = time.perf_counter_ns() - started
+                if admission is not None:
+                    admission.release(elapsed / 1e9)
+        finally:
+            if circuits is not None:
+                self._leave_circuits(circuits, tokens, result)
+        self.latency.record(entry.name, spec.name, elapsed, result.success)
+        return result
+    
+    @staticmethod
+    def _leave_circuits(circuits: Tuple[Any, ...], tokens: List[int], result: Optional[ExecutionResult]) -> None:
+        """Report an execution to its breakers; None when it was interrupted"""
+        if result is None:
+            circuit_breaker.leave(circuits, tokens, None)
+        else:
+            circuit_breaker.leave(circuits, tokens, result.success, result.metadata.get("error_code"))
+    
+    def _execute_coalesced(
+        self,
+        key: str,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        timeout: Optional[float],
+        metadata: Dict
+    ) -> ExecutionResult:
+        """Lead the flight for `key`, or wait for its leader and share the result"""
+        flight, leader = self.single_flight.join(key, entry.name, spec.name)
+        if leader:
+            result = None
+            try:
+                result = self._execute_admitted(entry, spec, params, context, timeout, metadata)
+            finally:
+                self.single_flight.land(flight, result)
+            return result
+        
+        started = time.perf_counter_ns()
+        if timeout is None:
+            timeout = spec.timeout
+        landed = flight.wait(timeout)
+        return self._coalesced_result(entry, spec, flight, landed, timeout, started, metadata)
+    
+    def _execute_spec(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        timeout: Optional[float],
+        metadata: Dict
+    ) -> ExecutionResult:
+        if spec.validator is not None:
+            errors = spec.validator.validate(params)
+            if errors:
+                return ExecutionResult.from_exception(self._params_error(spec, errors), metadata)
+        
+        cache_key = None
+        if spec.pure:
+            cache_key, cached = self._cache_lookup(entry, spec, params)
+            if cached is not MISS:
+                metadata["cached"] = True
+                return ExecutionResult.ok(data=cached, metadata=metadata)
+        
+        if timeout is None:
+            timeout = spec.timeout
+        try:
+            if timeout is None:
+                result = self._run(entry, spec, params, context)
+            else:
+                result = self._run_with_deadline(entry, spec, params, context, Deadline(timeout))
+            if cache_key is not None:
+                self.result_cache.put(cache_key, result, spec.cache_ttl)
+            return ExecutionResult.ok(data=result, metadata=metadata)
+        
         except Exception as e:
-            return ExecutionResult.error(str(e), metadata={
+            return ExecutionResult.from_exception(e, metadata)
+    
+    def submit(
+        self,
+        module_name: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> Future:
+        """Run execute() on the kernel thread pool; returns a Future of the ExecutionResult"""
+        return self._get_executor().submit(
+            self.execute, module_name, action, params, context, timeout
+        )
+    
+    async def execute_async(
+        self,
+        module_name: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionResult:
+        """
+        Execute a module action on the running event loop
+        
+        `async def` actions are awaited directly, so I/O-bound modules can run
+        many concurrent executions on one loop. Sync actions are sent to the
+        kernel's bounded thread pool. The result and timeout handling follow
+        the same contract as execute(); timed-out async actions are cancelled.
+        
+        Installed interceptors with intercept_async() are awaited on this
+        loop. Plain ones run on the kernel's interceptor thread pool, which
+        bounds how many such executions are in flight at once.
+        """
+        chain = self._async_chain
+        if chain is None:
+            return await self._execute_async(module_name, action, params, context, timeout)
+        return await chain(module_name, action, params, context, timeout)
+    
+    async def _execute_async(
+        self,
+        module_name: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionResult:
+        execution_id = self._ids.increment()
+        
+        try:
+            entry = self._checkout(module_name)
+        except KernelError as e:
+            return ExecutionResult.from_exception(e)
+        if entry is None:
+            return ExecutionResult.from_exception(
+                ModuleNotFoundError(module_name),
+                {"module": module_name, "action": action, "execution_id": execution_id}
+            )
+        
+        try:
+            spec = entry.dispatch.get(action)
+            if spec is None:
+                return ExecutionResult.from_exception(
+                    _action_not_found(module_name, action),
+                    {"module": module_name, "action": action, "execution_id": execution_id}
+                )
+            
+            metadata = {
                 "module": module_name,
                 "action": action,
-                "execution_id": self.execution_count
-            })
+                "execution_id": execution_id
+            }
+            params = params or {}
+            context = context or {}
+            if spec.coalesce:
+                key = canonical_key(module_name, entry.version, action, params)
+                if key is not None:
+                    return await self._execute_coalesced_async(key, entry, spec, params, context, timeout, metadata)
+            return await self._execute_admitted_async(entry, spec, params, context, timeout, metadata)
+        finally:
+            entry.leave()
+    
+    async def _execute_admitted_async(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        timeout: Optional[float],
+        metadata: Dict
+    ) -> ExecutionResult:
+        circuits = entry.circuits.get(spec.name)
+        if circuits is not None:
+            try:
+                tokens = circuit_breaker.enter(circuits)
+            except KernelError as e:
+                return ExecutionResult.from_exception(e, metadata)
+        admission = entry.admission
+        result = None
+        try:
+            if admission is not None:
+                try:
+                    await admission.acquire_async()
+                except KernelError as e:
+                    result = ExecutionResult.from_exception(e, metadata)
+                    return result
+            started = time.perf_counter_ns()
+            try:
+                result = await self._execute_spec_async(entry, spec, params, context, timeout, metadata)
+            finally:
+                elapsed = time.perf_counter_ns() - started
+                if admission is not None:
+                    admission.release(elapsed / 1e9)
+        finally:
+            if circuits is not None:
+                self._leave_circuits(circuits, tokens, result)
+        self.latency.record(entry.name, spec.name, elapsed, result.success)
+        return result
+    
+    async def _execute_coalesced_async(
+        self,
+        key: str,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        timeout: Optional[float],
+        metadata: Dict
+    ) -> ExecutionResult:
+        """_execute_coalesced() for coroutines; flights are shared with the thread path"""
+        flight, leader = self.single_flight.join(key, entry.name, spec.name)
+        if leader:
+            result = None
+            try:
+                result = await self._execute_admitted_async(entry, spec, params, context, timeout, metadata)
+            finally:
+                self.single_flight.land(flight, result)
+            return result
+        
+        started = time.perf_counter_ns()
+        if timeout is None:
+            timeout = spec.timeout
+        landed = await flight.wait_async(timeout)
+        return self._coalesced_result(entry, spec, flight, landed, timeout, started, metadata)
+    
+    def _coalesced_result(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        flight: Flight,
+        landed: bool,
+        timeout: Optional[float],
+        started: int,
+        metadata: Dict
+    ) -> ExecutionResult:
+        """A follower's copy of the leader's result, with its own execution metadata"""
+        elapsed = time.perf_counter_ns() - started
+        shared = flight.result
+        if not landed:
+            self.single_flight.gave_up(entry.name, spec.name)
+            error = ExecutionTimeoutError(entry.name, spec.name, timeout, elapsed / 1e9)
+            result = ExecutionResult.from_exception(error, metadata)
+        elif shared is None:
+            # The leader was interrupted (cancelled or a BaseException) before it had a result
+            error = KernelError(
+                f"Coalesced execution of {spec.name} did not complete", ErrorCode.EXECUTION_FAILED
+            )
+            result = ExecutionResult.from_exception(error, metadata)
+        else:
+            metadata = dict(shared.metadata, **metadata)
+            metadata["coalesced"] = True
+            result = ExecutionResult(shared.success, data=shared.data, error=shared.error, metadata=metadata)
+        self.latency.record(entry.name, spec.name, elapsed, result.success)
+        return result
+    
+    async def _execute_spec_async(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        timeout: Optional[float],
+        metadata: Dict
+    ) -> ExecutionResult:
+        if spec.validator is not None:
+            errors = spec.validator.validate(params)
+            if errors:
+                return ExecutionResult.from_exception(self._params_error(spec, errors), metadata)
+        
+        cache_key = None
+        if spec.pure:
+            cache_key, cached = self._cache_lookup(entry, spec, params)
+            if cached is not MISS:
+                metadata["cached"] = True
+                return ExecutionResult.ok(data=cached, metadata=metadata)
+        
+        if timeout is None:
+            timeout = spec.timeout
+        deadline = Deadline(timeout) if timeout is not None else None
+        try:
+            if spec.is_async and entry.workers is None:
+                call = self._run_async(entry, spec, params, context)
+            else:
+                call = asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(),
+                    self._run,
+                    entry,
+                    spec,
+                    params,
+                    context,
+                    deadline
+                )
+            if deadline is None:
+                result = await call
+            else:
+                try:
+                    result = await asyncio.wait_for(call, deadline.remaining())
+                except asyncio.TimeoutError:
+                    deadline.cancel()
+                    raise ExecutionTimeoutError(entry.name, spec.name, timeout, deadline.elapsed())
+            if cache_key is not None:
+                self.result_cache.put(cache_key, result, spec.cache_ttl)
+            return ExecutionResult.ok(data=result, metadata=metadata)
+        
+        except Exception as e:
+            return ExecutionResult.from_exception(e, metadata)
+    
+    def _cache_lookup(self, entry: ModuleEntry, spec: Any, params: Dict) -> Tuple[Optional[str], Any]:
+        """Cache key and cached result (or MISS) for a pure action"""
+        key = canonical_key(entry.name, entry.version, spec.name, params)
+        if key is None:
+            return None, MISS
+        return key, self.result_cache.get(key)
+    
+    async def _run_async(self, entry: ModuleEntry, spec: Any, params: Dict, context: Dict) -> Any:
+        pool = entry.pool
+        module = pool.try_acquire()
+        if module is None:
+            module = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), pool.acquire
+            )
+        try:
+            return await awaitable(spec.handler(module, params, context))
+        finally:
+            pool.release(module)
+    
+    def _run(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        deadline: Optional[Deadline] = None,
+        module: Any = None
+    ) -> Any:
+        """
+        Run one action on a leased instance or in the module's worker processes
+        
+        `module` is an instance the caller already holds; otherwise one is
+        leased from the pool for the call.
+        """
+        if entry.workers is not None:
+            if deadline is None:
+                return entry.workers.execute(spec.name, params, context)
+            try:
+                return entry.workers.execute(spec.name, params, context, deadline.remaining())
+            except ExecutionTimeoutError:
+                raise ExecutionTimeoutError(
+                    entry.name, spec.name, deadline.timeout, deadline.elapsed()
+                )
+        pool = entry.pool
+        leased = module is None
+        if deadline is None:
+            if leased:
+                module = pool.acquire()
+            try:
+                return self._invoke(spec, module, params, context)
+            finally:
+                if leased:
+                    pool.release(module)
+        
+        if leased:
+            module = pool.acquire(deadline.remaining())
+        try:
+            with bind_deadline(deadline):
+                return self._invoke(spec, module, params, context, deadline)
+        except asyncio.TimeoutError:
+            if not deadline.expired:
+                raise
+            deadline.cancel()
+            raise ExecutionTimeoutError(entry.name, spec.name, deadline.timeout, deadline.elapsed())
+        finally:
+            if leased:
+                pool.release(module)
+    
+    def _run_with_deadline(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        deadline: Deadline,
+        lease: Optional[List[Any]] = None
+    ) -> Any:
+        """
+        Run one action under a deadline
+        
+        Worker processes and async actions are cancelled on timeout. A sync
+        action runs on the deadline thread pool, kept apart from the one
+        submit() uses so a timed call made from a pool thread never waits
+        for a slot its own caller holds, and is abandoned on timeout: the
+        caller gets the timeout error, the deadline is marked cancelled for
+        the action to observe, and its instance returns to the pool when it
+        finishes. A timed call made from a deadline thread runs inline and
+        the deadline is only checked once it returns.
+        
+        `lease` is a one-item list holding an instance the caller already
+        leased; an abandoned action takes the instance over, releasing it
+        when it finishes, and leaves None in the list.
+        """
+        if entry.workers is not None or spec.is_async:
+            return self._run(entry, spec, params, context, deadline)
+        
+        module = lease[0] if lease else None
+        if getattr(_deadline_thread, "active", False):
+            result = self._run(entry, spec, params, context, deadline, module)
+            if deadline.expired:
+                deadline.cancel()
+                raise ExecutionTimeoutError(entry.name, spec.name, deadline.timeout, deadline.elapsed())
+            return result
+        
+        future = self._get_deadline_executor().submit(
+            self._run, entry, spec, params, context, deadline, module
+        )
+        try:
+            return future.result(timeout=deadline.remaining())
+        except FutureTimeoutError:
+            deadline.cancel()
+            future.cancel()
+            if module is not None:
+                lease[0] = None
+                future.add_done_callback(lambda _: entry.pool.release(module))
+            raise ExecutionTimeoutError(entry.name, spec.name, deadline.timeout, deadline.elapsed())
+    
+    @staticmethod
+    def _invoke(
+        spec: Any,
+        module: Any,
+        params: Dict,
+        context: Dict,
+        deadline: Optional[Deadline] = None
+    ) -> Any:
+        """
+        Call an action handler, running `async def` actions to completion
+        
+        Generator and async generator output is gathered into a list here;
+        execute_stream() is the path that hands chunks out one at a time.
+        """
+        result = spec.handler(module, params, context)
+        if spec.is_async:
+            result = awaitable(result)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                if deadline is not None:
+                    result = asyncio.wait_for(result, deadline.remaining())
+                return asyncio.run(result)
+            result.close()
+            raise RuntimeError(
+                f"Action {spec.name} is async; use execute_async inside an event loop"
+            )
+        return materialize(result)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        executor = self._executor
+        if executor is None:
+            executor = self._start_executor("_executor", "kernel")
+        return executor
+    
+    def _get_deadline_executor(self) -> ThreadPoolExecutor:
+        executor = self._deadline_executor
+        if executor is None:
+            executor = self._start_executor("_deadline_executor", "kernel-deadline", _mark_deadline_thread)
+        return executor
+    
+    def _get_intercept_executor(self) -> ThreadPoolExecutor:
+        executor = self._intercept_executor
+        if executor is None:
+            executor = self._start_executor("_intercept_executor", "kernel-intercept")
+        return executor
+    
+    def _get_stream_executor(self) -> ThreadPoolExecutor:
+        executor = self._stream_executor
+        if executor is None:
+            executor = self._start_executor("_stream_executor", "kernel-intercept-stream")
+        return executor
+    
+    def _get_intercept_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop on a thread of its own, running the interceptor chains of sync streams"""
+        loop = self._intercept_loop
+        if loop is None:
+            with self._executor_lock:
+                loop = self._intercept_loop
+                if loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=_run_loop, args=(loop,), name="kernel-intercept-loop", daemon=True).start()
+                    self._intercept_loop = loop
+        return loop
+    
+    def _start_executor(
+        self,
+        attribute: str,
+        prefix: str,
+        initializer: Optional[Callable[[], None]] = None
+    ) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            executor = getattr(self, attribute)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=prefix,
+                    initializer=initializer
+                )
+                setattr(self, attribute, executor)
+            return executor
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker thread pools and release pooled module instances"""
+        with self._executor_lock:
+            executors = (self._executor, self._deadline_executor, self._intercept_executor)
+            self._executor = self._deadline_executor = self._intercept_executor = None
+            streams, self._stream_executor = self._stream_executor, None
+            loop, self._intercept_loop = self._intercept_loop, None
+        if loop is not None:
+            # Chains of streams still open finish first; they may hold pool threads
+            asyncio.run_coroutine_threadsafe(_drain_loop(), loop)
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        if streams is not None:
+            # Its threads wait for streams the caller may still hold open
+            streams.shutdown(wait=False)
+        for entry in self._table.snapshot().values():
+            entry.pool.close()
+            if entry.workers is not None:
+                entry.workers.close()
+    
+    def execute_stream(
+        self,
+        module_name: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionStream:
+        """
+        Execute a module action and hand out its output chunk by chunk
+        
+        Generator actions produce each chunk as the caller asks for it, so
+        a large result is never held in memory; async generators are driven
+        on a private event loop. Other actions produce their result as a
+        single chunk. `timeout` (or the manifest default) bounds the whole
+        stream and is checked between chunks. Process-isolated modules
+        stream the chunks of a result gathered in the worker.
+        
+        Installed interceptors see the whole stream: the chain runs on the
+        kernel's interceptor loop, and its call returns the trailer once the
+        stream finishes. A chain that answers without calling through gives
+        a stream that produces nothing and ends with that answer. See
+        _chain_stream() for the threads a chain may hold.
+        """
+        if not self._interceptors:
+            return self._execute_stream(module_name, action, params, context, timeout)
+        opened: "queue.Queue[Any]" = queue.Queue()
+        executor = self._get_intercept_executor()
+        
+        def open_stream(*args: Any) -> "asyncio.Future[ExecutionStream]":
+            # Opening may wait for admission, so keep it off the loop
+            return asyncio.get_running_loop().run_in_executor(executor, self._execute_stream, *args)
+        
+        asyncio.run_coroutine_threadsafe(
+            self._chain_stream(open_stream, (module_name, action, params, context, timeout), opened.put),
+            self._get_intercept_loop()
+        )
+        stream = opened.get()
+        return stream if isinstance(stream, ExecutionStream) else ExecutionStream.failed(stream)
+    
+    def _execute_stream(
+        self,
+        module_name: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionStream:
+        stream, entry = self._open_stream(ExecutionStream, module_name, action, params)
+        if stream.result is not None:
+            return stream
+        spec = entry.dispatch[action]
+        if spec.is_async:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                stream._finish(RuntimeError(
+                    f"Action {spec.name} is async; use execute_stream_async inside an event loop"
+                ))
+                return stream
+        circuits = entry.circuits.get(spec.name)
+        tokens = None
+        if circuits is not None:
+            try:
+                tokens = circuit_breaker.enter(circuits)
+            except KernelError as e:
+                stream._finish(e)
+                return stream
+        if entry.admission is not None:
+            try:
+                entry.admission.acquire()
+            except KernelError as e:
+                if circuits is not None:
+                    self._leave_circuits(circuits, tokens, None)
+                stream._finish(e)
+                return stream
+        timeout = spec.timeout if timeout is None else timeout
+        deadline = Deadline(timeout) if timeout is not None else None
+        stream._chunks = self._stream_chunks(entry, spec, params or {}, context or {}, deadline)
+        stream._on_finish = self._stream_finished(entry, action, circuits, tokens)
+        return stream
+    
+    async def execute_stream_async(
+        self,
+        module_name: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncExecutionStream:
+        """
+        execute_stream() for coroutines; iterate the result with `async for`
+        
+        Async generators run on the calling loop; sync generators pull each
+        chunk on the kernel thread pool. Async actions are cancelled when
+        the deadline passes, sync ones are checked between chunks.
+        Interceptors are applied as in execute_stream().
+        """
+        if not self._interceptors:
+            return await self._execute_stream_async(module_name, action, params, context, timeout)
+        opened = asyncio.get_running_loop().create_future()
+        
+        def deliver(value: Any) -> None:
+            # Boxed, so the future does not keep the stream alive once taken
+            _settle(opened, [value])
+        
+        asyncio.ensure_future(
+            self._chain_stream(self._execute_stream_async, (module_name, action, params, context, timeout), deliver)
+        )
+        stream = (await opened).pop()
+        return stream if isinstance(stream, ExecutionStream) else AsyncExecutionStream.failed(stream)
+    
+    async def _execute_stream_async(
+        self,
+        module_name: str,
+        action: str,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncExecutionStream:
+        stream, entry = self._open_stream(AsyncExecutionStream, module_name, action, params)
+        if stream.result is not None:
+            return stream
+        spec = entry.dispatch[action]
+        circuits = entry.circuits.get(spec.name)
+        tokens = None
+        if circuits is not None:
+            try:
+                tokens = circuit_breaker.enter(circuits)
+            except KernelError as e:
+                stream._finish(e)
+                return stream
+        if entry.admission is not None:
+            try:
+                await entry.admission.acquire_async()
+            except KernelError as e:
+                if circuits is not None:
+                    self._leave_circuits(circuits, tokens, None)
+                stream._finish(e)
+                return stream
+        timeout = spec.timeout if timeout is None else timeout
+        deadline = Deadline(timeout) if timeout is not None else None
+        stream._chunks = self._stream_chunks_async(entry, spec, params or {}, context or {}, deadline)
+        stream._on_finish = self._stream_finished(entry, action, circuits, tokens)
+        return stream
+    
+    async def _chain_stream(self, open_stream: Callable[..., Any], args: Tuple, deliver: Callable[[Any], None]) -> None:
+        """
+        Run the interceptor chain around opening a stream, on the running loop
+        
+        deliver() gets the stream when the chain calls through, then the
+        chain's own result, which the caller ignores once it has a stream.
+        The chain's call waits for the trailer without holding a thread, so
+        a chain of intercept_async() interceptors holds none while the
+        stream is open. Plain interceptors hold a thread each for that
+        long, so at most max_workers such streams are open at once; more
+        are refused with ErrorCode.OVERLOADED. The stream is handed out
+        once: a second call through the chain gets an error result.
+        """
+        loop = asyncio.get_running_loop()
+        interceptors = self._interceptors
+        metadata = {"module": args[0], "action": args[1]}
+        bounded = holds_threads(interceptors)
+        if bounded and not self._stream_slots.acquire(blocking=False):
+            deliver(ExecutionResult.from_exception(
+                OverloadedError(args[0], "too many intercepted streams open", {"limit": self.max_workers}),
+                metadata
+            ))
+            return
+        opened: List[bool] = []
+        
+        async def core(module_name, action, params=None, context=None, timeout=None):
+            if opened:
+                return ExecutionResult.from_exception(
+                    RuntimeError("The stream was already opened; call may only run once per stream"),
+                    {"module": module_name, "action": action}
+                )
+            opened.append(True)
+            stream = await open_stream(module_name, action, params, context, timeout)
+            if stream.result is not None:
+                deliver(stream)
+                return stream.result
+            finished = loop.create_future()
+            on_finish = stream._on_finish
+            
+            def finish(result: ExecutionResult) -> None:
+                if on_finish is not None:
+                    on_finish(result)
+                try:
+                    loop.call_soon_threadsafe(_settle, finished, result)
+                except RuntimeError:
+                    # The loop is closed: nobody is left to report to
+                    pass
+            
+            stream._on_finish = finish
+            deliver(stream)
+            # No reference is kept here, so a stream dropped unclosed by the
+            # caller is still finished when it is collected
+            del stream
+            return await finished
+        
+        try:
+            result = await compose_async(interceptors, core, self._get_stream_executor)(*args)
+        except Exception as e:
+            result = ExecutionResult.from_exception(e, metadata)
+        finally:
+            if bounded:
+                self._stream_slots.release()
+        deliver(result)
+    
+    def _open_stream(
+        self,
+        stream_class: type,
+        module_name: str,
+        action: str,
+        params: Optional[Dict]
+    ) -> Tuple[Any, Optional[ModuleEntry]]:
+        """
+        A stream for the request and the entry it runs on
+        
+        The stream is already finished when the execution cannot start.
+        The entry is checked out until the stream finishes.
+        """
+        metadata = {
+            "module": module_name,
+            "action": action,
+            "execution_id": self._ids.increment()
+        }
+        stream = stream_class(None, metadata)
+        try:
+            entry = self._checkout(module_name)
+        except KernelError as e:
+            stream._finish(e)
+            return stream, None
+        if entry is None:
+            stream._finish(ModuleNotFoundError(module_name))
+            return stream, None
+        stream._on_finish = lambda result: entry.leave()
+        spec = entry.dispatch.get(action)
+        if spec is None:
+            stream._finish(_action_not_found(module_name, action))
+        elif spec.validator is not None:
+            errors = spec.validator.validate(params or {})
+            if errors:
+                stream._finish(self._params_error(spec, errors))
+        return stream, entry
+    
+    def _stream_finished(
+        self,
+        entry: ModuleEntry,
+        action: str,
+        circuits: Optional[Tuple[Any, ...]] = None,
+        tokens: Optional[List[int]] = None
+    ) -> Callable[[ExecutionResult], None]:
+        started = time.perf_counter_ns()
+        
+        def finished(result: ExecutionResult) -> None:
+            elapsed = time.perf_counter_ns() - started
+            if entry.admission is not None:
+                entry.admission.release(elapsed / 1e9)
+            if circuits is not None:
+                self._leave_circuits(circuits, tokens, result)
+            self.latency.record(entry.name, action, elapsed, result.success)
+            entry.leave()
+        return finished
+    
+    def _stream_chunks(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        deadline: Optional[Deadline]
+    ) -> Any:
+        if entry.workers is not None or not spec.streams:
+            output = self._run(entry, spec, params, context, deadline)
+            yield from output if spec.streams else (output,)
+            return
+        
+        pool = entry.pool
+        module = pool.acquire(deadline.remaining() if deadline is not None else None)
+        output = loop = None
+        try:
+            with bind_deadline(deadline):
+                output = spec.handler(module, params, context)
+            if spec.is_async:
+                loop = asyncio.new_event_loop()
+            while True:
+                if deadline is not None and deadline.expired:
+                    raise ExecutionTimeoutError(entry.name, spec.name, deadline.timeout, deadline.elapsed())
+                with bind_deadline(deadline):
+                    try:
+                        chunk = next(output) if loop is None else loop.run_until_complete(output.__anext__())
+                    except (StopIteration, StopAsyncIteration):
+                        return
+                yield chunk
+        finally:
+            if isinstance(output, GeneratorType):
+                output.close()
+            if loop is not None:
+                try:
+                    loop.run_until_complete(output.aclose())
+                finally:
+                    loop.close()
+            pool.release(module)
+    
+    async def _stream_chunks_async(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        params: Dict,
+        context: Dict,
+        deadline: Optional[Deadline]
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if entry.workers is not None or not (spec.streams or spec.is_async):
+            call = loop.run_in_executor(executor, self._run, entry, spec, params, context, deadline)
+            if deadline is None:
+                output = await call
+            else:
+                try:
+                    output = await asyncio.wait_for(call, deadline.remaining())
+                except asyncio.TimeoutError:
+                    deadline.cancel()
+                    raise ExecutionTimeoutError(entry.name, spec.name, deadline.timeout, deadline.elapsed())
+            for chunk in output if spec.streams else (output,):
+                yield chunk
+            return
+        
+        pool = entry.pool
+        module = pool.try_acquire()
+        if module is None:
+            module = await loop.run_in_executor(
+                executor, pool.acquire, deadline.remaining() if deadline is not None else None
+            )
+        output = None
+        try:
+            output = spec.handler(module, params, context)
+            while True:
+                if deadline is not None and deadline.expired:
+                    raise ExecutionTimeoutError(entry.name, spec.name, deadline.timeout, deadline.elapsed())
+                if isinstance(output, GeneratorType):
+                    chunk = await loop.run_in_executor(executor, self._next_chunk, output, deadline)
+                    if chunk is _END:
+                        return
+                else:
+                    step = output.__anext__() if hasattr(output, "__anext__") else output
+                    try:
+                        if deadline is None:
+                            chunk = await step
+                        else:
+                            chunk = await asyncio.wait_for(step, deadline.remaining())
+                    except StopAsyncIteration:
+                        return
+                    except asyncio.TimeoutError:
+                        raise ExecutionTimeoutError(entry.name, spec.name, deadline.timeout, deadline.elapsed())
+                    if step is output:
+                        # A coroutine action: its value is the only chunk
+                        yield chunk
+                        return
+                yield chunk
+        finally:
+            if isinstance(output, GeneratorType):
+                output.close()
+            elif hasattr(output, "aclose"):
+                try:
+                    await output.aclose()
+                except RuntimeError:
+                    pass
+            pool.release(module)
+    
+    @staticmethod
+    def _next_chunk(output: GeneratorType, deadline: Optional[Deadline]) -> Any:
+        with bind_deadline(deadline):
+            return next(output, _END)
+    
+    def execute_workflow(self, steps: Any, context: Optional[Dict] = None) -> WorkflowResult:
+        """
+        Run a DAG of steps whose params reference earlier results
+        
+        `steps` is a list of step dicts or a compiled Workflow (see
+        workflow.py). Independent branches run concurrently on the kernel
+        thread pool; steps downstream of a failure are skipped. An invalid
+        graph raises ValidationError.
+        """
+        workflow = steps if isinstance(steps, Workflow) else Workflow(steps)
+        return workflow.run(self, context)
+    
+    async def execute_workflow_async(self, steps: Any, context: Optional[Dict] = None) -> WorkflowResult:
+        """execute_workflow() on the running event loop, through execute_async()"""
+        workflow = steps if isinstance(steps, Workflow) else Workflow(steps)
+        return await workflow.run_async(self, context)
+    
+    def execute_batch(self, requests: List[Any]) -> List[ExecutionResult]:
+        """
+        Execute many module actions in one call
+        
+        Each request is a dict with "module", "action", "params" and "context"
+        keys, or a (module, action, params, context) tuple. All requests are
+        validated in one pass and requests for the same module share one
+        leased instance; actions with a manifest timeout run under their own
+        deadline instead. Results are returned in input order; a failing item
+        is reported in its own result and never aborts the batch.
+        
+        Every item, failed or not, goes through the interceptor chain. An
+        item whose module, action or params an interceptor rewrites runs
+        as a plain execution instead.
+        """
+        requests = [self._normalize_request(request) for request in requests]
+        errors = InputValidator.validate_batch(requests)
+        
+        ids = self._ids.reserve(len(requests))
+        load_errors: Dict[str, Exception] = {}
+        if self.locator is not None:
+            for index, request in enumerate(requests):
+                name = request["module"] if errors[index] is None else None
+                if name is None or name in self._table or name in load_errors:
+                    continue
+                try:
+                    self._lookup(name)
+                except KernelError as e:
+                    load_errors[name] = e
+        table = self._table.snapshot()
+        timestamp = time.time()
+        results: List[Optional[ExecutionResult]] = [None] * len(requests)
+        
+        interceptors = self._interceptors
+        
+        def settle(index: int, produce: Callable[[Dict], ExecutionResult]) -> None:
+            """Store the result produce(request) makes, through the interceptor chain if any"""
+            request = requests[index] if isinstance(requests[index], dict) else {}
+            if not interceptors:
+                results[index] = produce(request)
+                return
+            
+            def core(module_name, action, params=None, context=None, timeout=None):
+                unchanged = (
+                    module_name == request.get("module") and action == request.get("action")
+                    and params is request.get("params") and timeout is None
+                )
+                if unchanged:
+                    return produce(dict(request, context=context))
+                # Rewritten by an interceptor: no longer the validated batch item
+                return type(self).execute(self, module_name, action, params, context, timeout)
+            
+            try:
+                results[index] = compose(interceptors, core)(
+                    request.get("module"), request.get("action"), request.get("params"), request.get("context")
+                )
+            except Exception as e:
+                results[index] = ExecutionResult.from_exception(
+                    e, {"module": request.get("module"), "action": request.get("action")}, timestamp
+                )
+        
+        def fail(index: int, error: Any) -> None:
+            def failed(request: Dict) -> ExecutionResult:
+                metadata = {
+                    "module": request.get("module"),
+                    "action": request.get("action"),
+                    "execution_id": ids[index]
+                }
+                if isinstance(error, Exception):
+                    return ExecutionResult.from_exception(error, metadata, timestamp)
+                return ExecutionResult(False, error=error, metadata=metadata, timestamp=timestamp)
+            settle(index, failed)
+        
+        groups: Dict[str, List[int]] = {}
+        for index, request in enumerate(requests):
+            if errors[index] is not None:
+                fail(index, ValidationError(f"Validation error: {errors[index]}"))
+            elif request["module"] in load_errors:
+                fail(index, load_errors[request["module"]])
+            elif request["module"] not in table:
+                fail(index, ModuleNotFoundError(request["module"]))
+            else:
+                groups.setdefault(request["module"], []).append(index)
+        
+        for module_name, indexes in groups.items():
+            # Checked out afresh: the snapshot's entry may have been reloaded since
+            try:
+                entry = self._checkout(module_name)
+            except KernelError as e:
+                for index in indexes:
+                    fail(index, e)
+                continue
+            if entry is None:
+                for index in indexes:
+                    fail(index, ModuleNotFoundError(module_name))
+                continue
+            try:
+                runnable = []
+                for index in indexes:
+                    spec = entry.dispatch.get(requests[index]["action"])
+                    if spec is None:
+                        fail(index, _action_not_found(module_name, requests[index]["action"]))
+                    else:
+                        runnable.append((index, spec))
+                runnable = self._check_batch_params(runnable, requests, fail)
+                if not runnable:
+                    continue
+                
+                # The group is admitted before its instance is leased, in the same
+                # order as execute(); it runs on one thread, so it takes one slot
+                admission = entry.admission
+                if admission is not None:
+                    try:
+                        admission.acquire()
+                    except KernelError as e:
+                        for index, _ in runnable:
+                            fail(index, e)
+                        continue
+                
+                pool = entry.pool
+                lease: List[Any] = [None]
+                if entry.workers is None:
+                    try:
+                        lease[0] = pool.acquire()
+                    except Exception as e:
+                        for index, _ in runnable:
+                            fail(index, e)
+                        if admission is not None:
+                            admission.release()
+                        continue
+                
+                ran = busy = 0
+                try:
+                    for index, spec in runnable:
+                        circuits = entry.circuits.get(spec.name)
+                        if circuits is not None:
+                            try:
+                                tokens = circuit_breaker.enter(circuits)
+                            except KernelError as e:
+                                fail(index, e)
+                                continue
+                        started = time.perf_counter_ns()
+                        try:
+                            if entry.workers is None and lease[0] is None:
+                                # The last item timed out and kept the instance
+                                lease[0] = pool.acquire()
+                            settle(index, lambda request: self._batch_item(
+                                entry, spec, lease, request, ids[index], timestamp
+                            ))
+                        except Exception as e:
+                            fail(index, e)
+                        finally:
+                            elapsed = time.perf_counter_ns() - started
+                            if circuits is not None:
+                                self._leave_circuits(circuits, tokens, results[index])
+                        ran += 1
+                        busy += elapsed
+                        self.latency.record(module_name, spec.name, elapsed, results[index].success)
+                finally:
+                    if lease[0] is not None:
+                        pool.release(lease[0])
+                    if admission is not None:
+                        # AIMD sees the group's mean execution time
+                        admission.release(busy / ran / 1e9 if ran else None)
+            finally:
+                entry.leave()
+        
+        return results
+    
+    def _batch_item(
+        self,
+        entry: ModuleEntry,
+        spec: Any,
+        lease: List[Any],
+        request: Dict,
+        execution_id: int,
+        timestamp: float
+    ) -> ExecutionResult:
+        """Run one validated batch item on the leased instance (None for isolated modules)"""
+        params = request.get("params") or {}
+        context = request.get("context") or {}
+        metadata = {
+            "module": entry.name,
+            "action": spec.name,
+            "execution_id": execution_id
+        }
+        cache_key = None
+        if spec.pure:
+            cache_key, cached = self._cache_lookup(entry, spec, params)
+            if cached is not MISS:
+                metadata["cached"] = True
+                return ExecutionResult(True, data=cached, metadata=metadata, timestamp=timestamp)
+        try:
+            if spec.timeout is not None:
+                data = self._run_with_deadline(
+                    entry, spec, params, context, Deadline(spec.timeout), lease
+                )
+            elif lease[0] is None:
+                data = entry.workers.execute(spec.name, params, context)
+            else:
+                data = self._invoke(spec, lease[0], params, context)
+        except Exception as e:
+            return ExecutionResult.from_exception(e, metadata, timestamp)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, data, spec.cache_ttl)
+        return ExecutionResult(True, data=data, metadata=metadata, timestamp=timestamp)
+    
+    @staticmethod
+    def _params_error(spec: Any, errors: List[str]) -> ValidationError:
+        return ValidationError(
+            f"Invalid params for {spec.name}: " + "; ".join(errors),
+            {"action": spec.name, "errors": errors}
+        )
+    
+    def _check_batch_params(self, runnable: List[Tuple[int, Any]], requests: List[Dict], fail) -> List[Tuple[int, Any]]:
+        """Validate batch params one action at a time; returns the items that passed"""
+        by_action: Dict[str, Tuple[Any, List[int]]] = {}
+        for index, spec in runnable:
+            if spec.validator is not None:
+                by_action.setdefault(spec.name, (spec, []))[1].append(index)
+        if not by_action:
+            return runnable
+        
+        rejected = set()
+        for spec, indexes in by_action.values():
+            params_list = [requests[index].get("params") or {} for index in indexes]
+            for index, errors in zip(indexes, spec.validator.validate_many(params_list)):
+                if errors:
+                    fail(index, self._params_error(spec, errors))
+                    rejected.add(index)
+        return [(index, spec) for index, spec in runnable if index not in rejected]
+    
+    @staticmethod
+    def _normalize_request(request: Any) -> Any:
+        """Turn a (module, action, params, context) tuple into a request dict"""
+        if isinstance(request, (tuple, list)):
+            fields = ("module", "action", "params", "context")
+            return {k: v for k, v in zip(fields, request) if v is not None}
+        return request
     
     def get_status(self) -> Dict:
         """Get kernel status"""
-        return {
+        status = {
             "version": self.VERSION,
-            "registered_modules": list(self.modules.keys()),
-            "execution_count": self.execution_count
+            "registered_modules": list(self._table),
+            "execution_count": self.execution_count,
+            "cache": self.result_cache.get_stats(),
+            "latency": self.latency.snapshot(),
+            "coalescing": self.single_flight.get_status(),
+            "pools": {
+                name: (entry.workers or entry.pool).get_status()
+                for name, entry in self._table.snapshot().items()
+            }
+        }
+        admission = {
+            name: entry.admission.get_status()
+            for name, entry in self._table.snapshot().items()
+            if entry.admission is not None
         }
+        if admission:
+            status["admission"] = admission
+        circuits = {}
+        for name, entry in self._table.snapshot().items():
+            for guards in entry.circuits.values():
+                for breaker in guards:
+                    states = circuits.setdefault(name, {"module": None, "actions": {}})
+                    if breaker.action is None:
+                        states["module"] = states["module"] or breaker.get_status()
+                    else:
+                        states["actions"][breaker.action] = breaker.get_status()
+        if circuits:
+            status["circuits"] = circuits
+        if self._reloads:
+            with self._reloads_lock:
+                status["reloads"] = {name: dict(stats) for name, stats in self._reloads.items()}
+        if self.locator is not None:
+            status["locator"] = self.locator.get_status()
+        return status
 
 
 kernel_instance = KernelCore()
@@ -0,0 +1,245 @@
+"""
+Kernel Server - Long-running kernel daemon
+Serves execution requests as JSON lines over a Unix domain socket
+"""
+
+from typing import Any, Callable, Dict, Optional
+import json
+import os
+import socketserver
+import threading
+
+import serialization
+
+from kernel_core import KernelCore, ExecutionResult, ExecutionStream
+from input_validator import validate_input, ValidationError
+from permissions import permissions
+from kernel_client import KernelClient, DaemonUnavailable, default_socket_path
+
+
+# Protocol: one JSON object per line in each direction.
+#
+#   request: {"op": "execute", "module": ..., "action": ..., "params": ..., "context": ...}
+#            {"op": "stream", ...same fields as execute...}
+#            {"op": "reload", "module": ...}
+#            {"op": "ping"} | {"op": "status"} | {"op": "shutdown"}
+#   reply:   {"ok": true, "result": {...}} or {"ok": false, "error": "..."}
+#
+# A stream reply is one {"chunk": ...} line per chunk, as the action
+# produces them, followed by an ordinary reply whose result is the trailer.
+#
+# "ok" is false only when the request was rejected before execution
+# (invalid input, permission denied); failed executions are ok replies
+# whose result has "success": false.
+
+
+def execute_request(kernel: KernelCore, request: Dict, stream: bool = False) -> Dict:
+    """
+    Validate, authorize and execute one CLI-style request
+    
+    Shared by the daemon and the CLI's in-process fallback so both give
+    the same answers. With `stream` the reply holds an ExecutionStream
+    under "stream" instead of a result.
+    """
+    request = {
+        "module": request.get("module"),
+        "action": request.get("action", "run"),
+        "params": request.get("params", {}),
+        "context": request.get("context", {})
+    }
+    try:
+        validate_input(request)
+    except ValidationError as e:
+        return {"ok": False, "error": f"Validation error: {str(e)}"}
+    
+    module_name = request["module"]
+    user_context = request["context"]
+    if user_context.get("user"):
+        permission = f"{module_name}:execute"
+        if not permissions.has_permission(user_context["user"], permission):
+            return {"ok": False, "error": f"Permission denied: {permission}"}
+    
+    if stream:
+        return {
+            "ok": True,
+            "stream": kernel.execute_stream(module_name, request["action"], request["params"], user_context)
+        }
+    result = kernel.execute(module_name, request["action"], request["params"], user_context)
+    return {"ok": True, "result": result}
+
+
+def write_stream(stream: ExecutionStream, write: Callable[[str], Any]) -> ExecutionResult:
+    """
+    Pass each chunk, encoded as JSON, to `write`; returns the trailer
+    
+    A chunk that cannot be encoded ends the stream with an error trailer.
+    """
+    for chunk in stream:
+        try:
+            line = serialization.encode(chunk)
+        except (TypeError, ValueError) as e:
+            stream.close()
+            return ExecutionResult.from_exception(
+                ValueError(f"Chunk is not JSON serializable: {e}"), stream.result.metadata
+            )
+        try:
+            write(line)
+        except OSError:
+            stream.close()
+            raise
+    return stream.result
+
+
+def encode_reply(reply: Dict) -> bytes:
+    """
+    Encode a reply envelope as one JSON line
+    
+    A result whose data cannot be encoded is replaced by an error result,
+    and any other envelope that cannot be encoded by an error envelope, so
+    the client always gets an answer.
+    """
+    result = reply.get("result")
+    if isinstance(result, ExecutionResult):
+        try:
+            document = result.to_json()
+        except (TypeError, ValueError) as e:
+            document = ExecutionResult.from_exception(
+                ValueError(f"Result is not JSON serializable: {e}"), result.metadata, result.created
+            ).to_json()
+        return b'{"ok": true, "result": ' + document.encode("utf-8") + b"}\n"
+    try:
+        return json.dumps(reply, default=str).encode("utf-8") + b"\n"
+    except (TypeError, ValueError) as e:
+        return json.dumps({"ok": False, "error": f"Reply is not JSON serializable: {e}"}).encode("utf-8") + b"\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    
+    def _write_chunk(self, chunk: str) -> None:
+        self.wfile.write(b'{"chunk": ' + chunk.encode("utf-8") + b"}\n")
+    
+    def handle(self):
+        server = self.server.kernel_server
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            message = None
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                message = None
+                reply = {"ok": False, "error": f"Invalid request: {e}"}
+            else:
+                reply = server.handle_message(message)
+            try:
+                if "stream" in reply:
+                    reply = {"ok": True, "result": write_stream(reply["stream"], self._write_chunk)}
+                self.wfile.write(encode_reply(reply))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            if message is not None and message.get("op") == "shutdown":
+                server.stop_async()
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class KernelServer:
+    """
+    Kernel daemon bound to a Unix domain socket
+    
+    Each connection is served on its own thread against one shared
+    KernelCore, so modules stay registered and their pools stay warm
+    between requests. The socket is created readable and writable by the
+    owner only.
+    """
+    
+    def __init__(self, kernel: KernelCore, socket_path: Optional[str] = None):
+        self.kernel = kernel
+        self.socket_path = socket_path or default_socket_path()
+        self._server: Optional[_UnixServer] = None
+        self._lock = threading.Lock()
+    
+    def handle_message(self, message: Dict) -> Dict:
+        op = message.get("op", "execute")
+        try:
+            if op == "execute":
+                return execute_request(self.kernel, message)
+            if op == "stream":
+                return execute_request(self.kernel, message, stream=True)
+            if op == "reload":
+                module = message.get("module")
+                if not isinstance(module, str) or not module:
+                    return {"ok": False, "error": "Validation error: reload needs a module name"}
+                return {"ok": True, "result": self.kernel.reload_module(module)}
+            if op == "ping":
+                return {"ok": True, "result": {"pid": os.getpid()}}
+            if op == "status":
+                return {"ok": True, "result": self.kernel.get_status()}
+            if op == "shutdown":
+                return {"ok": True, "result": {"stopping": True}}
+            return {"ok": False, "error": f"Unknown op: {op}"}
+        except Exception as e:
+            return {"ok": False, "error": f"Execution error: {str(e)}"}
+    
+    def bind(self) -> None:
+        """Create the listening socket, replacing a stale one left by a dead daemon"""
+        if os.path.exists(self.socket_path):
+            try:
+                with KernelClient(self.socket_path, timeout=1.0) as client:
+                    client.ping()
+            except (DaemonUnavailable, OSError, ValueError):
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"Kernel daemon already running at {self.socket_path}")
+        
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.kernel_server = self
+    
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+    
+    def start(self) -> threading.Thread:
+        """Serve on a background thread"""
+        if self._server is None:
+            self.bind()
+        thread = threading.Thread(target=self._server.serve_forever, name="kernel-server", daemon=True)
+        thread.start()
+        return thread
+    
+    def stop_async(self) -> None:
+        # shutdown() blocks until serve_forever returns, so never call it on a handler thread
+        threading.Thread(target=self.stop, daemon=True).start()
+    
+    def stop(self) -> None:
+        server = self._server
+        if server is not None:
+            server.shutdown()
+        self.close()
+    
+    def close(self) -> None:
+        with self._lock:
+            server, self._server = self._server, None
+        if server is None:
+            return
+        server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        self.kernel.shutdown(wait=False)
@@ -0,0 +1,195 @@
+"""
+Latency - Execution latency histograms
+Fixed-memory log-linear histograms recorded per thread without locks
+"""
+
+from typing import Dict, List, Optional, Tuple
+import threading
+import weakref
+
+
+# Log-linear buckets: values below 2**SUB_BITS get one bucket each, above
+# that every power of two is split into 2**(SUB_BITS - 1) equal buckets, so
+# any recorded value is within ~3% of its bucket bounds.
+SUB_BITS = 5
+MAX_VALUE_NS = 1 << 42  # ~73 minutes; longer executions land in the last bucket
+
+
+def bucket_index(value: int) -> int:
+    """Bucket holding `value` nanoseconds"""
+    bits = value.bit_length()
+    if bits <= SUB_BITS:
+        return value
+    shift = bits - SUB_BITS
+    return (shift << (SUB_BITS - 1)) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Lowest and highest value that fall in bucket `index`"""
+    if index < (1 << SUB_BITS):
+        return index, index
+    shift = (index >> (SUB_BITS - 1)) - 1
+    top = index - (shift << (SUB_BITS - 1))
+    return top << shift, ((top + 1) << shift) - 1
+
+
+BUCKETS = bucket_index(MAX_VALUE_NS - 1) + 1
+PERCENTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99), ("p999", 0.999))
+
+
+class _Shard:
+    """Histogram slice written by exactly one thread"""
+    
+    __slots__ = ("counts", "count", "errors", "total_ns", "min_ns", "max_ns")
+    
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.min_ns = MAX_VALUE_NS
+        self.max_ns = 0
+    
+    def add(self, elapsed_ns: int, ok: bool) -> None:
+        if elapsed_ns >= MAX_VALUE_NS:
+            elapsed_ns = MAX_VALUE_NS - 1
+        # bucket_index() inlined: this runs on every execution
+        shift = elapsed_ns.bit_length() - SUB_BITS
+        if shift > 0:
+            self.counts[(shift << (SUB_BITS - 1)) + (elapsed_ns >> shift)] += 1
+        else:
+            self.counts[elapsed_ns] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if not ok:
+            self.errors += 1
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+    
+    def merge(self, other: "_Shard") -> None:
+        """Fold another shard's recordings into this one"""
+        counts = self.counts
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                counts[index] += bucket_count
+        self.count += other.count
+        self.errors += other.errors
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.min_ns = min(self.min_ns, other.min_ns)
+
+
+class _ThreadShards(dict):
+    """One thread's shards by (module, action); dropped when the thread ends"""
+    
+    __slots__ = ("__weakref__",)
+
+
+def _summarize(shards: List[_Shard]) -> Dict:
+    counts = [sum(column) for column in zip(*(shard.counts for shard in shards))]
+    count = sum(shard.count for shard in shards)
+    errors = sum(shard.errors for shard in shards)
+    low = min(shard.min_ns for shard in shards)
+    high = max(shard.max_ns for shard in shards)
+    summary = {
+        "count": count,
+        "errors": errors,
+        "error_rate": errors / count if count else 0,
+        "mean_ms": sum(shard.total_ns for shard in shards) / count / 1e6 if count else 0,
+        "min_ms": low / 1e6 if count else 0,
+        "max_ms": high / 1e6
+    }
+    
+    targets = iter(PERCENTILES)
+    name, fraction = next(targets)
+    seen = 0
+    for index, bucket_count in enumerate(counts):
+        if not bucket_count:
+            continue
+        seen += bucket_count
+        while name is not None and seen >= fraction * count:
+            lower, upper = bucket_bounds(index)
+            value = min(max((lower + upper) / 2, low), high)
+            summary[f"{name}_ms"] = value / 1e6
+            name, fraction = next(targets, (None, None))
+        if name is None:
+            break
+    for name, _ in PERCENTILES:
+        summary.setdefault(f"{name}_ms", 0)
+    return summary
+
+
+class LatencyRecorder:
+    """
+    Latency histograms per (module, action)
+    
+    Each thread records into its own shard, so record() takes no lock and
+    threads never contend; a lock is only taken the first time a thread
+    records a given pair. When a thread ends its shards are folded into
+    one retired shard per pair, so memory follows the live threads rather
+    than every thread that ever recorded. snapshot() merges the shards.
+    """
+    
+    def __init__(self):
+        # Reentrant: a thread's shards may be retired while it holds the lock
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._shards: Dict[Tuple[str, str], List[_Shard]] = {}
+        self._retired: Dict[Tuple[str, str], _Shard] = {}
+    
+    def record(self, module: str, action: str, elapsed_ns: int, ok: bool = True) -> None:
+        """Record one execution of `elapsed_ns` nanoseconds"""
+        local = self._local
+        try:
+            shard = local.shards[(module, action)]
+        except (AttributeError, KeyError):
+            shard = self._new_shard(local, (module, action))
+        shard.add(elapsed_ns, ok)
+    
+    def _new_shard(self, local: threading.local, key: Tuple[str, str]) -> _Shard:
+        shards = local.__dict__.get("shards")
+        if shards is None:
+            shards = local.shards = _ThreadShards()
+            # The finalizer holds the thread's shards, not the dict it watches
+            owned = local.owned = []
+            weakref.finalize(shards, self._retire, owned).atexit = False
+        shard = shards[key] = _Shard()
+        local.owned.append((key, shard))
+        with self._lock:
+            self._shards.setdefault(key, []).append(shard)
+        return shard
+    
+    def _retire(self, owned: List[Tuple[Tuple[str, str], _Shard]]) -> None:
+        """Fold the shards of a thread that ended into the retired shards"""
+        with self._lock:
+            for key, shard in owned:
+                shards = self._shards.get(key)
+                if not shards or not any(live is shard for live in shards):
+                    # Recorded before reset()
+                    continue
+                shards.remove(shard)
+                retired = self._retired.get(key)
+                if retired is None:
+                    retired = self._retired[key] = _Shard()
+                    shards.append(retired)
+                retired.merge(shard)
+    
+    def snapshot(self, module: Optional[str] = None) -> Dict[str, Dict[str, Dict]]:
+        """Latency summary by module, then action; times in milliseconds"""
+        with self._lock:
+            pairs = [(key, list(shards)) for key, shards in self._shards.items()]
+        summary: Dict[str, Dict[str, Dict]] = {}
+        for (module_name, action), shards in sorted(pairs):
+            if module is None or module_name == module:
+                summary.setdefault(module_name, {})[action] = _summarize(shards)
+        return summary
+    
+    def reset(self) -> None:
+        """Drop all recorded latencies"""
+        with self._lock:
+            # Threads look up self._local on every record, so they move to fresh shards
+            self._local = threading.local()
+            self._shards = {}
+            self._retired = {}
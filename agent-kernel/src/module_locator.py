@@ -0,0 +1,355 @@
+"""
+Module Locator - Manifest-indexed module discovery
+Finds kernel modules from package manifests and imports them on first use
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+import importlib.util
+import itertools
+import json
+import os
+import sys
+import threading
+
+from error_handler import KernelError, ErrorCode, ModuleLoadError
+
+
+MODULE_PATH_ENV = "AGENT_KERNEL_MODULE_PATH"
+INDEX_PATH_ENV = "AGENT_KERNEL_INDEX"
+
+
+def default_module_paths() -> List[str]:
+    """Search roots from AGENT_KERNEL_MODULE_PATH, or the directory holding agent-kernel"""
+    paths = os.environ.get(MODULE_PATH_ENV)
+    if paths:
+        return [path for path in paths.split(os.pathsep) if path]
+    return [os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))]
+
+
+def default_index_path() -> str:
+    """Index path from AGENT_KERNEL_INDEX, or the per-user cache directory"""
+    path = os.environ.get(INDEX_PATH_ENV)
+    if path:
+        return path
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "agent-kernel", "module-index.json")
+
+
+# Suffixes for fresh imports, so a reloaded file never replaces the loaded copy
+_generations = itertools.count(1)
+
+# sys.modules names of fresh imports, dropped by release_import() once superseded
+_fresh_imports: Set[str] = set()
+
+
+def reimport_class(module_class: type) -> type:
+    """
+    Fresh copy of a class, imported from its source file next to the loaded one
+    
+    The module the class was defined in is executed again under a new
+    name; the loaded module and its class are left untouched.
+    """
+    module = sys.modules.get(module_class.__module__)
+    path = getattr(module, "__file__", None)
+    name = module_class.__name__
+    if not path or module_class.__qualname__ != name:
+        raise KernelError(
+            f"Module class cannot be reloaded from source: {module_class.__qualname__}",
+            ErrorCode.EXECUTION_FAILED,
+            {"class": module_class.__qualname__, "module": module_class.__module__}
+        )
+    return ModuleLocator._import({"name": module_class.__module__, "path": path, "class": name}, fresh=True)
+
+
+def release_import(module_class: type) -> None:
+    """
+    Drop the fresh import a superseded class came from out of sys.modules
+    
+    The old code is then collected once nothing uses it any more. Classes
+    imported under their own module name are left alone.
+    """
+    name = module_class.__module__
+    if name in _fresh_imports:
+        _fresh_imports.discard(name)
+        sys.modules.pop(name, None)
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ModuleLocator:
+    """
+    Index of the kernel modules published by packages under a set of roots
+    
+    A package is a directory holding a manifest.json; each entry of its
+    "modules" list names a kernel module:
+    
+        {"name": "example_module", "entry_point": "src/example_module.py",
+         "class": "ExampleModule", "actions": ["echo", "add"]}
+    
+    An entry may also carry the "runtime" and "params" sections a module
+    manifest takes; they are indexed with it and passed to the kernel.
+    
+    Roots are scanned once and the result is saved to an on-disk index.
+    Later processes revalidate it with a few stat() calls per package
+    (directory and manifest mtimes) and rescan only the roots that changed.
+    Nothing is imported until load() is called for a module.
+    """
+    
+    INDEX_VERSION = 2
+    
+    def __init__(self, roots: Optional[List[str]] = None, index_path: Optional[str] = None):
+        self.roots = [os.path.abspath(root) for root in (roots or default_module_paths())]
+        self.index_path = index_path if index_path is not None else default_index_path()
+        self._lock = threading.RLock()
+        self._index: Optional[Dict] = None
+        self._loaded: Dict[str, Tuple[type, Dict]] = {}
+        self.rescans = 0
+    
+    def _ensure_index(self) -> Dict:
+        if self._index is not None:
+            return self._index
+        with self._lock:
+            if self._index is None:
+                self._index = self._revalidate(self._read_index())
+            return self._index
+    
+    def refresh(self) -> None:
+        """Revalidate the index against the file system now"""
+        with self._lock:
+            self._index = self._revalidate(self._index or self._read_index())
+    
+    def _read_index(self) -> Dict:
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            if index.get("version") == self.INDEX_VERSION:
+                return index
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"version": self.INDEX_VERSION, "roots": {}}
+    
+    def _write_index(self, index: Dict) -> None:
+        if not self.index_path:
+            return
+        # Write then rename, so concurrent readers never see a partial index
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    def _revalidate(self, index: Dict) -> Dict:
+        cached = index.get("roots", {})
+        roots = {}
+        changed = set(cached) != set(self.roots)
+        for root in self.roots:
+            entry = cached.get(root)
+            if entry is None or not self._is_fresh(root, entry):
+                entry = self._scan_root(root)
+                changed = True
+            roots[root] = entry
+        
+        index = {"version": self.INDEX_VERSION, "roots": roots}
+        if changed:
+            self.rescans += 1
+            self._write_index(index)
+        return index
+    
+    @staticmethod
+    def _is_fresh(root: str, entry: Dict) -> bool:
+        if _mtime(root) != entry.get("mtime"):
+            return False
+        for package, (dir_mtime, manifest_mtime) in entry.get("packages", {}).items():
+            if _mtime(package) != dir_mtime:
+                return False
+            if _mtime(os.path.join(package, "manifest.json")) != manifest_mtime:
+                return False
+        return True
+    
+    def _scan_root(self, root: str) -> Dict:
+        """Read the manifest of the root and of each directory directly under it"""
+        entry = {"mtime": _mtime(root), "packages": {}, "modules": {}}
+        try:
+            children = sorted(os.listdir(root))
+        except OSError:
+            return entry
+        
+        for package in [root] + [os.path.join(root, child) for child in children]:
+            if package != root and not os.path.isdir(package):
+                continue
+            manifest_path = os.path.join(package, "manifest.json")
+            entry["packages"][package] = [_mtime(package), _mtime(manifest_path)]
+            for record in self._read_package(package, manifest_path):
+                entry["modules"].setdefault(record["name"], record)
+        return entry
+    
+    @staticmethod
+    def _read_package(package: str, manifest_path: str) -> List[Dict]:
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(manifest, dict):
+            return []
+        
+        records = []
+        for module in manifest.get("modules", []):
+            if not isinstance(module, dict) or not module.get("name") or not module.get("class"):
+                continue
+            if not module.get("entry_point"):
+                continue
+            record = {
+                "name": module["name"],
+                "path": os.path.normpath(os.path.join(package, module["entry_point"])),
+                "class": module["class"],
+                "actions": list(module.get("actions", [])),
+                "version": str(module.get("version", manifest.get("version", ""))),
+                "package": manifest.get("name", os.path.basename(package))
+            }
+            for section in ("runtime", "params"):
+                if isinstance(module.get(section), dict):
+                    record[section] = module[section]
+            records.append(record)
+        return records
+    
+    @staticmethod
+    def _manifest(record: Dict) -> Dict:
+        """Manifest for a module registered from its index record"""
+        manifest = {
+            "name": record["name"],
+            "version": record["version"],
+            "actions": record["actions"]
+        }
+        for section in ("runtime", "params"):
+            if section in record:
+                manifest[section] = record[section]
+        return manifest
+    
+    def find(self, name: str) -> Optional[Dict]:
+        """
+        Index record for a module, or None; the first root listing it wins
+        
+        A miss revalidates the index first, so modules installed while a
+        long-running process (e.g. the kernel daemon) is up are found.
+        """
+        record = self._find(self._ensure_index(), name)
+        if record is None:
+            self.refresh()
+            record = self._find(self._index, name)
+        return record
+    
+    def _find(self, index: Dict, name: str) -> Optional[Dict]:
+        for root in self.roots:
+            record = index["roots"][root]["modules"].get(name)
+            if record is not None:
+                return record
+        return None
+    
+    def available(self) -> Dict[str, Dict]:
+        """Every indexed module by name"""
+        modules: Dict[str, Dict] = {}
+        for root in self.roots:
+            for name, record in self._ensure_index()["roots"][root]["modules"].items():
+                modules.setdefault(name, record)
+        return modules
+    
+    def load(self, name: str) -> Optional[Tuple[type, Dict]]:
+        """
+        Import a module's class; returns (class, manifest) or None when not indexed
+        
+        The manifest is built from the index record and is used when the
+        class has no get_manifest() of its own.
+        """
+        loaded = self._loaded.get(name)
+        if loaded is not None:
+            return loaded
+        record = self.find(name)
+        if record is None:
+            return None
+        
+        with self._lock:
+            loaded = self._loaded.get(name)
+            if loaded is None:
+                module_class = self._import(record)
+                loaded = self._loaded[name] = (module_class, self._manifest(record))
+            return loaded
+    
+    def reload(self, name: str) -> Optional[Tuple[type, Dict]]:
+        """
+        Import a module's class again from its current file; None when not indexed
+        
+        The new code is imported alongside the loaded version, which stays
+        usable by anyone still holding it; release_import() lets it go once
+        nobody does. Later load() calls return the reloaded class.
+        """
+        self.refresh()
+        record = self._find(self._index, name)
+        if record is None:
+            return None
+        with self._lock:
+            module_class = self._import(record, fresh=True)
+            loaded = self._loaded[name] = (module_class, self._manifest(record))
+            return loaded
+    
+    @staticmethod
+    def _import(record: Dict, fresh: bool = False) -> type:
+        path = record["path"]
+        stem = os.path.splitext(os.path.basename(path))[0]
+        existing = sys.modules.get(stem)
+        if not fresh and existing is not None and getattr(existing, "__file__", None) == path:
+            module = existing
+        else:
+            module = None
+        
+        try:
+            if module is None:
+                # Keep the plain file name only for the module it is named after,
+                # so a package's helper files never shadow another package's
+                if fresh:
+                    module_name = f"{stem}__{record['name']}__{next(_generations)}"
+                elif existing is None and stem == record["name"]:
+                    module_name = stem
+                else:
+                    module_name = f"{stem}__{record['name']}"
+                spec = importlib.util.spec_from_file_location(module_name, path)
+                if spec is None or spec.loader is None:
+                    raise ImportError(f"Cannot import {path}")
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                # Entry points import their siblings (e.g. module_template) by plain name
+                directory = os.path.dirname(path)
+                sys.path.insert(0, directory)
+                try:
+                    spec.loader.exec_module(module)
+                except BaseException:
+                    sys.modules.pop(module_name, None)
+                    raise
+                finally:
+                    sys.path.remove(directory)
+                if fresh:
+                    _fresh_imports.add(module_name)
+            return getattr(module, record["class"])
+        except Exception as e:
+            raise ModuleLoadError(record["name"], e, {"path": path})
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get locator status"""
+        return {
+            "roots": self.roots,
+            "index_path": self.index_path,
+            "indexed": sorted(self.available()),
+            "loaded": sorted(self._loaded),
+            "rescans": self.rescans
+        }
@@ -0,0 +1,324 @@
+"""
+Module Pool - Pooled, pre-initialized module instances
+Creates and initializes module instances once and leases them per execution
+"""
+
+from typing import Any, Callable, Dict, Optional
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
+
+from error_handler import KernelError, ErrorCode
+
+
+class PoolSettings:
+    """Pool configuration for a single module"""
+    
+    DEFAULT_SIZE = 4
+    DEFAULT_IDLE_TIMEOUT = 300.0
+    DEFAULT_LEASE_TIMEOUT = 30.0
+    
+    def __init__(
+        self,
+        size: int = DEFAULT_SIZE,
+        idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+        thread_safe: bool = False,
+        lease_timeout: Optional[float] = DEFAULT_LEASE_TIMEOUT
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.thread_safe = thread_safe
+        self.lease_timeout = lease_timeout
+    
+    @classmethod
+    def from_manifest(cls, manifest: Optional[Dict]) -> "PoolSettings":
+        """Read settings from the manifest "runtime.pool" section"""
+        runtime = (manifest or {}).get("runtime", {})
+        pool = runtime.get("pool", {})
+        return cls(
+            size=pool.get("size", cls.DEFAULT_SIZE),
+            idle_timeout=pool.get("idle_timeout", cls.DEFAULT_IDLE_TIMEOUT),
+            thread_safe=pool.get("thread_safe", False),
+            lease_timeout=pool.get("lease_timeout", cls.DEFAULT_LEASE_TIMEOUT)
+        )
+    
+    def to_dict(self) -> Dict:
+        return {
+            "size": self.size,
+            "idle_timeout": self.idle_timeout,
+            "thread_safe": self.thread_safe,
+            "lease_timeout": self.lease_timeout
+        }
+
+
+class ModulePool:
+    """
+    Pool of initialized instances for one module
+    
+    Modules that are not thread-safe get exclusive leases: an instance is
+    handed to one execution at a time and at most `size` instances exist.
+    Thread-safe modules share a single instance across concurrent leases.
+    Instances idle for longer than `idle_timeout` seconds are evicted.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        config: Optional[Dict] = None,
+        settings: Optional[PoolSettings] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.factory = factory
+        self.config = config or {}
+        self.settings = settings or PoolSettings()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._waiters = 0
+        self._idle = deque()
+        self._alive = 0
+        self._leased = 0
+        self._shared = None
+        self._shared_last_used = 0.0
+        self._created = 0
+        self._evicted = 0
+        self._draining = False
+        self._closed = False
+    
+    def _create(self) -> Any:
+        """Construct and initialize a new instance"""
+        instance = self.factory()
+        self._initialize(instance)
+        return instance
+    
+    def _initialize(self, instance: Any) -> None:
+        initialize = getattr(instance, "initialize", None)
+        if callable(initialize) and initialize(dict(self.config)) is False:
+            raise KernelError(
+                f"Module failed to initialize: {self.name}",
+                ErrorCode.EXECUTION_FAILED,
+                {"module": self.name}
+            )
+    
+    def add_instance(self, instance: Any) -> bool:
+        """Initialize an already constructed instance and add it as idle"""
+        with self._lock:
+            if self._closed or self._alive >= self.settings.size:
+                return False
+            self._alive += 1
+        try:
+            self._initialize(instance)
+        except Exception:
+            with self._lock:
+                self._alive -= 1
+            raise
+        with self._lock:
+            self._created += 1
+            if self.settings.thread_safe and self._shared is None:
+                self._shared = instance
+                self._shared_last_used = self._clock()
+            else:
+                self._idle.append((instance, self._clock()))
+            self._cond.notify()
+        return True
+    
+    def warm(self, count: int) -> int:
+        """Create idle instances until `count` are alive (at most the pool size); returns how many were made"""
+        target = 1 if self.settings.thread_safe else min(count, self.settings.size)
+        created = 0
+        while True:
+            with self._lock:
+                if self._closed or self._alive >= target:
+                    break
+            if not self.add_instance(self.factory()):
+                break
+            created += 1
+        return created
+    
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Lease an instance, creating one if the pool has room"""
+        if self.settings.thread_safe:
+            return self._acquire_shared()
+        
+        deadline = None
+        with self._lock:
+            while True:
+                if self._idle:
+                    self._leased += 1
+                    return self._idle.pop()[0]
+                if self._closed:
+                    raise KernelError(
+                        f"Module pool closed: {self.name}",
+                        ErrorCode.EXECUTION_FAILED,
+                        {"module": self.name}
+                    )
+                if self._alive < self.settings.size:
+                    self._alive += 1
+                    self._leased += 1
+                    break
+                if deadline is None:
+                    if timeout is None:
+                        timeout = self.settings.lease_timeout
+                    deadline = float("inf") if timeout is None else self._clock() + timeout
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    raise KernelError(
+                        f"Module pool exhausted: {self.name}",
+                        ErrorCode.TIMEOUT,
+                        {"module": self.name, "size": self.settings.size}
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(None if remaining == float("inf") else remaining)
+                finally:
+                    self._waiters -= 1
+        
+        try:
+            instance = self._create()
+        except Exception:
+            with self._lock:
+                self._alive -= 1
+                self._leased -= 1
+                self._cond.notify()
+            raise
+        with self._lock:
+            self._created += 1
+        return instance
+    
+    def try_acquire(self) -> Optional[Any]:
+        """Lease an idle instance without creating or waiting; None if none is idle"""
+        if self.settings.thread_safe:
+            return self._acquire_shared()
+        with self._lock:
+            if not self._idle:
+                return None
+            self._leased += 1
+            return self._idle.pop()[0]
+    
+    def _acquire_shared(self) -> Any:
+        with self._lock:
+            if self._closed:
+                raise KernelError(
+                    f"Module pool closed: {self.name}",
+                    ErrorCode.EXECUTION_FAILED,
+                    {"module": self.name}
+                )
+            if self._shared is None:
+                instance = self._create()
+                self._shared = instance
+                self._alive = 1
+                self._created += 1
+            self._leased += 1
+            return self._shared
+    
+    def release(self, instance: Any, discard: bool = False) -> None:
+        """Return a leased instance to the pool"""
+        with self._lock:
+            self._leased -= 1
+            if self.settings.thread_safe:
+                self._shared_last_used = self._clock()
+                if discard and instance is self._shared:
+                    self._shared = None
+                    self._alive = 0
+                if self._draining:
+                    self._cond.notify_all()
+                return
+            if discard or self._closed or self._draining:
+                self._alive -= 1
+            else:
+                self._idle.append((instance, self._clock()))
+                if self._alive > 1:
+                    self._evict_expired()
+            if self._draining:
+                self._cond.notify_all()
+            elif self._waiters:
+                self._cond.notify()
+    
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Context manager leasing an instance for one execution"""
+        instance = self.acquire(timeout)
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+    
+    def _evict_expired(self) -> int:
+        idle_timeout = self.settings.idle_timeout
+        if idle_timeout is None:
+            return 0
+        cutoff = self._clock() - idle_timeout
+        evicted = 0
+        
+        # Idle instances are appended on release, so the oldest sit on the left
+        while self._idle and self._idle[0][1] <= cutoff:
+            self._idle.popleft()
+            self._alive -= 1
+            evicted += 1
+        
+        if (self._shared is not None and self._leased == 0
+                and self._shared_last_used <= cutoff):
+            self._shared = None
+            self._alive = 0
+            evicted += 1
+        
+        self._evicted += evicted
+        return evicted
+    
+    def evict_idle(self) -> int:
+        """Drop instances that have been idle for longer than idle_timeout"""
+        with self._lock:
+            return self._evict_expired()
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Retire the pool once its leases come back, then close it
+        
+        Idle instances are dropped at once and leased ones are discarded on
+        release. Leases are still granted meanwhile, so executions that
+        already resolved this pool finish on it. Returns False when leases
+        were still out after `timeout` seconds; the pool is closed anyway.
+        """
+        with self._lock:
+            self._draining = True
+            self._alive -= len(self._idle)
+            self._idle.clear()
+            deadline = None if timeout is None else self._clock() + timeout
+            while self._leased:
+                remaining = None if deadline is None else deadline - self._clock()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            drained = self._leased == 0
+        self.close()
+        return drained
+    
+    def close(self) -> None:
+        """Release idle instances and refuse further leases"""
+        with self._lock:
+            self._closed = True
+            self._alive -= len(self._idle)
+            self._idle.clear()
+            if self._shared is not None and self._leased == 0:
+                self._shared = None
+                self._alive = 0
+            self._cond.notify_all()
+    
+    def get_status(self) -> Dict:
+        """Get pool status"""
+        with self._lock:
+            return {
+                "settings": self.settings.to_dict(),
+                "alive": self._alive,
+                "idle": len(self._idle),
+                "leased": self._leased,
+                "created": self._created,
+                "evicted": self._evicted,
+                "draining": self._draining,
+                "closed": self._closed
+            }
@@ -0,0 +1,244 @@
+"""
+Param Schema - Compiled parameter validation
+Turns manifest param schemas into specialized validator functions
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import re
+
+
+class SchemaError(ValueError):
+    """Raised at registration when a manifest param schema is invalid"""
+    pass
+
+
+# Supported subset of JSON Schema. Annotation keywords are accepted and ignored.
+KEYWORDS = frozenset({
+    "type", "enum", "minimum", "maximum", "minLength", "maxLength", "pattern",
+    "properties", "required", "additionalProperties", "items"
+})
+ANNOTATIONS = frozenset({"title", "description", "default", "examples"})
+
+TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool))",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, (list, tuple))",
+    "null": "{v} is None"
+}
+
+
+class _Emitter:
+    """Accumulates the source of one validator function"""
+    
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self._names = 0
+    
+    def name(self, prefix: str) -> str:
+        self._names += 1
+        return f"{prefix}{self._names}"
+    
+    def const(self, value: Any) -> str:
+        name = self.name("_c")
+        self.constants[name] = value
+        return name
+    
+    def emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+    
+    def fail(self, depth: int, path: str, message: str) -> None:
+        """Emit an error append; `path` is an expression, `message` an expression"""
+        self.emit(depth, f"_errors.append({path} + {message})")
+    
+    def node(self, schema: Any, value: str, path: str, label: str, depth: int) -> None:
+        """
+        Emit the checks for `value` (a variable name) against `schema`
+        
+        `path` is an expression building the location used in error
+        messages; `label` is the same location for schema errors.
+        """
+        if not isinstance(schema, dict):
+            raise SchemaError(f"Schema at {label} must be an object")
+        unknown = set(schema) - KEYWORDS - ANNOTATIONS
+        if unknown:
+            raise SchemaError(f"Unknown schema keywords at {label}: {sorted(unknown)}")
+        
+        types = schema.get("type")
+        types_checked = types is not None
+        if types_checked:
+            types = [types] if isinstance(types, str) else list(types)
+            bad = [t for t in types if t not in TYPE_CHECKS]
+            if bad or not types:
+                raise SchemaError(f"Unknown type at {label}: {bad or types}")
+            check = " or ".join(TYPE_CHECKS[t].format(v=value) for t in types)
+            expected = self.const(": expected " + " or ".join(types) + ", got ")
+            self.emit(depth, f"if not ({check}):")
+            self.fail(depth + 1, path, f"{expected} + type({value}).__name__")
+            self.emit(depth, "else:")
+            depth += 1
+        else:
+            types = list(TYPE_CHECKS)
+        body_start = len(self.lines)
+        
+        if "enum" in schema:
+            choices = schema["enum"]
+            if not isinstance(choices, list) or not choices:
+                raise SchemaError(f"enum at {label} must be a non-empty list")
+            try:
+                container = frozenset(choices)
+            except TypeError:
+                container = tuple(choices)
+            name = self.const(container)
+            message = self.const(f": must be one of {choices}")
+            self.emit(depth, f"if {value} not in {name}:")
+            self.fail(depth + 1, path, message)
+        
+        self._bounds(schema, value, path, label, depth, types)
+        
+        if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+            self._object(schema, value, path, label, depth, types)
+        if "items" in schema:
+            self._items(schema, value, path, label, depth, types)
+        
+        if len(self.lines) == body_start:
+            if types_checked:
+                # Nothing beyond the type check: drop the empty else branch
+                self.lines.pop()
+            else:
+                self.emit(depth, "pass")
+    
+    def _guarded(self, value: str, depth: int, types: List[str], wanted: List[str]) -> int:
+        """Open an isinstance guard unless the type check already ensures it"""
+        if set(types) <= set(wanted):
+            return depth
+        check = " or ".join(TYPE_CHECKS[t].format(v=value) for t in wanted)
+        self.emit(depth, f"if {check}:")
+        return depth + 1
+    
+    def _bounds(self, schema: Dict, value: str, path: str, label: str, depth: int, types: List[str]) -> None:
+        numeric = [(key, op) for key, op in (("minimum", "<"), ("maximum", ">")) if key in schema]
+        if numeric:
+            inner = self._guarded(value, depth, types, ["integer", "number"])
+            for key, op in numeric:
+                limit = schema[key]
+                if not isinstance(limit, (int, float)) or isinstance(limit, bool):
+                    raise SchemaError(f"{key} at {label} must be a number")
+                message = self.const(f": must be {'>=' if op == '<' else '<='} {limit}")
+                self.emit(inner, f"if {value} {op} {self.const(limit)}:")
+                self.fail(inner + 1, path, message)
+        
+        lengths = [(key, op) for key, op in (("minLength", "<"), ("maxLength", ">")) if key in schema]
+        if lengths:
+            inner = self._guarded(value, depth, types, ["string", "array"])
+            for key, op in lengths:
+                limit = schema[key]
+                if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+                    raise SchemaError(f"{key} at {label} must be a non-negative integer")
+                message = self.const(f": length must be {'>=' if op == '<' else '<='} {limit}")
+                self.emit(inner, f"if len({value}) {op} {limit}:")
+                self.fail(inner + 1, path, message)
+        
+        if "pattern" in schema:
+            try:
+                pattern = re.compile(schema["pattern"])
+            except (re.error, TypeError) as e:
+                raise SchemaError(f"pattern at {label} is invalid: {e}")
+            inner = self._guarded(value, depth, types, ["string"])
+            name = self.const(pattern)
+            message = self.const(f": must match {schema['pattern']}")
+            self.emit(inner, f"if {name}.search({value}) is None:")
+            self.fail(inner + 1, path, message)
+    
+    def _object(self, schema: Dict, value: str, path: str, label: str, depth: int, types: List[str]) -> None:
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+        if not isinstance(properties, dict) or not isinstance(required, list):
+            raise SchemaError(f"properties/required at {label} are malformed")
+        if not properties and not required and schema.get("additionalProperties", True) is not False:
+            return
+        inner = self._guarded(value, depth, types, ["object"])
+        
+        for key in required:
+            message = self.const(f".{key}: is required")
+            self.emit(inner, f"if {key!r} not in {value}:")
+            self.fail(inner + 1, path, message)
+        
+        for key, subschema in properties.items():
+            child = self.name("_v")
+            child_path = self.const(f".{key}")
+            self.emit(inner, f"{child} = {value}.get({key!r}, _MISSING)")
+            self.emit(inner, f"if {child} is not _MISSING:")
+            self.node(subschema, child, f"{path} + {child_path}", f"{label}.{key}", inner + 1)
+        
+        if schema.get("additionalProperties", True) is False:
+            allowed = self.const(frozenset(properties))
+            key = self.name("_k")
+            self.emit(inner, f"for {key} in {value}:")
+            self.emit(inner + 1, f"if {key} not in {allowed}:")
+            self.fail(inner + 2, f"{path} + '.' + str({key})", "': is not allowed'")
+    
+    def _items(self, schema: Dict, value: str, path: str, label: str, depth: int, types: List[str]) -> None:
+        inner = self._guarded(value, depth, types, ["array"])
+        index = self.name("_i")
+        item = self.name("_x")
+        self.emit(inner, f"for {index}, {item} in enumerate({value}):")
+        self.node(schema["items"], item, f"{path} + '[' + str({index}) + ']'", f"{label}[]", inner + 1)
+
+
+_MISSING = object()
+
+
+class CompiledSchema:
+    """
+    Param validator generated from a schema
+    
+    The schema is translated once into the source of a Python function with
+    every check inlined, so validating params runs straight-line code with
+    no per-call interpretation of the schema. All errors are collected in a
+    single pass.
+    """
+    
+    __slots__ = ("schema", "source", "_validate")
+    
+    def __init__(self, schema: Dict, name: str = "params"):
+        emitter = _Emitter()
+        root = emitter.const(name)
+        emitter.node(schema, "_params", root, name, 1)
+        self.source = "\n".join(
+            ["def _validate(_params):", "    _errors = []"]
+            + emitter.lines
+            + ["    return _errors"]
+        )
+        namespace = dict(emitter.constants, _MISSING=_MISSING)
+        exec(compile(self.source, f"<schema {name}>", "exec"), namespace)
+        self.schema = schema
+        self._validate: Callable[[Any], List[str]] = namespace["_validate"]
+    
+    def validate(self, params: Any) -> List[str]:
+        """Return every error found in `params`; empty when valid"""
+        return self._validate(params)
+    
+    def validate_many(self, params_list: List[Any]) -> List[List[str]]:
+        """Validate many param dicts against this schema; one error list per item"""
+        validate = self._validate
+        return [validate(params) for params in params_list]
+
+
+def compile_schema(schema: Optional[Dict], name: str = "params") -> Optional[CompiledSchema]:
+    """
+    Compile a param schema; None for no schema
+    
+    A bare mapping of field names to schemas is shorthand for an object
+    schema with those properties.
+    """
+    if schema is None:
+        return None
+    if not isinstance(schema, dict):
+        raise SchemaError(f"Schema for {name} must be an object")
+    if schema and not (set(schema) & KEYWORDS):
+        schema = {"type": "object", "properties": schema}
+    return CompiledSchema(schema, name)
@@ -3,8 +3,9 @@ Permissions - Access control and permission management
 Implements kernel-level permission controls
 """
 
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from enum import Enum
+import threading
 
 
 class PermissionLevel(Enum):
@@ -27,58 +28,147 @@ class Permission:
         return f"Permission({self.name}, {self.level.name})"
 
 
+class _PermissionTrie:
+    """
+    Permission patterns indexed by their ":"-separated segments
+    
+    A "*" segment matches exactly one segment; as the last segment of a
+    pattern it matches everything that follows ("calc:*" covers "calc:add"
+    and "calc:add:fast", "*" covers every permission).
+    """
+    
+    __slots__ = ("children", "terminal")
+    
+    def __init__(self):
+        self.children: Dict[str, "_PermissionTrie"] = {}
+        self.terminal = False
+    
+    @classmethod
+    def build(cls, patterns: Iterable[str]) -> "_PermissionTrie":
+        root = cls()
+        for pattern in patterns:
+            node = root
+            for segment in pattern.split(":"):
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = cls()
+                node = child
+            node.terminal = True
+        return root
+    
+    def matches(self, segments: List[str], start: int = 0) -> bool:
+        node = self
+        for index in range(start, len(segments)):
+            wildcard = node.children.get("*")
+            if wildcard is not None:
+                if wildcard.terminal or wildcard.matches(segments, index + 1):
+                    return True
+            node = node.children.get(segments[index])
+            if node is None:
+                return False
+        return node.terminal
+
+
 class Permissions:
-    """Permission management for modules and actions"""
+    """
+    Permission management for modules and actions
+    
+    Each user's grants, whitelist and blacklist are compiled into tries on
+    first use, and decisions are cached. Every mutation bumps a generation
+    counter and drops both, so a check never sees stale rules. A blacklist
+    match always wins over grants and whitelist entries.
+    """
+    
+    DECISION_CACHE_SIZE = 8192
     
     def __init__(self):
         self._user_permissions: Dict[str, Set[str]] = {}
         self._module_permissions: Dict[str, Set[str]] = {}
         self._whitelist: Dict[str, Set[str]] = {}
         self._blacklist: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._compiled: Dict[str, Tuple[_PermissionTrie, _PermissionTrie]] = {}
+        self._decisions: Dict[Tuple[str, str], bool] = {}
+    
+    def _invalidate(self) -> None:
+        # Fresh objects rather than clear(): a check that raced with this
+        # mutation writes into the discarded cache, never the new one
+        self.generation += 1
+        self._compiled = {}
+        self._decisions = {}
     
     def set_user_permissions(self, user: str, permissions: List[str]) -> None:
         """Set permissions for a user"""
-        self._user_permissions[user] = set(permissions)
+        with self._lock:
+            self._user_permissions[user] = set(permissions)
+            self._invalidate()
     
     def add_user_permission(self, user: str, permission: str) -> None:
         """Add a permission to a user"""
-        if user not in self._user_permissions:
-            self._user_permissions[user] = set()
-        self._user_permissions[user].add(permission)
+        with self._lock:
+            if user not in self._user_permissions:
+                self._user_permissions[user] = set()
+            self._user_permissions[user].add(permission)
+            self._invalidate()
     
     def get_user_permissions(self, user: str) -> Set[str]:
-        """Get all permissions for a user"""
-        return self._user_permissions.get(user, set())
+        """Get all permissions for a user (a copy; use the setters to change them)"""
+        return set(self._user_permissions.get(user, ()))
+    
+    def _rules(self, user: str) -> Tuple[_PermissionTrie, _PermissionTrie]:
+        """(allow, deny) tries for a user"""
+        compiled = self._compiled
+        rules = compiled.get(user)
+        if rules is None:
+            with self._lock:
+                allow = _PermissionTrie.build(
+                    self._user_permissions.get(user, set()) | self._whitelist.get(user, set())
+                )
+                deny = _PermissionTrie.build(self._blacklist.get(user, set()))
+            rules = compiled[user] = (allow, deny)
+        return rules
+    
+    def _decide(self, user: str, permission: str) -> bool:
+        decisions = self._decisions
+        key = (user, permission)
+        decision = decisions.get(key)
+        if decision is None:
+            allow, deny = self._rules(user)
+            segments = permission.split(":")
+            decision = allow.matches(segments) and not deny.matches(segments)
+            if len(decisions) >= self.DECISION_CACHE_SIZE:
+                decisions.clear()
+            decisions[key] = decision
+        return decision
     
     def has_permission(self, user: str, permission: str) -> bool:
-        """Check if user has a specific permission"""
-        if permission in self._blacklist.get(user, set()):
-            return False
-        
-        user_perms = self.get_user_permissions(user)
-        
-        if permission in user_perms:
-            return True
-        
-        return permission in self._whitelist.get(user, set())
+        """Check if user has a specific permission, honouring wildcards"""
+        return self._decide(user, permission)
     
     def set_module_permission(self, module: str, permission: str) -> None:
         """Set a permission for a module"""
-        if module not in self._module_permissions:
-            self._module_permissions[module] = set()
-        self._module_permissions[module].add(permission)
+        with self._lock:
+            if module not in self._module_permissions:
+                self._module_permissions[module] = set()
+            self._module_permissions[module].add(permission)
+            self._invalidate()
     
     def get_module_permissions(self, module: str) -> Set[str]:
         """Get all permissions for a module"""
-        return self._module_permissions.get(module, set())
+        return set(self._module_permissions.get(module, ()))
     
     def whitelist(self, user: str, permissions: List[str]) -> None:
         """Add permissions to whitelist for user"""
-        self._whitelist[user] = set(permissions)
+        with self._lock:
+            self._whitelist[user] = set(permissions)
+            self._invalidate()
     
     def blacklist(self, user: str, permissions: List[str]) -> None:
         """Add permissions to blacklist for user"""
-        self._blacklist[user] = set(permissions)
+        with self._lock:
+            self._blacklist[user] = set(permissions)
+            self._invalidate()
     
     def check_access(
         self,
@@ -88,18 +178,17 @@ class Permissions:
         context: Optional[Dict] = None
     ) -> bool:
         """Check if user can access module/action"""
-        permission = f"{module}:{action}"
-        
-        if self.has_permission(user, permission):
-            return True
-        
-        if self.has_permission(user, f"{module}:*"):
-            return True
-        
-        if self.has_permission(user, "*"):
-            return True
-        
-        return False
+        return self._decide(user, f"{module}:{action}")
+    
+    def check_access_many(
+        self,
+        user: str,
+        requests: Iterable[Tuple[str, str]],
+        context: Optional[Dict] = None
+    ) -> List[bool]:
+        """Check a batch of (module, action) pairs for one user; one decision per pair"""
+        decide = self._decide
+        return [decide(user, f"{module}:{action}") for module, action in requests]
     
     def require_permission(
         self,
@@ -0,0 +1,371 @@
+"""
+Process Pool - Process isolation for CPU-bound modules
+Runs module actions in persistent, pre-forked worker processes
+"""
+
+from typing import Any, Dict, List, Optional
+import asyncio
+import marshal
+import multiprocessing
+import queue
+import threading
+import time
+
+from error_handler import KernelError, ErrorCode, ExecutionTimeoutError
+from dispatch import awaitable, build_dispatch_table, materialize
+
+
+class IsolationSettings:
+    """Isolation configuration for a single module"""
+    
+    DEFAULT_WORKERS = 2
+    
+    def __init__(
+        self,
+        mode: str = "thread",
+        workers: int = DEFAULT_WORKERS,
+        start_method: Optional[str] = None
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown isolation mode: {mode}")
+        if workers < 1:
+            raise ValueError("Worker count must be at least 1")
+        self.mode = mode
+        self.workers = workers
+        self.start_method = start_method
+    
+    @classmethod
+    def from_manifest(cls, manifest: Optional[Dict]) -> "IsolationSettings":
+        """Read settings from the manifest "runtime" section"""
+        runtime = (manifest or {}).get("runtime", {})
+        return cls(
+            mode=runtime.get("isolation", "thread"),
+            workers=runtime.get("workers", cls.DEFAULT_WORKERS),
+            start_method=runtime.get("start_method")
+        )
+    
+    def to_dict(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "start_method": self.start_method
+        }
+
+
+# Requests and replies cross the process boundary as marshal-encoded tuples.
+# marshal is compact and fast for the plain data (dicts, lists, strings,
+# numbers) the execution contract already requires params and results to be.
+#
+#   request: (action, params, context)
+#   reply:   (True, result) or (False, message, code, details)
+
+def encode_request(action: str, params: Dict, context: Dict) -> bytes:
+    try:
+        return marshal.dumps((action, params, context))
+    except ValueError:
+        raise KernelError(
+            "Parameters cannot be sent to an isolated module",
+            ErrorCode.INVALID_INPUT,
+            {"action": action}
+        )
+
+
+def _worker_main(conn, module_class: type, manifest: Dict, config: Dict) -> None:
+    """Worker process loop: import and initialize once, then serve requests"""
+    init_error = None
+    instance = None
+    try:
+        instance = module_class()
+        initialize = getattr(instance, "initialize", None)
+        if callable(initialize) and initialize(dict(config)) is False:
+            init_error = f"Module failed to initialize: {manifest.get('name', module_class.__name__)}"
+        dispatch = build_dispatch_table(module_class, manifest)
+    except Exception as e:
+        init_error = f"Module failed to load: {e}"
+    
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        if not data:
+            return
+        
+        try:
+            if init_error:
+                raise KernelError(init_error, ErrorCode.EXECUTION_FAILED)
+            action, params, context = marshal.loads(data)
+            spec = dispatch.get(action)
+            if spec is None:
+                raise KernelError(f"Action not found: {action}", ErrorCode.ACTION_NOT_FOUND)
+            result = spec.handler(instance, params, context)
+            # Chunks of streaming actions cross the pipe as one list
+            if spec.is_async:
+                result = asyncio.run(awaitable(result))
+            else:
+                result = materialize(result)
+            try:
+                reply = marshal.dumps((True, result))
+            except ValueError:
+                raise KernelError(
+                    f"Result of {action} cannot be returned from an isolated module",
+                    ErrorCode.EXECUTION_FAILED
+                )
+        except KernelError as e:
+            reply = marshal.dumps((False, e.message, e.code, _plain(e.details)))
+        except Exception as e:
+            reply = marshal.dumps((False, str(e), ErrorCode.EXECUTION_FAILED, {}))
+        
+        try:
+            conn.send_bytes(reply)
+        except (EOFError, OSError):
+            return
+
+
+def _plain(details: Dict) -> Dict:
+    """Keep only marshal-safe error details"""
+    try:
+        marshal.dumps(details)
+        return details
+    except ValueError:
+        return {key: str(value) for key, value in details.items()}
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe"""
+    
+    __slots__ = ("slot", "process", "conn")
+    
+    def __init__(self, slot: int, process, conn):
+        self.slot = slot
+        self.process = process
+        self.conn = conn
+
+
+class ProcessPool:
+    """
+    Persistent pool of worker processes for one module
+    
+    Workers are started up front and each imports and initializes the
+    module once. A worker that dies mid-request is reported as an
+    EXECUTION_FAILED error and replaced; the kernel keeps running.
+    """
+    
+    ACQUIRE_POLL = 0.1
+    
+    def __init__(
+        self,
+        name: str,
+        module_class: type,
+        manifest: Optional[Dict] = None,
+        config: Optional[Dict] = None,
+        settings: Optional[IsolationSettings] = None
+    ):
+        self.name = name
+        self.module_class = module_class
+        self.manifest = manifest or {}
+        self.config = config or {}
+        self.settings = settings or IsolationSettings(mode="process")
+        self._context = multiprocessing.get_context(self.settings.start_method)
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[Optional[_Worker]] = [None] * self.settings.workers
+        self._executions = 0
+        self._crashes = 0
+        self._restarts = 0
+        self._closed = False
+    
+    def start(self) -> None:
+        """Pre-fork every worker process"""
+        for slot in range(self.settings.workers):
+            self._idle.put(self._spawn(slot))
+    
+    def _spawn(self, slot: int) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.module_class, self.manifest, self.config),
+            name=f"kernel-{self.name}-{slot}",
+            daemon=True
+        )
+        process.start()
+        # The parent must not hold the child end, or a dead worker never reads as EOF
+        child_conn.close()
+        worker = _Worker(slot, process, parent_conn)
+        with self._lock:
+            self._workers[slot] = worker
+        return worker
+    
+    def _replace(self, worker: _Worker) -> None:
+        """Discard a dead or stuck worker and start a fresh one in its slot"""
+        try:
+            worker.conn.close()
+        except OSError:
+            pass
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.process.join(timeout=5)
+        with self._lock:
+            self._restarts += 1
+            self._workers[worker.slot] = None
+            closed = self._closed
+        if not closed:
+            try:
+                self._idle.put(self._spawn(worker.slot))
+            except OSError:
+                # The slot stays empty; callers waiting for a worker see it in _acquire
+                pass
+    
+    def _closed_error(self) -> KernelError:
+        return KernelError(
+            f"Module pool closed: {self.name}",
+            ErrorCode.EXECUTION_FAILED,
+            {"module": self.name}
+        )
+    
+    def _acquire(self, action: str, timeout: Optional[float], started: float) -> _Worker:
+        """
+        Wait for an idle worker
+        
+        Waits in short slices so a caller without a timeout still notices
+        the pool closing, or losing every worker, instead of blocking forever.
+        """
+        while True:
+            wait = self.ACQUIRE_POLL
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    raise ExecutionTimeoutError(self.name, action, timeout, time.monotonic() - started)
+                wait = min(wait, remaining)
+            try:
+                worker = self._idle.get(timeout=wait)
+            except queue.Empty:
+                with self._lock:
+                    closed = self._closed
+                    empty = not any(self._workers)
+                if closed:
+                    raise self._closed_error()
+                if empty:
+                    raise KernelError(
+                        f"No worker processes left for {self.name}",
+                        ErrorCode.EXECUTION_FAILED,
+                        {"module": self.name, "action": action}
+                    )
+                continue
+            if self._closed:
+                self._idle.put(worker)
+                raise self._closed_error()
+            return worker
+    
+    def execute(
+        self,
+        action: str,
+        params: Dict,
+        context: Dict,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run an action in a worker process and return its result
+        
+        When `timeout` expires the worker is killed and replaced, which
+        cancels the action, and ExecutionTimeoutError is raised.
+        """
+        if self._closed:
+            raise self._closed_error()
+        request = encode_request(action, params, context)
+        started = time.monotonic()
+        worker = self._acquire(action, timeout, started)
+        
+        try:
+            worker.conn.send_bytes(request)
+            if timeout is not None:
+                remaining = max(0.0, timeout - (time.monotonic() - started))
+                if not worker.conn.poll(remaining):
+                    self._replace(worker)
+                    raise ExecutionTimeoutError(
+                        self.name, action, timeout, time.monotonic() - started
+                    )
+            payload = worker.conn.recv_bytes()
+        except (EOFError, OSError):
+            worker.process.join(timeout=5)
+            exitcode = worker.process.exitcode
+            with self._lock:
+                self._crashes += 1
+            self._replace(worker)
+            raise KernelError(
+                f"Worker process for {self.name} crashed during {action}",
+                ErrorCode.EXECUTION_FAILED,
+                {"module": self.name, "action": action, "exitcode": exitcode}
+            )
+        try:
+            reply = marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            # A truncated or corrupt reply leaves the worker in an unknown state
+            with self._lock:
+                self._crashes += 1
+            self._replace(worker)
+            raise KernelError(
+                f"Worker process for {self.name} sent a corrupt reply during {action}",
+                ErrorCode.EXECUTION_FAILED,
+                {"module": self.name, "action": action, "exitcode": worker.process.exitcode}
+            )
+        
+        self._idle.put(worker)
+        with self._lock:
+            self._executions += 1
+        
+        if reply[0]:
+            return reply[1]
+        _, message, code, details = reply
+        raise KernelError(message, code, details)
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop the workers once in-flight requests are answered
+        
+        Returns False when requests were still running after `timeout`
+        seconds; the workers are stopped anyway.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._idle.qsize() < self.settings.workers:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.01)
+        drained = self._idle.qsize() >= self.settings.workers
+        self.close()
+        return drained
+    
+    def close(self) -> None:
+        """Stop every worker process"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = [w for w in self._workers if w is not None]
+        for worker in workers:
+            try:
+                worker.conn.send_bytes(b"")
+                worker.conn.close()
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout=1)
+    
+    def get_status(self) -> Dict:
+        """Get pool status"""
+        with self._lock:
+            return {
+                "settings": self.settings.to_dict(),
+                "alive": sum(
+                    1 for w in self._workers
+                    if w is not None and w.process.is_alive()
+                ),
+                "idle": self._idle.qsize(),
+                "executions": self._executions,
+                "crashes": self._crashes,
+                "restarts": self._restarts,
+                "closed": self._closed
+            }
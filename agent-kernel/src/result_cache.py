@@ -0,0 +1,136 @@
+"""
+Result Cache - Memoization of pure module actions
+LRU + TTL cache of action results with a memory bound and hit/miss counters
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import marshal
+import threading
+import time
+
+
+# Returned by ResultCache.get when there is no usable entry
+MISS = object()
+
+
+def canonical_key(module: str, version: str, action: str, params: Dict) -> Optional[str]:
+    """
+    Stable hash of a request, or None when params are not plain JSON data
+    
+    Keys are sorted so the same params always hash the same regardless of
+    dict insertion order. Params that do not come back unchanged from
+    JSON, such as non-string keys or tuples, get no key: {1: 0} and
+    {"1": 0} would otherwise hash the same.
+    """
+    request = [module, version, action, params]
+    try:
+        payload = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    if json.loads(payload) != request:
+        return None
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Bounded cache of action results
+    
+    Entries are evicted least-recently-used first when either `max_entries`
+    or `max_bytes` is exceeded, and expire `ttl` seconds after insertion.
+    Values are stored marshal-encoded: the encoded size is what counts
+    against `max_bytes`, and every hit returns a fresh copy, so callers can
+    never mutate a cached result.
+    """
+    
+    DEFAULT_MAX_ENTRIES = 1024
+    DEFAULT_TTL = 300.0
+    DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+    
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str) -> Any:
+        """Return the cached value for `key`, or MISS"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISS
+            data, expires_at = entry
+            if expires_at <= self._clock():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return marshal.loads(data)
+    
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Cache `value`; returns False when it cannot be stored"""
+        try:
+            data = marshal.dumps(value)
+        except ValueError:
+            return False
+        if len(data) > self.max_bytes:
+            return False
+        
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = float("inf") if ttl is None else self._clock() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (data, expires_at)
+            self._bytes += len(data)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return True
+    
+    def _drop(self, key: str) -> None:
+        data, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+    
+    def clear(self) -> None:
+        """Remove every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def get_stats(self) -> Dict:
+        """Get cache counters and usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
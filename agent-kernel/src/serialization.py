@@ -0,0 +1,36 @@
+"""
+Serialization - JSON encoding for kernel results
+Uses orjson when it is installed and the standard library otherwise
+"""
+
+from typing import Any, Optional
+from datetime import datetime
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+_encode = json.JSONEncoder().encode
+
+
+def encode(value: Any) -> str:
+    """Encode one value as JSON"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # orjson rejects some values json accepts (e.g. ints over 64 bits)
+            pass
+    return _encode(value)
+
+
+def format_timestamp(epoch: Optional[float]) -> Optional[str]:
+    """Format an epoch timestamp the way datetime.utcnow().isoformat() does"""
+    if epoch is None:
+        return None
+    return datetime.utcfromtimestamp(epoch).isoformat()
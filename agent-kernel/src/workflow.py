@@ -0,0 +1,369 @@
+"""
+Workflow - DAG execution of chained module actions
+Runs steps whose params reference earlier steps' results, branches in parallel
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, wait
+import asyncio
+import json
+import re
+import time
+
+from error_handler import ValidationError
+
+
+STEP_ID_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_-]*$')
+# ${step.field.key.0.key}: a step id, a result field, then dict keys / list indexes
+REFERENCE_PATTERN = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_-]*)((?:\.[A-Za-z0-9_-]+)+)\}')
+RESULT_FIELDS = frozenset({"data", "success", "error", "metadata"})
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class _Reference:
+    """One compiled ${step.field...} reference"""
+    
+    __slots__ = ("text", "step", "field", "path")
+    
+    def __init__(self, text: str, step: str, path: str):
+        segments = path.lstrip(".").split(".")
+        if segments[0] not in RESULT_FIELDS:
+            raise ValidationError(
+                f"Invalid reference {text}: must start with one of {sorted(RESULT_FIELDS)}",
+                {"reference": text}
+            )
+        self.text = text
+        self.step = step
+        self.field = segments[0]
+        self.path = [int(s) if s.isdigit() else s for s in segments[1:]]
+    
+    def resolve(self, results: Dict[str, Any]) -> Any:
+        value = getattr(results[self.step], self.field)
+        for key in self.path:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                raise ValidationError(
+                    f"Unresolved reference {self.text}: no {key!r}",
+                    {"reference": self.text}
+                )
+        return value
+
+
+def _compile_template(value: Any, references: List[_Reference]) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Turn a params template into a function of the upstream results
+    
+    A string that is exactly one reference takes the referenced value as
+    is; references inside a longer string are interpolated as text.
+    Containers are rebuilt on every call, so runs never share params.
+    """
+    if isinstance(value, dict):
+        items = [(key, _compile_template(item, references)) for key, item in value.items()]
+        return lambda results: {key: build(results) for key, build in items}
+    if isinstance(value, list):
+        builders = [_compile_template(item, references) for item in value]
+        return lambda results: [build(results) for build in builders]
+    if not isinstance(value, str) or "${" not in value:
+        return lambda results: value
+    
+    matches = list(REFERENCE_PATTERN.finditer(value))
+    if len(matches) != value.count("${"):
+        raise ValidationError(f"Malformed reference in {value!r}", {"template": value})
+    compiled = [_Reference(m.group(0), m.group(1), m.group(2)) for m in matches]
+    references.extend(compiled)
+    if len(matches) == 1 and matches[0].group(0) == value:
+        return compiled[0].resolve
+    
+    parts: List[Any] = []
+    position = 0
+    for match, reference in zip(matches, compiled):
+        parts.append(value[position:match.start()])
+        parts.append(reference)
+        position = match.end()
+    parts.append(value[position:])
+    
+    def interpolate(results):
+        text = []
+        for part in parts:
+            if isinstance(part, _Reference):
+                part = part.resolve(results)
+                if not isinstance(part, str):
+                    part = json.dumps(part)
+            text.append(part)
+        return "".join(text)
+    return interpolate
+
+
+class _Step:
+    """A validated step definition"""
+    
+    __slots__ = ("id", "module", "action", "params", "context", "timeout", "depends_on", "dependents")
+    
+    def __init__(self, definition: Dict):
+        step_id = definition.get("id")
+        if not isinstance(step_id, str) or not STEP_ID_PATTERN.match(step_id):
+            raise ValidationError(f"Invalid step id: {step_id!r}", {"step": step_id})
+        for key in ("module", "action"):
+            if not isinstance(definition.get(key), str) or not definition[key]:
+                raise ValidationError(f"Step {step_id} needs a {key}", {"step": step_id})
+        references: List[_Reference] = []
+        self.id = step_id
+        self.module = definition["module"]
+        self.action = definition["action"]
+        self.params = _compile_template(definition.get("params") or {}, references)
+        self.context = definition.get("context") or {}
+        self.timeout = definition.get("timeout")
+        self.depends_on: Set[str] = set(definition.get("depends_on") or ())
+        self.depends_on.update(reference.step for reference in references)
+        self.dependents: List[str] = []
+
+
+class StepResult:
+    """Outcome of one step; times are ms since the workflow started"""
+    
+    __slots__ = ("id", "status", "result", "started_ms", "duration_ms", "skipped_because")
+    
+    def __init__(
+        self,
+        step_id: str,
+        status: str,
+        result: Any = None,
+        started_ms: Optional[float] = None,
+        duration_ms: Optional[float] = None,
+        skipped_because: Optional[str] = None
+    ):
+        self.id = step_id
+        self.status = status
+        self.result = result
+        self.started_ms = started_ms
+        self.duration_ms = duration_ms
+        self.skipped_because = skipped_because
+    
+    def to_dict(self) -> Dict:
+        step = {
+            "status": self.status,
+            "started_ms": self.started_ms,
+            "duration_ms": self.duration_ms,
+            "result": self.result.to_dict() if self.result is not None else None
+        }
+        if self.skipped_because is not None:
+            step["skipped_because"] = self.skipped_because
+        return step
+
+
+class WorkflowResult:
+    """Per-step results of a workflow run, in the workflow's topological order"""
+    
+    def __init__(self, steps: Dict[str, StepResult], duration_ms: float):
+        self.steps = steps
+        self.duration_ms = duration_ms
+    
+    @property
+    def success(self) -> bool:
+        return all(step.status == SUCCEEDED for step in self.steps.values())
+    
+    @property
+    def failed(self) -> List[str]:
+        return [step.id for step in self.steps.values() if step.status == FAILED]
+    
+    def __getitem__(self, step_id: str) -> StepResult:
+        return self.steps[step_id]
+    
+    def to_dict(self) -> Dict:
+        return {
+            "success": self.success,
+            "duration_ms": self.duration_ms,
+            "steps": {step_id: step.to_dict() for step_id, step in self.steps.items()}
+        }
+
+
+class Workflow:
+    """
+    A DAG of module actions
+    
+    Each step is a dict with "id", "module", "action" and optional
+    "params", "context", "timeout" and "depends_on" keys. Params may
+    reference earlier results as ${step.data.key}, ${step.success},
+    ${step.error} or ${step.metadata.key}, with dotted dict keys and list
+    indexes; every referenced step becomes a dependency.
+    
+    The graph is validated and the templates compiled once, here, so a
+    Workflow can be run many times. A step starts as soon as all of its
+    dependencies succeeded; when one fails, every step downstream of it
+    is skipped while independent branches run to completion.
+    """
+    
+    def __init__(self, steps: List[Dict]):
+        if not isinstance(steps, list) or not steps:
+            raise ValidationError("A workflow needs a non-empty list of steps")
+        self.steps: Dict[str, _Step] = {}
+        for definition in steps:
+            if not isinstance(definition, dict):
+                raise ValidationError("Workflow steps must be dictionaries")
+            step = _Step(definition)
+            if step.id in self.steps:
+                raise ValidationError(f"Duplicate step id: {step.id}", {"step": step.id})
+            self.steps[step.id] = step
+        
+        for step in self.steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self.steps:
+                    raise ValidationError(
+                        f"Step {step.id} depends on unknown step {dependency}",
+                        {"step": step.id, "dependency": dependency}
+                    )
+                self.steps[dependency].dependents.append(step.id)
+        self.order = self._topological_order()
+    
+    def _topological_order(self) -> List[str]:
+        pending = {step_id: len(step.depends_on) for step_id, step in self.steps.items()}
+        ready = [step_id for step_id, count in pending.items() if count == 0]
+        order = []
+        while ready:
+            step_id = ready.pop(0)
+            order.append(step_id)
+            for dependent in self.steps[step_id].dependents:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.steps):
+            cycle = sorted(set(self.steps) - set(order))
+            raise ValidationError(f"Workflow has a dependency cycle among {cycle}", {"steps": cycle})
+        return order
+    
+    def _request(self, step: _Step, results: Dict[str, Any], context: Dict) -> Tuple[Dict, Dict]:
+        return step.params(results), dict(context, **step.context)
+    
+    def _failed(self, step: _Step, error: Exception) -> Any:
+        from kernel_core import ExecutionResult
+        return ExecutionResult.from_exception(error, {"module": step.module, "action": step.action})
+    
+    def _finish(
+        self,
+        step_id: str,
+        result: Any,
+        started: float,
+        origin: float,
+        results: Dict[str, Any],
+        outcome: Dict[str, StepResult],
+        pending: Dict[str, int]
+    ) -> List[str]:
+        """Record a finished step; returns the dependents that became ready"""
+        now = time.perf_counter()
+        results[step_id] = result
+        outcome[step_id] = StepResult(
+            step_id,
+            SUCCEEDED if result.success else FAILED,
+            result,
+            round((started - origin) * 1000, 3),
+            round((now - started) * 1000, 3)
+        )
+        if not result.success:
+            self._skip_downstream(step_id, step_id, outcome)
+            return []
+        ready = []
+        for dependent in self.steps[step_id].dependents:
+            pending[dependent] -= 1
+            if pending[dependent] == 0 and dependent not in outcome:
+                ready.append(dependent)
+        return ready
+    
+    def _skip_downstream(self, step_id: str, cause: str, outcome: Dict[str, StepResult]) -> None:
+        for dependent in self.steps[step_id].dependents:
+            if dependent not in outcome:
+                outcome[dependent] = StepResult(dependent, SKIPPED, skipped_because=cause)
+                self._skip_downstream(dependent, cause, outcome)
+    
+    def _result(self, outcome: Dict[str, StepResult], origin: float) -> WorkflowResult:
+        duration = round((time.perf_counter() - origin) * 1000, 3)
+        return WorkflowResult({step_id: outcome[step_id] for step_id in self.order}, duration)
+    
+    def run(self, kernel: Any, context: Optional[Dict] = None) -> WorkflowResult:
+        """
+        Execute on `kernel`; branches run concurrently on its thread pool
+        
+        While only one step is runnable it runs on the calling thread, so
+        a linear chain costs no thread hand-offs.
+        """
+        context = context or {}
+        origin = time.perf_counter()
+        results: Dict[str, Any] = {}
+        outcome: Dict[str, StepResult] = {}
+        pending = {step_id: len(step.depends_on) for step_id, step in self.steps.items()}
+        ready = [step_id for step_id in self.order if pending[step_id] == 0]
+        running: Dict[Any, Tuple[str, float]] = {}
+        
+        def start(step_id: str, inline: bool) -> None:
+            step = self.steps[step_id]
+            started = time.perf_counter()
+            try:
+                params, step_context = self._request(step, results, context)
+            except ValidationError as e:
+                ready.extend(self._finish(step_id, self._failed(step, e), started, origin, results, outcome, pending))
+                return
+            if inline:
+                result = kernel.execute(step.module, step.action, params, step_context, step.timeout)
+                ready.extend(self._finish(step_id, result, started, origin, results, outcome, pending))
+            else:
+                future = kernel.submit(step.module, step.action, params, step_context, step.timeout)
+                running[future] = (step_id, started)
+        
+        while ready or running:
+            if len(ready) == 1 and not running:
+                start(ready.pop(), inline=True)
+                continue
+            while ready:
+                start(ready.pop(0), inline=False)
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id, started = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = self._failed(self.steps[step_id], e)
+                ready.extend(self._finish(step_id, result, started, origin, results, outcome, pending))
+        
+        return self._result(outcome, origin)
+    
+    async def run_async(self, kernel: Any, context: Optional[Dict] = None) -> WorkflowResult:
+        """Execute on `kernel` from a coroutine; branches run as concurrent tasks"""
+        context = context or {}
+        origin = time.perf_counter()
+        results: Dict[str, Any] = {}
+        outcome: Dict[str, StepResult] = {}
+        pending = {step_id: len(step.depends_on) for step_id, step in self.steps.items()}
+        ready = [step_id for step_id in self.order if pending[step_id] == 0]
+        running: Dict[Any, Tuple[str, float]] = {}
+        
+        while ready or running:
+            while ready:
+                step_id = ready.pop(0)
+                step = self.steps[step_id]
+                started = time.perf_counter()
+                try:
+                    params, step_context = self._request(step, results, context)
+                except ValidationError as e:
+                    ready.extend(self._finish(step_id, self._failed(step, e), started, origin, results, outcome, pending))
+                    continue
+                task = asyncio.ensure_future(
+                    kernel.execute_async(step.module, step.action, params, step_context, step.timeout)
+                )
+                running[task] = (step_id, started)
+            if not running:
+                continue
+            done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step_id, started = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    result = self._failed(self.steps[step_id], e)
+                ready.extend(self._finish(step_id, result, started, origin, results, outcome, pending))
+        
+        return self._result(outcome, origin)
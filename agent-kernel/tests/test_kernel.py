@@ -3,19 +3,72 @@ Tests for Kernel Agent
 """
 
 import unittest
+import io
+import json
+import marshal
+import shutil
+import socket
+import tempfile
+import subprocess
+import asyncio
+import threading
+import time
 import sys
 import os
+import gc
+from unittest import mock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from kernel_core import KernelCore, ExecutionResult
-from input_validator import InputValidator, validate_input, ValidationError
+from input_validator import InputValidator, TrustedRequest, validate_input, ValidationError
 from error_handler import (
     ErrorHandler, KernelError, ErrorCode,
     ValidationError as KernelValidationError,
-    ModuleNotFoundError, ActionNotFoundError
+    ModuleNotFoundError, ModuleLoadError, CircuitOpenError
 )
 from permissions import Permissions, PermissionLevel
+from module_pool import ModulePool, PoolSettings
+from process_pool import ProcessPool, IsolationSettings
+from dispatch import build_dispatch_table
+from concurrency import AtomicCounter, CopyOnWriteMap
+from deadline import current_deadline
+from result_cache import ResultCache, MISS, canonical_key
+from kernel_server import KernelServer
+from kernel_client import KernelClient, DaemonUnavailable, default_socket_path
+from module_locator import ModuleLocator
+from param_schema import compile_schema, SchemaError
+from admission import AdmissionController, AdmissionSettings
+from circuit_breaker import BreakerSettings, CircuitBreaker, build_breakers
+from workflow import Workflow
+from latency import LatencyRecorder, bucket_index, bucket_bounds, BUCKETS
+from interceptors import (
+    PermissionInterceptor, ErrorHandlerInterceptor, LoggingInterceptor, HistoryInterceptor
+)
+from benchmarks.runner import compare, measure
+from benchmarks.suite import Case
+
+
+class IsolatedModule:
+    """Module run in worker processes; defined at module level so it can be imported by workers"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def compute(self, params, context):
+        self.calls += 1
+        return {"pid": os.getpid(), "square": params["n"] ** 2, "calls": self.calls}
+    
+    def fail(self, params, context):
+        raise ValueError("bad input")
+    
+    def crash(self, params, context):
+        os._exit(3)
+    
+    def sleep(self, params, context):
+        time.sleep(params["seconds"])
+        return "done"
 
 
 class TestKernelCore(unittest.TestCase):
@@ -49,6 +102,10 @@ class TestKernelCore(unittest.TestCase):
         result = self.kernel.execute("nonexistent", "run")
         self.assertFalse(result.success)
         self.assertIn("not found", result.error)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.MODULE_NOT_FOUND)
+        
+        result = asyncio.run(self.kernel.execute_async("nonexistent", "run"))
+        self.assertEqual(result.metadata["error_code"], ErrorCode.MODULE_NOT_FOUND)
     
     def test_execute_success(self):
         class TestModule:
@@ -68,6 +125,2129 @@ class TestKernelCore(unittest.TestCase):
         self.assertIn("registered_modules", status)
 
 
+class TestModulePool(unittest.TestCase):
+    """Test pooled module instances"""
+    
+    def setUp(self):
+        self.kernel = KernelCore()
+    
+    def test_instances_are_reused_and_initialized(self):
+        created = []
+        
+        class CountingModule:
+            def __init__(self):
+                self.config = None
+                created.append(self)
+            
+            def initialize(self, config):
+                self.config = config
+                return True
+            
+            def run(self, params, context):
+                return self.config
+        
+        self.kernel.register_module("counting", CountingModule, config={"debug": True})
+        for _ in range(5):
+            result = self.kernel.execute("counting", "run")
+            self.assertTrue(result.success)
+            self.assertEqual(result.data, {"debug": True})
+        
+        self.assertEqual(len(created), 1)
+    
+    def test_failed_initialize_reports_error(self):
+        class BrokenModule:
+            def initialize(self, config):
+                return False
+            
+            def run(self, params, context):
+                return "never"
+        
+        self.kernel.register_module("broken", BrokenModule)
+        result = self.kernel.execute("broken", "run")
+        self.assertFalse(result.success)
+        self.assertIn("failed to initialize", result.error)
+    
+    def test_exclusive_leases(self):
+        pool = ModulePool("test", object, settings=PoolSettings(size=2, lease_timeout=0))
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertIsNot(first, second)
+        
+        with self.assertRaises(KernelError) as ctx:
+            pool.acquire()
+        self.assertEqual(ctx.exception.code, ErrorCode.TIMEOUT)
+        
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+    
+    def test_thread_safe_modules_share_instance(self):
+        pool = ModulePool("test", object, settings=PoolSettings(size=1, thread_safe=True))
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertIs(first, second)
+        self.assertEqual(pool.get_status()["leased"], 2)
+    
+    def test_idle_instances_are_evicted(self):
+        now = [0.0]
+        pool = ModulePool(
+            "test", object,
+            settings=PoolSettings(size=2, idle_timeout=10),
+            clock=lambda: now[0]
+        )
+        with pool.lease():
+            pass
+        self.assertEqual(pool.get_status()["idle"], 1)
+        
+        now[0] = 11.0
+        self.assertEqual(pool.evict_idle(), 1)
+        status = pool.get_status()
+        self.assertEqual(status["idle"], 0)
+        self.assertEqual(status["alive"], 0)
+    
+    def test_pool_size_from_manifest(self):
+        class TestModule:
+            def run(self, params, context):
+                return "test"
+        
+        manifest = {"name": "test", "runtime": {"pool": {"size": 7, "thread_safe": True}}}
+        self.kernel.register_module("test", TestModule, manifest=manifest)
+        settings = self.kernel.get_status()["pools"]["test"]["settings"]
+        self.assertEqual(settings["size"], 7)
+        self.assertTrue(settings["thread_safe"])
+
+
+class TestDispatch(unittest.TestCase):
+    """Test registration-time action dispatch"""
+    
+    def setUp(self):
+        self.kernel = KernelCore()
+    
+    def test_manifest_actions_route_through_execute(self):
+        class ManifestModule:
+            def get_manifest(self):
+                return {"name": "manifest_module", "actions": ["echo"]}
+            
+            def initialize(self, config):
+                return True
+            
+            def execute(self, action, params, context):
+                return {"action": action, "params": params}
+        
+        self.kernel.register_module("manifest_module", ManifestModule)
+        self.assertEqual(self.kernel.get_actions("manifest_module"), ["echo"])
+        
+        result = self.kernel.execute("manifest_module", "echo", {"message": "hi"})
+        self.assertTrue(result.success)
+        self.assertEqual(result.data, {"action": "echo", "params": {"message": "hi"}})
+    
+    def test_unknown_action_fails_before_instantiation(self):
+        created = []
+        
+        class TestModule:
+            def __init__(self):
+                created.append(self)
+            
+            def run(self, params, context):
+                return "test"
+        
+        self.kernel.register_module("test", TestModule)
+        result = self.kernel.execute("test", "missing")
+        
+        self.assertFalse(result.success)
+        self.assertIn("Action not found", result.error)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.ACTION_NOT_FOUND)
+        self.assertEqual(created, [])
+    
+    def test_dispatch_table_is_frozen(self):
+        class TestModule:
+            def run(self, params, context):
+                return "test"
+            
+            def _helper(self):
+                pass
+            
+            def initialize(self, config):
+                return True
+        
+        table = build_dispatch_table(TestModule)
+        self.assertEqual(list(table), ["run"])
+        with self.assertRaises(TypeError):
+            table["other"] = table["run"]
+
+
+class TestExecuteBatch(unittest.TestCase):
+    """Test batch execution"""
+    
+    def setUp(self):
+        self.kernel = KernelCore()
+        
+        class MathModule:
+            def double(self, params, context):
+                return params["value"] * 2
+            
+            def fail(self, params, context):
+                raise ValueError("boom")
+        
+        class EchoModule:
+            def echo(self, params, context):
+                return params
+        
+        self.kernel.register_module("math", MathModule)
+        self.kernel.register_module("echo", EchoModule)
+    
+    def test_results_in_input_order(self):
+        results = self.kernel.execute_batch([
+            {"module": "math", "action": "double", "params": {"value": 1}},
+            ("echo", "echo", {"n": 2}),
+            {"module": "math", "action": "double", "params": {"value": 3}}
+        ])
+        
+        self.assertEqual([r.data for r in results], [2, {"n": 2}, 6])
+        self.assertEqual([r.metadata["execution_id"] for r in results], [1, 2, 3])
+        self.assertEqual(self.kernel.execution_count, 3)
+        self.assertEqual(len({r.timestamp for r in results}), 1)
+    
+    def test_partial_failures_do_not_abort(self):
+        results = self.kernel.execute_batch([
+            {"module": "math", "action": "fail"},
+            {"module": "123bad", "action": "run"},
+            {"module": "missing", "action": "run"},
+            {"module": "math", "action": "missing"},
+            {"module": "math", "action": "double", "params": {"value": 5}}
+        ])
+        
+        self.assertEqual([r.success for r in results], [False, False, False, False, True])
+        self.assertEqual(results[0].error, "boom")
+        self.assertIn("Validation error", results[1].error)
+        self.assertIn("Module not found", results[2].error)
+        self.assertIn("Action not found", results[3].error)
+        self.assertEqual(results[4].data, 10)
+        self.assertEqual(
+            [r.metadata.get("error_code") for r in results],
+            [ErrorCode.EXECUTION_FAILED, ErrorCode.VALIDATION, ErrorCode.MODULE_NOT_FOUND,
+             ErrorCode.ACTION_NOT_FOUND, None]
+        )
+    
+    def test_group_reuses_one_instance(self):
+        instances = []
+        
+        class TrackingModule:
+            def run(self, params, context):
+                instances.append(id(self))
+                return True
+        
+        self.kernel.register_module("tracking", TrackingModule)
+        self.kernel.execute_batch([("tracking", "run")] * 5)
+        self.assertEqual(len(set(instances)), 1)
+        self.assertEqual(self.kernel.get_status()["pools"]["tracking"]["created"], 1)
+
+
+class TestExecuteAsync(unittest.TestCase):
+    """Test the asyncio execution path"""
+    
+    def setUp(self):
+        self.kernel = KernelCore(max_workers=2)
+        
+        class IOModule:
+            async def fetch(self, params, context):
+                await asyncio.sleep(0.05)
+                return params["key"]
+            
+            def blocking(self, params, context):
+                return threading.current_thread().name
+        
+        self.kernel.register_module(
+            "io", IOModule,
+            manifest={"runtime": {"pool": {"thread_safe": True}}}
+        )
+    
+    def tearDown(self):
+        self.kernel.shutdown()
+    
+    def test_async_action(self):
+        result = asyncio.run(self.kernel.execute_async("io", "fetch", {"key": "a"}))
+        self.assertTrue(result.success)
+        self.assertEqual(result.data, "a")
+        self.assertEqual(result.metadata["module"], "io")
+        self.assertEqual(result.metadata["action"], "fetch")
+        self.assertEqual(result.metadata["execution_id"], 1)
+    
+    def test_concurrent_async_actions_share_loop(self):
+        async def run_many():
+            return await asyncio.gather(*[
+                self.kernel.execute_async("io", "fetch", {"key": i})
+                for i in range(200)
+            ])
+        
+        results = asyncio.run(run_many())
+        self.assertEqual([r.data for r in results], list(range(200)))
+        ids = {r.metadata["execution_id"] for r in results}
+        self.assertEqual(len(ids), 200)
+    
+    def test_sync_action_runs_in_thread_pool(self):
+        result = asyncio.run(self.kernel.execute_async("io", "blocking"))
+        self.assertTrue(result.success)
+        self.assertTrue(result.data.startswith("kernel"))
+    
+    def test_async_action_from_sync_execute(self):
+        result = self.kernel.execute("io", "fetch", {"key": "b"})
+        self.assertTrue(result.success)
+        self.assertEqual(result.data, "b")
+    
+    def test_errors_follow_sync_contract(self):
+        result = asyncio.run(self.kernel.execute_async("io", "missing"))
+        self.assertFalse(result.success)
+        self.assertIn("Action not found", result.error)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.ACTION_NOT_FOUND)
+
+
+class TestConcurrentKernel(unittest.TestCase):
+    """Stress tests for concurrent executions"""
+    
+    THREADS = 16
+    CALLS_PER_THREAD = 500
+    
+    def setUp(self):
+        self.kernel = KernelCore(max_workers=self.THREADS)
+        
+        class TestModule:
+            def run(self, params, context):
+                return params["n"]
+        
+        self.kernel.register_module("test", TestModule)
+    
+    def tearDown(self):
+        self.kernel.shutdown()
+    
+    def test_unique_ids_and_exact_count(self):
+        ids = [[] for _ in range(self.THREADS)]
+        barrier = threading.Barrier(self.THREADS)
+        
+        class LateModule:
+            def run(self, params, context):
+                return "late"
+        
+        def worker(slot):
+            barrier.wait()
+            for n in range(self.CALLS_PER_THREAD):
+                result = self.kernel.execute("test", "run", {"n": n})
+                self.assertTrue(result.success)
+                ids[slot].append(result.metadata["execution_id"])
+                if n == 100:
+                    self.kernel.register_module(f"late_{slot}", LateModule)
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        all_ids = [i for slot in ids for i in slot]
+        total = self.THREADS * self.CALLS_PER_THREAD
+        self.assertEqual(len(all_ids), total)
+        self.assertEqual(len(set(all_ids)), total)
+        self.assertEqual(self.kernel.execution_count, total)
+        self.assertEqual(len(self.kernel.modules), self.THREADS + 1)
+    
+    def test_submit_on_thread_pool(self):
+        futures = [self.kernel.submit("test", "run", {"n": n}) for n in range(200)]
+        results = [future.result() for future in futures]
+        
+        self.assertEqual([r.data for r in results], list(range(200)))
+        self.assertEqual(len({r.metadata["execution_id"] for r in results}), 200)
+        self.assertEqual(self.kernel.execution_count, 200)
+    
+    def test_atomic_counter(self):
+        counter = AtomicCounter()
+        self.assertEqual(counter.value, 0)
+        self.assertEqual(counter.increment(), 1)
+        self.assertEqual(counter.reserve(3), [2, 3, 4])
+        self.assertEqual(counter.value, 4)
+    
+    def test_atomic_counter_value_under_threads(self):
+        counter = AtomicCounter()
+        threads = [
+            threading.Thread(target=lambda: [counter.increment() for _ in range(1000)])
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(counter.value, 4000)
+        self.assertEqual(counter.reserve(0), [])
+        self.assertEqual(counter.value, 4000)
+    
+    def test_copy_on_write_snapshot(self):
+        table = CopyOnWriteMap()
+        self.assertTrue(table.set_if_absent("a", 1))
+        self.assertFalse(table.set_if_absent("a", 2))
+        snapshot = table.snapshot()
+        table.replace("a", 3)
+        self.assertEqual(snapshot["a"], 1)
+        self.assertEqual(table.get("a"), 3)
+
+
+class TestProcessIsolation(unittest.TestCase):
+    """Test process-pool isolation"""
+    
+    def setUp(self):
+        self.kernel = KernelCore()
+        self.kernel.register_module(
+            "isolated", IsolatedModule,
+            manifest={"runtime": {"isolation": "process", "workers": 1}}
+        )
+    
+    def tearDown(self):
+        self.kernel.shutdown()
+    
+    def test_runs_in_worker_process(self):
+        first = self.kernel.execute("isolated", "compute", {"n": 4})
+        second = self.kernel.execute("isolated", "compute", {"n": 5})
+        
+        self.assertTrue(first.success)
+        self.assertEqual(first.data["square"], 16)
+        self.assertNotEqual(first.data["pid"], os.getpid())
+        self.assertEqual(second.data["pid"], first.data["pid"])
+        self.assertEqual(second.data["calls"], 2)
+    
+    def test_action_errors_are_reported(self):
+        result = self.kernel.execute("isolated", "fail")
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "bad input")
+        self.assertEqual(result.metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+    
+    def test_worker_crash_does_not_take_down_kernel(self):
+        result = self.kernel.execute("isolated", "crash")
+        self.assertFalse(result.success)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+        self.assertEqual(result.metadata["error_details"]["exitcode"], 3)
+        
+        result = self.kernel.execute("isolated", "compute", {"n": 3})
+        self.assertTrue(result.success)
+        self.assertEqual(result.data["square"], 9)
+        
+        status = self.kernel.get_status()["pools"]["isolated"]
+        self.assertEqual(status["crashes"], 1)
+        self.assertEqual(status["alive"], 1)
+    
+    def test_unserializable_params_rejected(self):
+        result = self.kernel.execute("isolated", "compute", {"n": object()})
+        self.assertFalse(result.success)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.INVALID_INPUT)
+    
+    def test_async_and_batch_paths(self):
+        result = asyncio.run(self.kernel.execute_async("isolated", "compute", {"n": 2}))
+        self.assertEqual(result.data["square"], 4)
+        
+        results = self.kernel.execute_batch([("isolated", "compute", {"n": n}) for n in range(3)])
+        self.assertEqual([r.data["square"] for r in results], [0, 1, 4])
+    
+    def test_corrupt_reply_replaces_worker(self):
+        parent, loads = os.getpid(), marshal.loads
+        
+        def corrupt(data):
+            # Workers forked while patched must still decode their requests
+            return loads(b"\x00" + data[1:] if os.getpid() == parent else data)
+        
+        with mock.patch("process_pool.marshal.loads", side_effect=corrupt):
+            result = self.kernel.execute("isolated", "compute", {"n": 2})
+        self.assertFalse(result.success)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+        
+        result = self.kernel.execute("isolated", "compute", {"n": 3})
+        self.assertEqual(result.data["square"], 9)
+        status = self.kernel.get_status()["pools"]["isolated"]
+        self.assertEqual(status["crashes"], 1)
+        self.assertEqual(status["restarts"], 1)
+    
+    def test_waiting_caller_sees_pool_close(self):
+        pool = ProcessPool("waiting", IsolatedModule, settings=IsolationSettings(mode="process", workers=1))
+        pool.start()
+        self.addCleanup(pool.close)
+        busy = threading.Thread(target=pool.execute, args=("sleep", {"seconds": 0.3}, {}))
+        busy.start()
+        time.sleep(0.05)
+        errors = []
+        
+        def wait():
+            try:
+                pool.execute("compute", {"n": 1}, {})
+            except KernelError as e:
+                errors.append(e)
+        
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.05)
+        pool.close()
+        waiter.join(timeout=2)
+        busy.join(timeout=2)
+        self.assertFalse(waiter.is_alive())
+        self.assertIn("closed", errors[0].message)
+    
+    def test_waiting_caller_sees_lost_workers(self):
+        pool = ProcessPool("lost", IsolatedModule, settings=IsolationSettings(mode="process", workers=1))
+        pool.start()
+        self.addCleanup(pool.close)
+        with mock.patch.object(pool, "_spawn", side_effect=OSError("fork failed")):
+            with self.assertRaises(KernelError):
+                pool.execute("crash", {}, {})
+            with self.assertRaises(KernelError) as caught:
+                pool.execute("compute", {"n": 1}, {})
+        self.assertIn("No worker processes left", caught.exception.message)
+
+
+class TestTimeouts(unittest.TestCase):
+    """Test per-call and manifest deadlines"""
+    
+    def setUp(self):
+        self.kernel = KernelCore()
+        self.stopped = threading.Event()
+        stopped = self.stopped
+        
+        class SlowModule:
+            def get_manifest(self):
+                return {
+                    "name": "slow",
+                    "runtime": {
+                        "timeout": 5.0,
+                        "actions": {"limited": {"timeout": 0.05}}
+                    }
+                }
+            
+            def wait(self, params, context):
+                deadline = current_deadline()
+                while not deadline.expired:
+                    time.sleep(0.005)
+                stopped.set()
+                return "stopped"
+            
+            def limited(self, params, context):
+                time.sleep(0.5)
+                return "late"
+            
+            def quick(self, params, context):
+                return "quick"
+            
+            async def slow_async(self, params, context):
+                await asyncio.sleep(5)
+        
+        self.kernel.register_module("slow", SlowModule)
+    
+    def tearDown(self):
+        self.kernel.shutdown(wait=False)
+    
+    def assertTimedOut(self, result, timeout_ms):
+        self.assertFalse(result.success)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.TIMEOUT)
+        details = result.metadata["error_details"]
+        self.assertEqual(details["timeout_ms"], timeout_ms)
+        self.assertGreaterEqual(details["elapsed_ms"], timeout_ms)
+    
+    def test_per_call_timeout_abandons_sync_action(self):
+        result = self.kernel.execute("slow", "wait", timeout=0.05)
+        self.assertTimedOut(result, 50.0)
+        self.assertIn("timed out", result.error)
+        self.assertTrue(self.stopped.wait(1))
+    
+    def test_manifest_action_timeout(self):
+        started = time.monotonic()
+        result = self.kernel.execute("slow", "limited")
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertTimedOut(result, 50.0)
+    
+    def test_within_deadline(self):
+        result = self.kernel.execute("slow", "quick", timeout=1.0)
+        self.assertTrue(result.success)
+        self.assertEqual(result.data, "quick")
+    
+    def test_async_action_cancelled(self):
+        result = asyncio.run(self.kernel.execute_async("slow", "slow_async", timeout=0.05))
+        self.assertTimedOut(result, 50.0)
+        
+        result = self.kernel.execute("slow", "slow_async", timeout=0.05)
+        self.assertTimedOut(result, 50.0)
+    
+    def test_process_pool_worker_killed_on_timeout(self):
+        self.kernel.register_module(
+            "isolated", IsolatedModule,
+            manifest={"runtime": {"isolation": "process", "workers": 1}}
+        )
+        result = self.kernel.execute("isolated", "sleep", {"seconds": 5}, timeout=0.1)
+        self.assertTimedOut(result, 100.0)
+        
+        result = self.kernel.execute("isolated", "compute", {"n": 2})
+        self.assertTrue(result.success)
+        self.assertEqual(self.kernel.get_status()["pools"]["isolated"]["restarts"], 1)
+    
+    def test_timed_submits_on_saturated_pool(self):
+        kernel = KernelCore(max_workers=2)
+        self.addCleanup(kernel.shutdown, False)
+        kernel.register_module("nap", IsolatedModule)
+        futures = [kernel.submit("nap", "sleep", {"seconds": 0.01}, timeout=1.0) for _ in range(4)]
+        for future in futures:
+            self.assertTrue(future.result(timeout=2).success)
+    
+    def test_batch_timeout_reuses_leased_instance(self):
+        manifest = {"runtime": {"pool": {"size": 1}, "timeout": 1.0}}
+        self.kernel.register_module("nap", IsolatedModule, manifest=manifest)
+        results = self.kernel.execute_batch([
+            {"module": "nap", "action": "sleep", "params": {"seconds": 0.01}}
+            for _ in range(3)
+        ])
+        self.assertTrue(all(result.success for result in results))
+    
+    def test_batch_timeout_hands_instance_to_abandoned_action(self):
+        manifest = {"runtime": {"pool": {"size": 1}, "timeout": 0.05}}
+        self.kernel.register_module("nap", IsolatedModule, manifest=manifest)
+        results = self.kernel.execute_batch([
+            {"module": "nap", "action": "sleep", "params": {"seconds": 0.2}},
+            {"module": "nap", "action": "sleep", "params": {"seconds": 0.0}}
+        ])
+        self.assertTimedOut(results[0], 50.0)
+        self.assertTrue(results[1].success)
+        self.assertEqual(self.kernel.get_status()["pools"]["nap"]["leased"], 0)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test memoization of pure actions"""
+    
+    def setUp(self):
+        self.kernel = KernelCore()
+        self.calls = []
+        calls = self.calls
+        
+        class MathModule:
+            def get_manifest(self):
+                return {
+                    "name": "math",
+                    "version": "1.0.0",
+                    "runtime": {"actions": {"square": {"pure": True}}}
+                }
+            
+            def square(self, params, context):
+                calls.append(params["n"])
+                return {"result": params["n"] ** 2}
+            
+            def impure(self, params, context):
+                calls.append(params["n"])
+                return len(calls)
+        
+        self.kernel.register_module("math", MathModule)
+    
+    def test_pure_action_is_memoized(self):
+        first = self.kernel.execute("math", "square", {"n": 3})
+        second = self.kernel.execute("math", "square", {"n": 3})
+        
+        self.assertEqual(first.data, {"result": 9})
+        self.assertEqual(second.data, {"result": 9})
+        self.assertNotIn("cached", first.metadata)
+        self.assertTrue(second.metadata["cached"])
+        self.assertEqual(self.calls, [3])
+        
+        stats = self.kernel.get_status()["cache"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+    
+    def test_cached_data_is_a_copy(self):
+        self.kernel.execute("math", "square", {"n": 2})
+        hit = self.kernel.execute("math", "square", {"n": 2})
+        hit.data["result"] = "mutated"
+        
+        again = self.kernel.execute("math", "square", {"n": 2})
+        self.assertEqual(again.data, {"result": 4})
+    
+    def test_impure_action_not_cached(self):
+        self.kernel.execute("math", "impure", {"n": 1})
+        self.kernel.execute("math", "impure", {"n": 1})
+        self.assertEqual(self.calls, [1, 1])
+    
+    def test_canonical_key(self):
+        self.assertEqual(
+            canonical_key("m", "1", "a", {"x": 1, "y": 2}),
+            canonical_key("m", "1", "a", {"y": 2, "x": 1})
+        )
+        self.assertNotEqual(
+            canonical_key("m", "1", "a", {"x": 1}),
+            canonical_key("m", "2", "a", {"x": 1})
+        )
+        self.assertIsNone(canonical_key("m", "1", "a", {"x": object()}))
+        self.assertIsNone(canonical_key("m", "1", "a", {1: 0}))
+        self.assertIsNone(canonical_key("m", "1", "a", {"x": (1, 2)}))
+        self.assertIsNotNone(canonical_key("m", "1", "a", {"1": [1.5, True, None]}))
+    
+    def test_lossy_params_not_cached(self):
+        self.kernel.execute("math", "square", {"n": 4, "tags": {"1": 0}})
+        result = self.kernel.execute("math", "square", {"n": 4, "tags": {1: 0}})
+        
+        self.assertNotIn("cached", result.metadata)
+        self.assertEqual(self.calls, [4, 4])
+    
+    def test_lru_ttl_and_memory_bounds(self):
+        now = [0.0]
+        cache = ResultCache(max_entries=2, ttl=10, max_bytes=1000, clock=lambda: now[0])
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIs(cache.get("b"), MISS)
+        self.assertEqual(cache.get("a"), 1)
+        
+        now[0] = 11.0
+        self.assertIs(cache.get("a"), MISS)
+        
+        self.assertFalse(cache.put("big", "x" * 2000))
+        stats = cache.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["expirations"], 1)
+        self.assertLessEqual(stats["bytes"], 1000)
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix domain sockets")
+class TestKernelServer(unittest.TestCase):
+    """Test the kernel daemon and its client"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, "kernel.sock")
+        
+        class EchoModule:
+            def echo(self, params, context):
+                return params
+            
+            def rows(self, params, context):
+                for i in range(params["n"]):
+                    yield {"row": i}
+            
+            def opaque(self, params, context):
+                return object()
+        
+        kernel = KernelCore()
+        kernel.register_module("echo", EchoModule)
+        self.server = KernelServer(kernel, self.socket_path)
+        self.server.start()
+    
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+    
+    def test_execute_over_socket(self):
+        with KernelClient(self.socket_path) as client:
+            self.assertTrue(client.ping())
+            reply = client.execute("echo", "echo", {"value": 1})
+            missing = client.execute("nope", "echo")
+        
+        self.assertTrue(reply["ok"])
+        self.assertEqual(reply["result"]["data"], {"value": 1})
+        self.assertEqual(reply["result"]["metadata"]["module"], "echo")
+        self.assertTrue(missing["ok"])
+        self.assertFalse(missing["result"]["success"])
+    
+    def test_stream_over_socket(self):
+        with KernelClient(self.socket_path) as client:
+            messages = list(client.stream("echo", "rows", {"n": 3}))
+            # The connection is reusable once the stream is consumed
+            after = client.execute("echo", "echo", {"value": 2})
+        
+        self.assertEqual([m["chunk"] for m in messages[:-1]], [{"row": 0}, {"row": 1}, {"row": 2}])
+        self.assertTrue(messages[-1]["ok"])
+        self.assertTrue(messages[-1]["result"]["success"])
+        self.assertEqual(messages[-1]["result"]["metadata"]["chunks"], 3)
+        self.assertEqual(after["result"]["data"], {"value": 2})
+    
+    def test_reload_op(self):
+        with KernelClient(self.socket_path) as client:
+            report = client.reload("echo")
+            missing = client.reload("nope")
+            after = client.execute("echo", "echo", {"value": 3})
+        
+        # EchoModule is local to setUp, so it cannot be imported again from source
+        self.assertFalse(report["success"])
+        self.assertEqual(report["stage"], "load")
+        self.assertEqual(missing["error_code"], ErrorCode.MODULE_NOT_FOUND)
+        self.assertEqual(after["result"]["data"], {"value": 3})
+    
+    def test_rejected_requests(self):
+        with KernelClient(self.socket_path) as client:
+            invalid = client.execute("bad name!", "echo")
+            unknown = client.request({"op": "reload"})
+        
+        self.assertFalse(invalid["ok"])
+        self.assertTrue(invalid["error"].startswith("Validation error"))
+        self.assertFalse(unknown["ok"])
+    
+    def test_unserializable_result(self):
+        with KernelClient(self.socket_path) as client:
+            reply = client.execute("echo", "opaque")
+            after = client.execute("echo", "echo", {"value": 4})
+        
+        self.assertTrue(reply["ok"])
+        self.assertFalse(reply["result"]["success"])
+        self.assertIn("not JSON serializable", reply["result"]["error"])
+        self.assertEqual(reply["result"]["metadata"]["module"], "echo")
+        self.assertEqual(after["result"]["data"], {"value": 4})
+    
+    @unittest.skipUnless(hasattr(os, "getuid"), "requires POSIX user ids")
+    def test_refuses_socket_of_another_user(self):
+        client = KernelClient(self.socket_path)
+        with mock.patch("kernel_client.os.getuid", return_value=os.getuid() + 1):
+            with self.assertRaises(DaemonUnavailable):
+                client.connect()
+        self.assertTrue(client.connect().ping())
+        client.close()
+    
+    def test_default_socket_prefers_runtime_dir(self):
+        with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": self.tmpdir}):
+            os.environ.pop("AGENT_KERNEL_SOCKET", None)
+            self.assertEqual(default_socket_path(), os.path.join(self.tmpdir, "agent-kernel.sock"))
+    
+    def test_shutdown_removes_socket(self):
+        with KernelClient(self.socket_path) as client:
+            client.shutdown()
+        for _ in range(100):
+            if not os.path.exists(self.socket_path):
+                break
+            time.sleep(0.01)
+        self.assertFalse(os.path.exists(self.socket_path))
+        with self.assertRaises(DaemonUnavailable):
+            KernelClient(self.socket_path).connect()
+
+
+class TestLatency(unittest.TestCase):
+    """Test latency histograms"""
+    
+    def test_bucket_bounds_contain_value(self):
+        for value in [0, 1, 31, 32, 33, 1000, 123456, 10**9, (1 << 42) - 1]:
+            index = bucket_index(value)
+            lower, upper = bucket_bounds(index)
+            self.assertLessEqual(lower, value)
+            self.assertGreaterEqual(upper, value)
+            self.assertLess(index, BUCKETS)
+            self.assertLessEqual(upper - lower, max(1, value // 16))
+    
+    def test_percentiles_and_error_rate(self):
+        recorder = LatencyRecorder()
+        for ms in range(1, 101):
+            recorder.record("mod", "run", ms * 1_000_000, ok=ms % 10 != 0)
+        stats = recorder.snapshot()["mod"]["run"]
+        
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["errors"], 10)
+        self.assertAlmostEqual(stats["error_rate"], 0.1)
+        self.assertAlmostEqual(stats["p50_ms"], 50, delta=2)
+        self.assertAlmostEqual(stats["p90_ms"], 90, delta=3)
+        self.assertAlmostEqual(stats["p99_ms"], 99, delta=3)
+        self.assertLessEqual(stats["p999_ms"], stats["max_ms"])
+        self.assertEqual(stats["min_ms"], 1)
+    
+    def test_threads_record_into_separate_shards(self):
+        recorder = LatencyRecorder()
+        recorded = threading.Barrier(9)
+        done = threading.Event()
+        
+        def work():
+            for _ in range(1000):
+                recorder.record("mod", "run", 5000)
+            recorded.wait(5)
+            done.wait(5)
+        
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        recorded.wait(5)
+        self.assertEqual(recorder.snapshot()["mod"]["run"]["count"], 8000)
+        self.assertEqual(len(recorder._shards[("mod", "run")]), 8)
+        
+        # Shards of finished threads fold into one retired shard
+        done.set()
+        for t in threads:
+            t.join()
+        gc.collect()
+        stats = recorder.snapshot()["mod"]["run"]
+        self.assertEqual(stats["count"], 8000)
+        self.assertEqual(stats["min_ms"], 0.005)
+        self.assertEqual(len(recorder._shards[("mod", "run")]), 1)
+        recorder.reset()
+        self.assertEqual(recorder.snapshot(), {})
+    
+    def test_kernel_status_reports_latency(self):
+        class EchoModule:
+            def echo(self, params, context):
+                return params
+            
+            def fail(self, params, context):
+                raise ValueError("broken")
+        
+        kernel = KernelCore()
+        kernel.register_module("echo", EchoModule)
+        kernel.execute("echo", "echo", {})
+        kernel.execute("echo", "fail", {})
+        kernel.execute_batch([("echo", "echo", {})] * 3)
+        asyncio.run(kernel.execute_async("echo", "echo", {}))
+        
+        latency = kernel.get_status()["latency"]["echo"]
+        self.assertEqual(latency["echo"]["count"], 5)
+        self.assertEqual(latency["fail"]["error_rate"], 1)
+        self.assertGreater(latency["echo"]["p50_ms"], 0)
+        kernel.shutdown()
+
+
+class TestAdmission(unittest.TestCase):
+    """Test admission control"""
+    
+    def setUp(self):
+        self.release = threading.Event()
+        self.running = threading.Semaphore(0)
+        release, running = self.release, self.running
+        
+        class SlowModule:
+            def wait(self, params, context):
+                running.release()
+                release.wait(5)
+                return params.get("n")
+            
+            def get_manifest(self):
+                return {"runtime": {
+                    "pool": {"thread_safe": True},
+                    "admission": {"max_in_flight": 1, "max_queue": 1, "queue_timeout": 5}
+                }}
+        
+        self.kernel = KernelCore(max_workers=4)
+        self.kernel.register_module("slow", SlowModule)
+    
+    def tearDown(self):
+        self.release.set()
+        self.kernel.shutdown()
+    
+    def test_queue_full_fails_fast(self):
+        first = self.kernel.submit("slow", "wait", {"n": 1})
+        self.assertTrue(self.running.acquire(timeout=5))
+        second = self.kernel.submit("slow", "wait", {"n": 2})
+        while self.kernel.get_status()["admission"]["slow"]["queue_depth"] < 1:
+            time.sleep(0.001)
+        
+        rejected = self.kernel.execute("slow", "wait", {"n": 3})
+        self.assertFalse(rejected.success)
+        self.assertEqual(rejected.metadata["error_code"], ErrorCode.OVERLOADED)
+        self.assertEqual(rejected.metadata["error_details"]["reason"], "queue_full")
+        
+        self.release.set()
+        self.assertEqual(first.result(5).data, 1)
+        self.assertEqual(second.result(5).data, 2)
+        status = self.kernel.get_status()["admission"]["slow"]
+        self.assertEqual(status["admitted"], 2)
+        self.assertEqual(status["queued"], 1)
+        self.assertEqual(status["rejected"], 1)
+        self.assertEqual(status["in_flight"], 0)
+    
+    def test_queue_timeout(self):
+        controller = AdmissionController("m", AdmissionSettings(1, max_queue=1, queue_timeout=0.01))
+        controller.acquire()
+        with self.assertRaises(KernelError) as raised:
+            controller.acquire()
+        self.assertEqual(raised.exception.details["reason"], "queue_timeout")
+        self.assertEqual(controller.timed_out, 1)
+        self.assertEqual(controller.queue_depth, 0)
+        controller.release()
+        controller.acquire()
+    
+    def test_async_waiters_served_in_order(self):
+        controller = AdmissionController("m", AdmissionSettings(1, max_queue=3))
+        order = []
+        
+        async def worker(n):
+            await controller.acquire_async()
+            order.append(n)
+            await asyncio.sleep(0)
+            controller.release()
+        
+        async def main():
+            await asyncio.gather(*(worker(n) for n in range(4)))
+        
+        asyncio.run(main())
+        self.assertEqual(order, [0, 1, 2, 3])
+        self.assertEqual(controller.get_status()["queued"], 3)
+    
+    def test_aimd_limit(self):
+        now = [0.0]
+        settings = AdmissionSettings(8, adaptive=True, target_latency=0.1, min_in_flight=2)
+        controller = AdmissionController("m", settings, clock=lambda: now[0])
+        
+        controller.acquire()
+        controller.release(0.5)
+        self.assertEqual(controller.limit, 7)
+        # Decreases are spaced by at least target_latency
+        controller.acquire()
+        controller.release(0.5)
+        self.assertEqual(controller.limit, 7)
+        for _ in range(20):
+            now[0] += 1
+            controller.acquire()
+            controller.release(0.5)
+        self.assertEqual(controller.limit, 2)
+        # About +1 per limit's worth of fast executions, capped at max_in_flight
+        for _ in range(40):
+            controller.acquire()
+            controller.release(0.01)
+        self.assertEqual(controller.limit, 8)
+    
+    def test_batch_admitted_before_lease(self):
+        release, running = self.release, self.running
+        
+        class Exclusive:
+            def wait(self, params, context):
+                running.release()
+                release.wait(5)
+                return params["n"]
+        
+        manifest = {"runtime": {
+            "pool": {"size": 1},
+            "admission": {"max_in_flight": 1, "max_queue": 2, "queue_timeout": 5}
+        }}
+        self.kernel.register_module("exclusive", Exclusive, manifest=manifest)
+        results = []
+        batch = threading.Thread(target=lambda: results.extend(self.kernel.execute_batch(
+            [("exclusive", "wait", {"n": 1}), ("exclusive", "wait", {"n": 2})]
+        )))
+        batch.start()
+        self.assertTrue(self.running.acquire(timeout=5))
+        single = self.kernel.submit("exclusive", "wait", {"n": 3})
+        while self.kernel.get_status()["admission"]["exclusive"]["queue_depth"] < 1:
+            time.sleep(0.001)
+        
+        started = time.monotonic()
+        self.release.set()
+        batch.join(5)
+        self.assertEqual(single.result(5).data, 3)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual([result.data for result in results], [1, 2])
+    
+    def test_modules_without_limits_are_not_tracked(self):
+        class EchoModule:
+            def echo(self, params, context):
+                return params
+        
+        self.kernel.register_module("echo", EchoModule)
+        self.assertTrue(self.kernel.execute("echo", "echo", {}).success)
+        self.assertNotIn("echo", self.kernel.get_status()["admission"])
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test circuit breakers"""
+    
+    def setUp(self):
+        self.now = 100.0
+        settings = BreakerSettings(failure_rate=0.5, window=10, min_calls=4, cool_off=1.0, backoff=2.0, max_cool_off=3.0)
+        self.breaker = CircuitBreaker("svc", None, settings, clock=lambda: self.now)
+    
+    def call(self, failed):
+        self.breaker.release(self.breaker.acquire(), failed)
+    
+    def test_trips_on_failure_rate_and_backs_off(self):
+        for failed in (False, True, False):
+            self.call(failed)
+        self.assertEqual(self.breaker.state, "closed")
+        self.call(True)  # 2 of 4 failed
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.acquire()
+        self.assertEqual(raised.exception.code, ErrorCode.CIRCUIT_OPEN)
+        self.assertEqual(raised.exception.details["retry_after_ms"], 1000)
+        
+        # Half-open admits one trial; its failure re-opens for twice as long
+        self.now += 1.0
+        token = self.breaker.acquire()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.acquire()
+        self.breaker.release(token, True)
+        self.assertEqual(self.breaker.get_status()["retry_after_ms"], 2000)
+        self.now += 2.0
+        self.call(True)
+        self.assertEqual(self.breaker.get_status()["retry_after_ms"], 3000)  # capped
+        
+        # A successful trial closes it and resets the backoff
+        self.now += 3.0
+        self.call(False)
+        status = self.breaker.get_status()
+        self.assertEqual((status["state"], status["trips"], status["consecutive_opens"]), ("closed", 3, 0))
+    
+    def test_window_and_neutral_outcomes(self):
+        for _ in range(3):
+            self.call(True)
+        self.call(None)  # e.g. a validation error: not counted
+        self.assertEqual(self.breaker.state, "closed")
+        self.now += 11  # the failures age out of the window
+        for failed in (True, False, False, False):
+            self.call(failed)
+        self.assertEqual(self.breaker.state, "closed")
+        
+        # Outcomes of calls started before the breaker opened are ignored
+        stale = self.breaker.acquire()
+        while self.breaker.state == "closed":
+            self.call(True)
+        self.now += 1.0
+        self.breaker.release(stale, False)
+        self.assertEqual(self.breaker.state, "half_open")
+    
+    def test_kernel_fails_fast_while_open(self):
+        calls = []
+        
+        class Flaky:
+            def fetch(self, params, context):
+                calls.append("fetch")
+                if params.get("down"):
+                    raise ConnectionError("dependency down")
+                return "ok"
+            
+            def local(self, params, context):
+                calls.append("local")
+                return "local"
+        
+        manifest = {
+            "params": {"fetch": {"down": {"type": "boolean"}}},
+            "runtime": {
+                "circuit_breaker": {"failure_rate": 0.5, "min_calls": 2, "cool_off": 0.05},
+                "actions": {"local": {"circuit_breaker": False}}
+            }
+        }
+        kernel = KernelCore()
+        self.addCleanup(kernel.shutdown)
+        kernel.register_module("flaky", Flaky, manifest=manifest)
+        
+        self.assertEqual(kernel.execute("flaky", "fetch", {"down": "no"}).metadata["error_code"], ErrorCode.VALIDATION)
+        for _ in range(2):
+            self.assertEqual(kernel.execute("flaky", "fetch", {"down": True}).metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+        calls.clear()
+        
+        rejected = kernel.execute("flaky", "fetch")
+        batch = kernel.execute_batch([("flaky", "fetch", None, None)])
+        stream = kernel.execute_stream("flaky", "fetch")
+        list(stream)
+        self.assertEqual(rejected.metadata["error_code"], ErrorCode.CIRCUIT_OPEN)
+        self.assertEqual(batch[0].metadata["error_code"], ErrorCode.CIRCUIT_OPEN)
+        self.assertEqual(stream.result.metadata["error_code"], ErrorCode.CIRCUIT_OPEN)
+        self.assertEqual(calls, [])
+        # Exempt actions keep running
+        self.assertEqual(kernel.execute("flaky", "local").data, "local")
+        
+        status = kernel.get_status()["circuits"]["flaky"]
+        self.assertEqual(status["module"]["state"], "open")
+        self.assertEqual(status["module"]["rejected"], 3)
+        
+        time.sleep(0.06)
+        self.assertTrue(asyncio.run(kernel.execute_async("flaky", "fetch")).success)
+        self.assertEqual(kernel.get_status()["circuits"]["flaky"]["module"]["state"], "closed")
+    
+    def test_action_breaker_over_module_defaults(self):
+        breakers = build_breakers("svc", {
+            "runtime": {
+                "circuit_breaker": {"min_calls": 5, "cool_off": 2.0},
+                "actions": {"slow": {"circuit_breaker": {"min_calls": 2}}}
+            }
+        }, ["slow", "fast"])
+        slow, shared = breakers["slow"]
+        self.assertEqual((slow.action, slow.settings.min_calls, slow.settings.cool_off), ("slow", 2, 2.0))
+        self.assertEqual(breakers["fast"], (shared,))
+        self.assertEqual(build_breakers("svc", {}, ["slow"]), {})
+
+
+class TestBenchmarkGate(unittest.TestCase):
+    """Test the benchmark regression gate"""
+    
+    def test_compare_against_baseline(self):
+        baseline = {
+            "tolerances": {"default": 0.2, "slow": 0.5},
+            "results": {
+                "fast": {"unit": "ns", "value": 100},
+                "slow": {"unit": "ms", "value": 10},
+                "better": {"unit": "ns", "value": 100}
+            }
+        }
+        results = {"results": {
+            "fast": {"unit": "ns", "value": 130},
+            "slow": {"unit": "ms", "value": 14},
+            "better": {"unit": "ns", "value": 50},
+            "added": {"unit": "ns", "value": 1}
+        }}
+        rows = {row["name"]: row for row in compare(results, baseline)}
+        
+        self.assertEqual(rows["fast"]["status"], "regression")
+        self.assertAlmostEqual(rows["fast"]["change"], 0.3)
+        self.assertEqual(rows["slow"]["status"], "ok")
+        self.assertEqual(rows["better"]["status"], "improved")
+        self.assertEqual(rows["added"]["status"], "new")
+        
+        rows = {row["name"]: row for row in compare(results, baseline, {"fast": 0.5})}
+        self.assertEqual(rows["fast"]["status"], "ok")
+    
+    def test_measure_reports_per_call_time(self):
+        case = Case("noop", lambda: (lambda: None), "ns", "")
+        result = measure(case, rounds=2, min_time=0.001)
+        self.assertEqual(result["unit"], "ns")
+        self.assertGreater(result["number"], 1)
+        self.assertEqual(result["rounds"], 2)
+        self.assertLessEqual(result["value"], result["median"])
+    
+    def test_measure_runs_teardown(self):
+        torn_down = []
+        case = Case("noop", lambda: ((lambda: None), lambda: torn_down.append(True)), "ms", "")
+        measure(case, rounds=1, min_time=0)
+        self.assertEqual(torn_down, [True])
+
+
+class TestWorkflow(unittest.TestCase):
+    """Test DAG workflows"""
+    
+    def setUp(self):
+        class StepModule:
+            def add(self, params, context):
+                time.sleep(params.get("delay", 0))
+                return {"result": params["a"] + params["b"], "user": context.get("user")}
+            
+            def echo(self, params, context):
+                return params
+            
+            def fail(self, params, context):
+                raise ValueError("step failed")
+        
+        self.kernel = KernelCore(max_workers=4)
+        self.kernel.register_module("steps", StepModule)
+    
+    def tearDown(self):
+        self.kernel.shutdown()
+    
+    def test_references_feed_downstream_params(self):
+        result = self.kernel.execute_workflow([
+            {"id": "first", "module": "steps", "action": "add", "params": {"a": 1, "b": 2}},
+            {"id": "second", "module": "steps", "action": "add",
+             "params": {"a": "${first.data.result}", "b": 10}},
+            {"id": "report", "module": "steps", "action": "echo",
+             "params": {"text": "sum=${second.data.result}", "ok": "${second.success}",
+                        "items": ["${first.data.result}", "${first.data.user}"]}}
+        ], context={"user": "alice"})
+        
+        self.assertTrue(result.success)
+        self.assertEqual(result["second"].result.data["result"], 13)
+        self.assertEqual(result["report"].result.data, {"text": "sum=13", "ok": True, "items": [3, "alice"]})
+        self.assertEqual(list(result.steps), ["first", "second", "report"])
+        self.assertGreaterEqual(result["second"].started_ms, result["first"].started_ms + result["first"].duration_ms)
+    
+    def test_independent_branches_run_concurrently(self):
+        steps = [
+            {"id": "left", "module": "steps", "action": "add", "params": {"a": 1, "b": 1, "delay": 0.2}},
+            {"id": "right", "module": "steps", "action": "add", "params": {"a": 2, "b": 2, "delay": 0.2}},
+            {"id": "join", "module": "steps", "action": "add",
+             "params": {"a": "${left.data.result}", "b": "${right.data.result}"}}
+        ]
+        result = self.kernel.execute_workflow(steps)
+        self.assertEqual(result["join"].result.data["result"], 6)
+        self.assertLess(result.duration_ms, 350)
+        
+        result = asyncio.run(self.kernel.execute_workflow_async(Workflow(steps)))
+        self.assertEqual(result["join"].result.data["result"], 6)
+        self.assertLess(result.duration_ms, 350)
+    
+    def test_failure_skips_downstream_only(self):
+        result = self.kernel.execute_workflow([
+            {"id": "broken", "module": "steps", "action": "fail"},
+            {"id": "after", "module": "steps", "action": "echo", "params": {"x": "${broken.data}"}},
+            {"id": "last", "module": "steps", "action": "echo", "depends_on": ["after"]},
+            {"id": "other", "module": "steps", "action": "echo", "params": {"y": 1}},
+            {"id": "missing", "module": "steps", "action": "echo", "params": {"z": "${other.data.nope}"}}
+        ])
+        
+        self.assertFalse(result.success)
+        statuses = {step_id: step.status for step_id, step in result.steps.items()}
+        self.assertEqual(statuses, {
+            "broken": "failed", "after": "skipped", "last": "skipped",
+            "other": "succeeded", "missing": "failed"
+        })
+        self.assertEqual(result["last"].skipped_because, "broken")
+        self.assertEqual(result["missing"].result.metadata["error_code"], ErrorCode.VALIDATION)
+        self.assertEqual(sorted(result.failed), ["broken", "missing"])
+    
+    def test_invalid_graphs_are_rejected(self):
+        invalid = [
+            [],
+            [{"id": "a", "module": "steps", "action": "echo", "depends_on": ["b"]}],
+            [{"id": "a", "module": "steps", "action": "echo", "params": {"x": "${b.data}"}},
+             {"id": "b", "module": "steps", "action": "echo", "params": {"x": "${a.data}"}}],
+            [{"id": "a", "module": "steps", "action": "echo"}, {"id": "a", "module": "steps", "action": "echo"}],
+            [{"id": "a", "module": "steps", "action": "echo", "params": {"x": "${a.result}"}}],
+            [{"id": "a", "module": "steps", "action": "echo", "params": {"x": "${a}"}}]
+        ]
+        for steps in invalid:
+            with self.assertRaises(KernelValidationError):
+                self.kernel.execute_workflow(steps)
+
+
+class TestCoalescing(unittest.TestCase):
+    """Test single-flight coalescing of identical requests"""
+    
+    def setUp(self):
+        self.calls = calls = []
+        self.gate = gate = threading.Event()
+        
+        class SlowModule:
+            def lookup(self, params, context):
+                calls.append(params["key"])
+                gate.wait(5)
+                if params["key"] == "bad":
+                    raise ValueError("lookup failed")
+                return {"key": params["key"]}
+            
+            async def alookup(self, params, context):
+                calls.append(params["key"])
+                while not gate.is_set():
+                    await asyncio.sleep(0.005)
+                return {"key": params["key"]}
+            
+            def plain(self, params, context):
+                calls.append(params["key"])
+                gate.wait(5)
+                return params["key"]
+        
+        manifest = {
+            "runtime": {
+                "pool": {"size": 8},
+                "actions": {"lookup": {"coalesce": True}, "alookup": {"coalesce": True}}
+            }
+        }
+        self.kernel = KernelCore(max_workers=16)
+        self.kernel.register_module("slow", SlowModule, manifest=manifest)
+    
+    def tearDown(self):
+        self.gate.set()
+        self.kernel.shutdown()
+    
+    def wait_for_flights(self, count):
+        for _ in range(500):
+            if self.kernel.single_flight.in_flight >= count:
+                return
+            time.sleep(0.002)
+    
+    def stampede(self, action, params, callers):
+        futures = [self.kernel.submit("slow", action, params) for _ in range(callers)]
+        self.wait_for_flights(1)
+        time.sleep(0.05)
+        self.gate.set()
+        return [future.result(5) for future in futures]
+    
+    def test_identical_requests_share_one_execution(self):
+        results = self.stampede("lookup", {"key": "a"}, 8)
+        
+        self.assertEqual(self.calls, ["a"])
+        self.assertTrue(all(r.success and r.data == {"key": "a"} for r in results))
+        self.assertEqual(sum(bool(r.metadata.get("coalesced")) for r in results), 7)
+        self.assertEqual(len({r.metadata["execution_id"] for r in results}), 8)
+        
+        status = self.kernel.get_status()["coalescing"]
+        self.assertEqual(status["actions"]["slow"]["lookup"], {"executions": 1, "hits": 7, "timed_out": 0})
+        self.assertEqual(status["hits"], 7)
+        self.assertEqual(status["in_flight"], 0)
+        
+        # The flight is gone once landed: the next request runs again
+        self.kernel.execute("slow", "lookup", {"key": "a"})
+        self.assertEqual(self.calls, ["a", "a"])
+    
+    def test_distinct_params_and_plain_actions_are_not_coalesced(self):
+        futures = [self.kernel.submit("slow", "lookup", {"key": k}) for k in "abc"]
+        futures += [self.kernel.submit("slow", "plain", {"key": "p"}) for _ in range(3)]
+        self.wait_for_flights(3)
+        time.sleep(0.05)
+        self.gate.set()
+        for future in futures:
+            self.assertTrue(future.result(5).success)
+        self.assertEqual(sorted(self.calls), ["a", "b", "c", "p", "p", "p"])
+    
+    def test_lossy_params_are_not_coalesced(self):
+        leader = self.kernel.submit("slow", "lookup", {"key": "k", "tags": {"1": 0}})
+        self.wait_for_flights(1)
+        other = self.kernel.submit("slow", "lookup", {"key": "k", "tags": {1: 0}})
+        for _ in range(500):
+            if len(self.calls) == 2:
+                break
+            time.sleep(0.002)
+        self.gate.set()
+        
+        self.assertNotIn("coalesced", other.result(5).metadata)
+        self.assertTrue(leader.result(5).success)
+        self.assertEqual(self.calls, ["k", "k"])
+        self.assertEqual(self.kernel.get_status()["coalescing"]["hits"], 0)
+    
+    def test_failure_is_shared(self):
+        results = self.stampede("lookup", {"key": "bad"}, 4)
+        self.assertEqual(self.calls, ["bad"])
+        for result in results:
+            self.assertFalse(result.success)
+            self.assertEqual(result.error, "lookup failed")
+            self.assertEqual(result.metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+    
+    def test_follower_timeout(self):
+        leader = self.kernel.submit("slow", "lookup", {"key": "t"})
+        self.wait_for_flights(1)
+        follower = self.kernel.execute("slow", "lookup", {"key": "t"}, timeout=0.05)
+        self.assertEqual(follower.metadata["error_code"], ErrorCode.TIMEOUT)
+        self.gate.set()
+        self.assertTrue(leader.result(5).success)
+        self.assertEqual(self.kernel.get_status()["coalescing"]["actions"]["slow"]["lookup"]["timed_out"], 1)
+    
+    def test_async_and_thread_callers_share_a_flight(self):
+        async def scenario():
+            leader = asyncio.ensure_future(self.kernel.execute_async("slow", "alookup", {"key": "x"}))
+            await asyncio.sleep(0.02)
+            followers = [self.kernel.execute_async("slow", "alookup", {"key": "x"}) for _ in range(5)]
+            threaded = self.kernel.submit("slow", "alookup", {"key": "x"})
+            tasks = [asyncio.ensure_future(f) for f in followers]
+            await asyncio.sleep(0.05)
+            self.gate.set()
+            return [await leader] + list(await asyncio.gather(*tasks)), threaded.result(5)
+        
+        results, threaded = asyncio.run(scenario())
+        self.assertEqual(self.calls, ["x"])
+        self.assertTrue(all(r.data == {"key": "x"} for r in results))
+        self.assertTrue(threaded.metadata["coalesced"])
+        self.assertEqual(self.kernel.get_status()["coalescing"]["actions"]["slow"]["alookup"]["hits"], 6)
+
+
+class TestExecuteStream(unittest.TestCase):
+    """Test streamed executions"""
+    
+    def setUp(self):
+        self.produced = produced = []
+        
+        class RowsModule:
+            def rows(self, params, context):
+                for i in range(params.get("n", 3)):
+                    if params.get("fail_at") == i:
+                        raise ValueError("bad row")
+                    produced.append(i)
+                    yield {"row": i}
+            
+            async def arows(self, params, context):
+                for i in range(params.get("n", 3)):
+                    await asyncio.sleep(0)
+                    yield i
+            
+            def total(self, params, context):
+                return 42
+        
+        self.kernel = KernelCore()
+        self.kernel.register_module("rows", RowsModule)
+    
+    def tearDown(self):
+        self.kernel.shutdown()
+    
+    def test_chunks_are_produced_on_demand(self):
+        stream = self.kernel.execute_stream("rows", "rows", {"n": 3})
+        self.assertEqual(self.produced, [])
+        self.assertEqual(next(stream), {"row": 0})
+        self.assertEqual(self.produced, [0])
+        self.assertEqual(list(stream), [{"row": 1}, {"row": 2}])
+        
+        self.assertTrue(stream.result.success)
+        self.assertEqual(stream.result.metadata["chunks"], 3)
+        self.assertEqual(self.kernel.get_status()["pools"]["rows"]["leased"], 0)
+    
+    def test_failure_ends_stream_with_error_trailer(self):
+        stream = self.kernel.execute_stream("rows", "rows", {"fail_at": 2})
+        self.assertEqual(len(list(stream)), 2)
+        self.assertFalse(stream.result.success)
+        self.assertEqual(stream.result.error, "bad row")
+        self.assertEqual(stream.result.metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+        
+        missing = self.kernel.execute_stream("rows", "nope")
+        self.assertEqual(list(missing), [])
+        self.assertEqual(missing.result.metadata["error_code"], ErrorCode.ACTION_NOT_FOUND)
+    
+    def test_close_releases_instance(self):
+        with self.kernel.execute_stream("rows", "rows", {"n": 100}) as stream:
+            next(stream)
+            self.assertEqual(self.kernel.get_status()["pools"]["rows"]["leased"], 1)
+        self.assertEqual(stream.result.metadata["complete"], False)
+        self.assertEqual(self.kernel.get_status()["pools"]["rows"]["leased"], 0)
+        self.assertEqual(self.produced, [0])
+    
+    def test_plain_and_async_actions(self):
+        self.assertEqual(list(self.kernel.execute_stream("rows", "total")), [42])
+        self.assertEqual(list(self.kernel.execute_stream("rows", "arows")), [0, 1, 2])
+        # execute() still returns one value: generator output as a list
+        self.assertEqual(self.kernel.execute("rows", "rows", {"n": 2}).data, [{"row": 0}, {"row": 1}])
+        
+        async def consume(action):
+            stream = await self.kernel.execute_stream_async("rows", action, {"n": 2})
+            return [chunk async for chunk in stream], stream.result
+        
+        chunks, trailer = asyncio.run(consume("arows"))
+        self.assertEqual(chunks, [0, 1])
+        self.assertEqual(trailer.metadata["chunks"], 2)
+        chunks, _ = asyncio.run(consume("rows"))
+        self.assertEqual(chunks, [{"row": 0}, {"row": 1}])
+        self.assertEqual(asyncio.run(self.kernel.execute_async("rows", "arows")).data, [0, 1, 2])
+
+
+class TestInterceptors(unittest.TestCase):
+    """Test the interceptor chain around execute"""
+    
+    def setUp(self):
+        class EchoModule:
+            def echo(self, params, context):
+                return params
+            
+            def fail(self, params, context):
+                raise ValueError("broken")
+        
+        self.kernel = KernelCore()
+        self.kernel.register_module("echo", EchoModule)
+    
+    def test_chain_order_and_removal(self):
+        calls = []
+        
+        def tag(name):
+            def interceptor(call, module_name, action, params, context, timeout):
+                calls.append(name)
+                return call(module_name, action, params, context, timeout)
+            return interceptor
+        
+        outer, inner = tag("outer"), tag("inner")
+        self.assertNotIn("execute", vars(self.kernel))
+        self.kernel.add_interceptor(outer)
+        self.kernel.add_interceptor(inner)
+        self.assertTrue(self.kernel.execute("echo", "echo", {"x": 1}).success)
+        self.assertEqual(calls, ["outer", "inner"])
+        self.assertTrue(self.kernel.submit("echo", "echo").result().success)
+        self.assertEqual(len(calls), 4)
+        
+        self.assertTrue(self.kernel.remove_interceptor(outer))
+        self.assertTrue(self.kernel.remove_interceptor(inner))
+        self.assertFalse(self.kernel.remove_interceptor(inner))
+        self.assertNotIn("execute", vars(self.kernel))
+    
+    def test_short_circuit(self):
+        def deny_all(call, module_name, action, params, context, timeout):
+            return ExecutionResult.error("blocked")
+        
+        self.kernel.add_interceptor(deny_all)
+        self.assertEqual(self.kernel.execute("echo", "echo").error, "blocked")
+    
+    def test_permission_and_error_handler_interceptors(self):
+        perms = Permissions()
+        perms.set_user_permissions("alice", ["echo:echo"])
+        handler = ErrorHandler()
+        self.kernel.add_interceptor(PermissionInterceptor(perms))
+        self.kernel.add_interceptor(ErrorHandlerInterceptor(handler))
+        
+        self.assertTrue(self.kernel.execute("echo", "echo", {}, {"user": "alice"}).success)
+        denied = self.kernel.execute("echo", "fail", {}, {"user": "alice"})
+        self.assertEqual(denied.metadata["error_code"], ErrorCode.PERMISSION_DENIED)
+        self.assertEqual(handler.get_error_stats()["total"], 0)
+        
+        self.assertFalse(self.kernel.execute("echo", "fail").success)
+        history = handler.get_error_history()
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]["code"], ErrorCode.EXECUTION_FAILED)
+        self.assertEqual(history[0]["context"]["module"], "echo")
+    
+    def test_observability_interceptors(self):
+        class FakeLogger:
+            def __init__(self):
+                self.entries = []
+            
+            def info(self, message, module=None, execution_id=None, metadata=None):
+                self.entries.append(("info", message, module))
+            
+            def error(self, message, module=None, execution_id=None, metadata=None):
+                self.entries.append(("error", message, metadata["error"]))
+        
+        class FakeHistory:
+            def __init__(self):
+                self.records = {}
+            
+            def start_execution(self, module, action, params, context):
+                self.records["exec_1"] = "running"
+                return "exec_1"
+            
+            def end_execution(self, execution_id, result, status, duration_ms):
+                self.records[execution_id] = status
+        
+        logger, history = FakeLogger(), FakeHistory()
+        self.kernel.add_interceptor(LoggingInterceptor(logger))
+        self.kernel.add_interceptor(HistoryInterceptor(history))
+        
+        self.kernel.execute("echo", "echo")
+        self.assertEqual(logger.entries[-1], ("info", "Executed echo.echo", "echo"))
+        self.assertEqual(history.records["exec_1"], "success")
+        
+        self.kernel.execute("echo", "fail")
+        self.assertEqual(logger.entries[-1], ("error", "Failed echo.fail", "broken"))
+        self.assertEqual(history.records["exec_1"], "failed")
+    
+    def test_every_entry_point_is_intercepted(self):
+        class Chunks:
+            def count(self, params, context):
+                yield from range(params.get("n", 3))
+        
+        self.kernel.register_module("chunks", Chunks)
+        seen = []
+        
+        def audit(call, module_name, action, params, context, timeout):
+            if action == "fail":
+                return ExecutionResult.error("blocked")
+            result = call(module_name, action, params, dict(context or {}, audited=True), timeout)
+            seen.append((action, result.success))
+            return result
+        
+        self.kernel.add_interceptor(audit)
+        self.addCleanup(self.kernel.shutdown)
+        
+        async def run_async():
+            result = await self.kernel.execute_async("echo", "echo", {"x": 1})
+            denied = await self.kernel.execute_async("echo", "fail")
+            stream = await self.kernel.execute_stream_async("chunks", "count")
+            chunks = [chunk async for chunk in stream]
+            workflow = await self.kernel.execute_workflow_async([{"id": "a", "module": "echo", "action": "echo"}])
+            return result, denied, chunks, stream.result, workflow
+        
+        result, denied, chunks, trailer, workflow = asyncio.run(run_async())
+        self.assertEqual(result.data, {"x": 1})
+        self.assertEqual(denied.error, "blocked")
+        self.assertEqual(chunks, [0, 1, 2])
+        self.assertEqual(trailer.metadata["chunks"], 3)
+        self.assertTrue(workflow.success)
+        
+        stream = self.kernel.execute_stream("chunks", "count", {"n": 2})
+        self.assertEqual(list(stream), [0, 1])
+        blocked = self.kernel.execute_stream("echo", "fail")
+        self.assertEqual(list(blocked), [])
+        self.assertEqual(blocked.result.error, "blocked")
+        
+        batch = self.kernel.execute_batch([("echo", "echo", {"y": 2}), ("echo", "fail"), ("echo", "missing")])
+        self.assertEqual(batch[0].data, {"y": 2})
+        self.assertEqual(batch[1].error, "blocked")
+        self.assertEqual(batch[2].error, "Action not found: missing")
+        
+        # Streams report to the chain once they finish, from the chain's thread
+        for _ in range(500):
+            if len(seen) == 6:
+                break
+            time.sleep(0.002)
+        self.assertEqual(sorted(seen), [
+            ("count", True), ("count", True), ("echo", True), ("echo", True), ("echo", True), ("missing", False)
+        ])
+    
+    
+    def test_async_interceptors_hold_no_thread(self):
+        class Slow:
+            async def wait(self, params, context):
+                await asyncio.sleep(0.1)
+                return params
+        
+        class Audit:
+            def __init__(self):
+                self.seen = []
+            
+            def __call__(self, call, module_name, action, params, context, timeout):
+                raise AssertionError("async entry points await intercept_async")
+            
+            async def intercept_async(self, call, module_name, action, params, context, timeout):
+                result = await call(module_name, action, params, context, timeout)
+                self.seen.append(result.success)
+                return result
+        
+        kernel = KernelCore(max_workers=2)
+        kernel.register_module("slow", Slow, manifest={"runtime": {"pool": {"size": 20}}})
+        audit = Audit()
+        kernel.add_interceptor(audit)
+        kernel.add_interceptor(PermissionInterceptor())
+        self.addCleanup(kernel.shutdown)
+        
+        async def run():
+            return await asyncio.gather(*(kernel.execute_async("slow", "wait", {"i": i}) for i in range(20)))
+        
+        started = time.perf_counter()
+        results = asyncio.run(run())
+        # Twenty 0.1 s calls on a two-thread pool would take a second
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual([r.data["i"] for r in results], list(range(20)))
+        self.assertEqual(audit.seen, [True] * 20)
+    
+    def test_intercepted_streams_are_bounded(self):
+        class Chunks:
+            def count(self, params, context):
+                yield from range(2)
+        
+        kernel = KernelCore(max_workers=2)
+        kernel.register_module("chunks", Chunks)
+        self.addCleanup(kernel.shutdown)
+        
+        class Logger:
+            def info(self, message, module=None, execution_id=None, metadata=None):
+                pass
+        
+        kernel.add_interceptor(LoggingInterceptor(Logger()))
+        threads = threading.active_count()
+        streams = [kernel.execute_stream("chunks", "count") for _ in range(20)]
+        # The interceptor loop and the pool threads that opened the streams
+        self.assertLessEqual(threading.active_count(), threads + 3)
+        self.assertEqual([list(stream) for stream in streams], [[0, 1]] * 20)
+        
+        def passthrough(call, module_name, action, params, context, timeout):
+            return call(module_name, action, params, context, timeout)
+        
+        kernel.add_interceptor(passthrough)
+        held = [kernel.execute_stream("chunks", "count") for _ in range(2)]
+        refused = kernel.execute_stream("chunks", "count")
+        self.assertEqual(list(refused), [])
+        self.assertEqual(refused.result.metadata["error_code"], ErrorCode.OVERLOADED)
+        for stream in held:
+            stream.close()
+        # Their slots come back once their chains return
+        for _ in range(500):
+            stream = kernel.execute_stream("chunks", "count")
+            if stream.result is None:
+                break
+            time.sleep(0.002)
+        self.assertEqual(list(stream), [0, 1])
+    
+    def test_stream_chain_calling_twice(self):
+        class Chunks:
+            def count(self, params, context):
+                yield from range(3)
+        
+        self.kernel.register_module("chunks", Chunks)
+        self.addCleanup(self.kernel.shutdown)
+        retried = []
+        
+        def retry(call, module_name, action, params, context, timeout):
+            result = call(module_name, action, params, context, timeout)
+            retried.append(call(module_name, action, params, context, timeout))
+            return result
+        
+        self.kernel.add_interceptor(retry)
+        stream = self.kernel.execute_stream("chunks", "count")
+        self.assertEqual(list(stream), [0, 1, 2])
+        for _ in range(500):
+            if retried:
+                break
+            time.sleep(0.002)
+        self.assertFalse(retried[0].success)
+        self.assertIn("already opened", retried[0].error)
+        self.assertTrue(stream.result.success)
+
+
+class TestParamSchema(unittest.TestCase):
+    """Test compiled manifest param schemas"""
+    
+    SCHEMA = {
+        "type": "object",
+        "required": ["a"],
+        "additionalProperties": False,
+        "properties": {
+            "a": {"type": "number", "minimum": 0},
+            "tags": {"type": "array", "items": {"type": "string", "maxLength": 3}},
+            "mode": {"enum": ["fast", "safe"]}
+        }
+    }
+    
+    def setUp(self):
+        class SumModule:
+            def get_manifest(self):
+                return {"name": "sum", "params": {"total": TestParamSchema.SCHEMA}}
+            
+            def total(self, params, context):
+                return params["a"]
+        
+        self.kernel = KernelCore()
+        self.kernel.register_module("sum", SumModule)
+    
+    def test_all_errors_in_one_pass(self):
+        validator = compile_schema(self.SCHEMA)
+        errors = validator.validate({"a": -1, "tags": ["ok", "long", 3], "mode": "x", "extra": 1})
+        self.assertEqual(errors, [
+            "params.a: must be >= 0",
+            "params.tags[1]: length must be <= 3",
+            "params.tags[2]: expected string, got int",
+            "params.mode: must be one of ['fast', 'safe']",
+            "params.extra: is not allowed"
+        ])
+        self.assertEqual(validator.validate({"a": 2, "tags": ["ok"]}), [])
+        self.assertEqual(validator.validate({}), ["params.a: is required"])
+    
+    def test_validate_many(self):
+        validator = compile_schema(self.SCHEMA)
+        results = validator.validate_many([{"a": 1}, {"a": True}, []])
+        self.assertEqual(results[0], [])
+        self.assertEqual(results[1], ["params.a: expected number, got bool"])
+        self.assertEqual(results[2], ["params: expected object, got list"])
+    
+    def test_invalid_schema_rejected_at_registration(self):
+        class BadModule:
+            def get_manifest(self):
+                return {"params": {"run": {"type": "decimal"}}}
+            
+            def run(self, params, context):
+                return None
+        
+        with self.assertRaises(SchemaError):
+            self.kernel.register_module("bad", BadModule)
+    
+    def test_kernel_rejects_invalid_params(self):
+        self.assertEqual(self.kernel.execute("sum", "total", {"a": 3}).data, 3)
+        
+        result = self.kernel.execute("sum", "total", {"a": "3", "extra": 1})
+        self.assertFalse(result.success)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.VALIDATION)
+        self.assertEqual(len(result.metadata["error_details"]["errors"]), 2)
+        
+        results = self.kernel.execute_batch([
+            ("sum", "total", {"a": 1}, None),
+            ("sum", "total", {}, None)
+        ])
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[1].metadata["error_code"], ErrorCode.VALIDATION)
+    
+    def test_input_validator_schema(self):
+        validator = compile_schema(self.SCHEMA)
+        self.assertTrue(InputValidator.validate_params({"a": 1}, schema=validator))
+        with self.assertRaises(ValidationError):
+            InputValidator.validate_params({"a": -1}, schema=validator)
+
+
+class TestModuleLocator(unittest.TestCase):
+    """Test manifest-indexed module discovery"""
+    
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.cache, "index", "modules.json")
+        self.write_package("greeter-pkg", "locator_greeter", "Greeter", """
+class Greeter:
+    def greet(self, params, context):
+        return "hello " + params["name"]
+""")
+    
+    def tearDown(self):
+        for name in ("locator_greeter", "locator_broken", "locator_late"):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.root, ignore_errors=True)
+        shutil.rmtree(self.cache, ignore_errors=True)
+    
+    def write_package(self, directory, name, class_name, source, **entry):
+        package = os.path.join(self.root, directory)
+        os.makedirs(os.path.join(package, "src"))
+        with open(os.path.join(package, "src", f"{name}.py"), "w") as f:
+            f.write(source)
+        with open(os.path.join(package, "manifest.json"), "w") as f:
+            json.dump({
+                "name": directory,
+                "version": "1.2.0",
+                "modules": [{
+                    "name": name,
+                    "entry_point": f"src/{name}.py",
+                    "class": class_name,
+                    "actions": [],
+                    **entry
+                }]
+            }, f)
+    
+    def locator(self):
+        return ModuleLocator([self.root], self.index_path)
+    
+    def test_imports_on_first_execution(self):
+        kernel = KernelCore(locator=self.locator())
+        self.assertIn("locator_greeter", kernel.locator.available())
+        self.assertNotIn("locator_greeter", sys.modules)
+        
+        result = kernel.execute("locator_greeter", "greet", {"name": "kernel"})
+        self.assertTrue(result.success)
+        self.assertEqual(result.data, "hello kernel")
+        self.assertEqual(kernel.get_manifest("locator_greeter")["version"], "1.2.0")
+        self.assertFalse(kernel.execute("missing", "greet").success)
+    
+    def test_manifest_runtime_and_params(self):
+        self.write_package("tuned-pkg", "locator_tuned", "Tuned", """
+class Tuned:
+    calls = 0
+    
+    def square(self, params, context):
+        Tuned.calls += 1
+        return params["n"] ** 2
+""", runtime={"pool": {"size": 2}, "actions": {"square": {"pure": True}}},
+            params={"square": {"type": "object", "required": ["n"]}})
+        self.addCleanup(sys.modules.pop, "locator_tuned", None)
+        kernel = KernelCore(locator=self.locator())
+        
+        self.assertEqual(kernel.execute("locator_tuned", "square", {"n": 3}).data, 9)
+        self.assertTrue(kernel.execute("locator_tuned", "square", {"n": 3}).metadata["cached"])
+        self.assertEqual(kernel.modules["locator_tuned"].calls, 1)
+        invalid = kernel.execute("locator_tuned", "square", {})
+        self.assertEqual(invalid.metadata["error_code"], ErrorCode.VALIDATION)
+        self.assertEqual(kernel.get_status()["pools"]["locator_tuned"]["settings"]["size"], 2)
+    
+    def test_reload_imports_current_file(self):
+        kernel = KernelCore(locator=self.locator())
+        self.assertEqual(kernel.execute("locator_greeter", "greet", {"name": "a"}).data, "hello a")
+        with open(os.path.join(self.root, "greeter-pkg", "src", "locator_greeter.py"), "w") as f:
+            f.write("class Greeter:\n    def greet(self, params, context):\n        return 'hi ' + params['name']\n")
+        
+        report = kernel.reload_module("locator_greeter")
+        self.assertTrue(report["success"], report)
+        self.assertEqual(report["version"], "1.2.0")
+        self.assertEqual(kernel.execute("locator_greeter", "greet", {"name": "a"}).data, "hi a")
+        self.assertIs(kernel.locator.load("locator_greeter")[0], kernel.modules["locator_greeter"])
+        
+        for _ in range(3):
+            self.assertTrue(kernel.reload_module("locator_greeter")["success"])
+        generations = [name for name in sys.modules if name.startswith("locator_greeter__")]
+        self.assertEqual(generations, [kernel.modules["locator_greeter"].__module__])
+    
+    def test_index_revalidated_by_mtime(self):
+        first = self.locator()
+        first.available()
+        self.assertEqual(first.rescans, 1)
+        self.assertTrue(os.path.exists(self.index_path))
+        
+        cached = self.locator()
+        self.assertIn("locator_greeter", cached.available())
+        self.assertEqual(cached.rescans, 0)
+        
+        self.write_package("late-pkg", "locator_late", "Late", "class Late:\n    pass\n")
+        self.assertIsNotNone(cached.find("locator_late"))
+        self.assertEqual(cached.rescans, 1)
+    
+    def test_load_failure(self):
+        self.write_package("broken-pkg", "locator_broken", "Broken", "raise ImportError('missing dep')\n")
+        kernel = KernelCore(locator=self.locator())
+        result = kernel.execute("locator_broken", "run")
+        self.assertFalse(result.success)
+        self.assertEqual(result.metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+        self.assertIn("missing dep", result.error)
+    
+    def test_registration_failure(self):
+        self.write_package("broken-pkg", "locator_broken", "Broken", """
+class Broken:
+    def get_manifest(self):
+        return {"runtime": {"pool": {"size": 0}}}
+    
+    def run(self, params, context):
+        return "ran"
+""")
+        kernel = KernelCore(locator=self.locator())
+        result = kernel.execute("locator_broken", "run")
+        self.assertEqual(result.metadata["error_code"], ErrorCode.EXECUTION_FAILED)
+        self.assertIn("Module failed to load: locator_broken", result.error)
+        
+        results = kernel.execute_batch([("locator_broken", "run"), ("locator_greeter", "greet", {"name": "b"})])
+        self.assertIn("Module failed to load", results[0].error)
+        self.assertEqual(results[1].data, "hello b")
+        with self.assertRaises(ModuleLoadError):
+            kernel._lookup("locator_broken")
+
+
+class TestBatchCli(unittest.TestCase):
+    """Test `cli.py execute --batch`"""
+    
+    def run_batch(self, lines, *options):
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir, ignore_errors=True)
+        env = dict(os.environ, AGENT_KERNEL_INDEX=os.path.join(workdir, "index.json"))
+        command = [
+            sys.executable, os.path.join(os.path.dirname(__file__), "..", "cli.py"),
+            "execute", "--batch", "-", "--module", "example_module",
+            "--socket", os.path.join(workdir, "none.sock")
+        ] + list(options)
+        completed = subprocess.run(
+            command, input="\n".join(lines) + "\n", env=env,
+            stdout=subprocess.PIPE, universal_newlines=True, timeout=60
+        )
+        return completed.returncode, [json.loads(line) for line in completed.stdout.splitlines()]
+    
+    def test_results_in_order_with_summary(self):
+        lines = [json.dumps({"action": "echo", "params": {"message": f"m{i}"}}) for i in range(20)]
+        lines[5] = "not json"
+        code, output = self.run_batch(lines, "--workers", "3")
+        
+        self.assertEqual(code, 1)
+        results, summary = output[:-1], output[-1]["summary"]
+        self.assertEqual(len(results), 20)
+        self.assertFalse(results[5]["success"])
+        self.assertIn("line 6", results[5]["error"])
+        self.assertEqual(
+            [r["data"]["result"] for i, r in enumerate(results) if i != 5],
+            [f"m{i}" for i in range(20) if i != 5]
+        )
+        self.assertEqual((summary["requests"], summary["succeeded"], summary["rejected"]), (20, 19, 1))
+        self.assertEqual(summary["mode"], "in-process")
+        self.assertGreater(summary["requests_per_second"], 0)
+    
+    def test_unordered_results_carry_index(self):
+        lines = [json.dumps({"action": "add", "params": {"a": i, "b": 1}}) for i in range(10)]
+        code, output = self.run_batch(lines, "--workers", "4", "--unordered")
+        
+        self.assertEqual(code, 0)
+        results = {r["index"]: r["data"]["result"] for r in output[:-1]}
+        self.assertEqual(results, {i: i + 1 for i in range(10)})
+        self.assertEqual(output[-1]["summary"]["succeeded"], 10)
+
+
+class TestReloadModule(unittest.TestCase):
+    """Test hot-reloading module code in a running kernel"""
+    
+    def setUp(self):
+        self.kernel = KernelCore()
+    
+    def tearDown(self):
+        self.kernel.shutdown()
+    
+    def test_swap_keeps_in_flight_on_old_version(self):
+        started = threading.Event()
+        release = threading.Event()
+        
+        class V1:
+            def version(self, params, context):
+                if params.get("slow"):
+                    started.set()
+                    release.wait(5)
+                return 1
+        
+        class V2:
+            def version(self, params, context):
+                return 2
+        
+        manifest = {"version": "1.0.0", "runtime": {"pool": {"size": 2}}}
+        self.kernel.register_module("svc", V1, manifest=manifest)
+        old_pool = self.kernel._table.get("svc").pool
+        in_flight = self.kernel.submit("svc", "version", {"slow": True})
+        self.assertTrue(started.wait(5))
+        
+        reports = []
+        reloading = threading.Thread(target=lambda: reports.append(
+            self.kernel.reload_module("svc", V2, manifest=dict(manifest, version="2.0.0"))
+        ))
+        reloading.start()
+        for _ in range(500):
+            if self.kernel._table.get("svc").module_class is V2:
+                break
+            time.sleep(0.002)
+        # The swap happened while the old execution is still running
+        self.assertEqual(self.kernel.execute("svc", "version").data, 2)
+        self.assertFalse(old_pool.get_status()["closed"])
+        
+        release.set()
+        reloading.join(5)
+        self.assertEqual(in_flight.result(5).data, 1)
+        
+        report = reports[0]
+        self.assertTrue(report["success"])
+        self.assertTrue(report["drained"])
+        self.assertEqual((report["old_version"], report["version"]), ("1.0.0", "2.0.0"))
+        self.assertEqual(report["warmed"], 1)
+        for key in ("load_ms", "warm_ms", "drain_ms", "total_ms"):
+            self.assertGreaterEqual(report[key], 0)
+        self.assertEqual(old_pool.get_status()["alive"], 0)
+        self.assertTrue(old_pool.get_status()["closed"])
+        self.assertEqual(self.kernel.get_status()["reloads"]["svc"]["reloads"], 1)
+    
+    def test_reload_waits_for_resolved_executions(self):
+        class V1:
+            def version(self, params, context):
+                return 1
+        
+        class V2:
+            def version(self, params, context):
+                return 2
+        
+        self.kernel.register_module("svc", V1)
+        # An execution that resolved the entry and has not leased an instance yet
+        entry = self.kernel._checkout("svc")
+        reports = []
+        reloading = threading.Thread(target=lambda: reports.append(self.kernel.reload_module("svc", V2)))
+        reloading.start()
+        while self.kernel._table.get("svc").module_class is not V2:
+            time.sleep(0.001)
+        reloading.join(0.05)
+        self.assertTrue(reloading.is_alive())
+        self.assertEqual(self.kernel.execute("svc", "version").data, 2)
+        
+        with entry.pool.lease() as module:
+            self.assertEqual(entry.dispatch["version"].handler(module, {}, {}), 1)
+        entry.leave()
+        reloading.join(5)
+        self.assertTrue(reports[0]["drained"])
+        self.assertTrue(entry.pool.get_status()["closed"])
+    
+    def test_failed_reload_keeps_running_version(self):
+        class Good:
+            def ping(self, params, context):
+                return "good"
+        
+        class Broken:
+            def initialize(self, config):
+                return False
+            
+            def ping(self, params, context):
+                return "broken"
+        
+        self.kernel.register_module("svc", Good)
+        report = self.kernel.reload_module("svc", Broken)
+        self.assertFalse(report["success"])
+        self.assertEqual(report["stage"], "warm")
+        self.assertEqual(report["error_code"], ErrorCode.EXECUTION_FAILED)
+        self.assertEqual(self.kernel.execute("svc", "ping").data, "good")
+        
+        missing = self.kernel.reload_module("nope")
+        self.assertEqual(missing["error_code"], ErrorCode.MODULE_NOT_FOUND)
+        stats = self.kernel.get_status()["reloads"]["svc"]
+        self.assertEqual((stats["reloads"], stats["failures"]), (1, 1))
+    
+    def test_reimports_changed_source(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, "reload_counter.py")
+        source = "class Counter:\n    def step(self, params, context):\n        return %d\n"
+        with open(path, "w") as f:
+            f.write(source % 1)
+        sys.path.insert(0, directory)
+        self.addCleanup(sys.path.remove, directory)
+        self.addCleanup(sys.modules.pop, "reload_counter", None)
+        from reload_counter import Counter
+        
+        self.kernel.register_module("counter", Counter, config={"start": 5})
+        with open(path, "w") as f:
+            f.write(source % 2)
+        report = self.kernel.reload_module("counter")
+        
+        self.assertTrue(report["success"], report)
+        self.assertEqual(self.kernel.execute("counter", "step").data, 2)
+        self.assertEqual(self.kernel._table.get("counter").pool.config, {"start": 5})
+        # The loaded module is left alone
+        self.assertEqual(Counter().step({}, {}), 1)
+    
+    def test_reloads_release_superseded_imports(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with open(os.path.join(directory, "reload_released.py"), "w") as f:
+            f.write("class Released:\n    def ping(self, params, context):\n        return 'pong'\n")
+        sys.path.insert(0, directory)
+        self.addCleanup(sys.path.remove, directory)
+        self.addCleanup(sys.modules.pop, "reload_released", None)
+        from reload_released import Released
+        
+        def generations():
+            return [name for name in sys.modules if name.startswith("reload_released__")]
+        
+        self.kernel.register_module("released", Released)
+        for _ in range(5):
+            self.assertTrue(self.kernel.reload_module("released")["success"])
+        # Only the running generation stays imported besides the original
+        self.assertEqual(generations(), [self.kernel.modules["released"].__module__])
+        self.assertIn("reload_released", sys.modules)
+        
+        self.kernel.reload_module("released", Released)
+        self.assertEqual(generations(), [])
+        self.assertEqual(self.kernel.execute("released", "ping").data, "pong")
+
+
 class TestExecutionResult(unittest.TestCase):
     """Test ExecutionResult class"""
     
@@ -86,6 +2266,18 @@ class TestExecutionResult(unittest.TestCase):
         d = result.to_dict()
         self.assertTrue(d["success"])
         self.assertIn("timestamp", d)
+    
+    def test_to_json_matches_dict(self):
+        result = ExecutionResult.error("bad", metadata={"error_code": "E005"})
+        self.assertEqual(json.loads(result.to_json()), result.to_dict())
+        buffer = io.StringIO()
+        result.write_json(buffer)
+        self.assertEqual(json.loads(buffer.getvalue()), result.to_dict())
+    
+    def test_lazy_timestamp(self):
+        result = ExecutionResult(True, timestamp=0.0)
+        self.assertEqual(result.timestamp, "1970-01-01T00:00:00")
+        self.assertFalse(hasattr(result, "__dict__"))
 
 
 class TestInputValidator(unittest.TestCase):
@@ -130,6 +2322,32 @@ class TestInputValidator(unittest.TestCase):
         
         with self.assertRaises(ValidationError):
             validate_input({})
+    
+    def test_validate_batch(self):
+        errors = InputValidator.validate_batch([
+            {"module": "test", "action": "run"},
+            {"module": "test"},
+            "not a dict"
+        ])
+        self.assertIsNone(errors[0])
+        self.assertIn("Missing required fields", errors[1])
+        self.assertEqual(errors[2], "Request must be a dictionary")
+    
+    def test_invalid_names_stay_invalid_when_cached(self):
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                InputValidator.validate_action("bad-action")
+            with self.assertRaises(ValidationError):
+                InputValidator.validate_context({"user": "a", "token": "x"})
+    
+    def test_trusted_request(self):
+        request = TrustedRequest("test", "run", {"a": 1}, {"user": "alice"})
+        self.assertTrue(validate_input(request))
+        self.assertEqual(request["params"], {"a": 1})
+        with self.assertRaises(TypeError):
+            request["module"] = "other"
+        with self.assertRaises(ValidationError):
+            TrustedRequest("test", "bad-action")
 
 
 class TestPermissions(unittest.TestCase):
@@ -167,6 +2385,38 @@ class TestPermissions(unittest.TestCase):
         
         with self.assertRaises(PermissionError):
             self.perms.require_permission("user1", "write")
+    
+    def test_wildcards(self):
+        self.perms.set_user_permissions("user1", ["calc:*", "orbit:*:read", "*:status"])
+        self.assertTrue(self.perms.check_access("user1", "calc", "add"))
+        self.assertTrue(self.perms.has_permission("user1", "calc:add:fast"))
+        self.assertFalse(self.perms.has_permission("user1", "calc"))
+        self.assertTrue(self.perms.has_permission("user1", "orbit:deploy:read"))
+        self.assertFalse(self.perms.has_permission("user1", "orbit:deploy:write"))
+        self.assertTrue(self.perms.check_access("user1", "anything", "status"))
+        
+        self.perms.set_user_permissions("root", ["*"])
+        self.assertTrue(self.perms.check_access("root", "any", "action"))
+    
+    def test_blacklist_overrides_wildcards(self):
+        self.perms.set_user_permissions("user1", ["calc:*"])
+        self.perms.blacklist("user1", ["calc:divide"])
+        self.assertTrue(self.perms.check_access("user1", "calc", "add"))
+        self.assertFalse(self.perms.check_access("user1", "calc", "divide"))
+    
+    def test_mutation_invalidates_decisions(self):
+        self.assertFalse(self.perms.check_access("user1", "calc", "add"))
+        generation = self.perms.generation
+        self.perms.add_user_permission("user1", "calc:add")
+        self.assertGreater(self.perms.generation, generation)
+        self.assertTrue(self.perms.check_access("user1", "calc", "add"))
+    
+    def test_check_access_many(self):
+        self.perms.set_user_permissions("user1", ["calc:*", "demo:run"])
+        self.assertEqual(
+            self.perms.check_access_many("user1", [("calc", "add"), ("demo", "stop"), ("demo", "run")]),
+            [True, False, True]
+        )
 
 
 class TestErrorHandler(unittest.TestCase):
@@ -202,6 +2452,44 @@ class TestErrorHandler(unittest.TestCase):
         self.handler.clear_history()
         
         self.assertEqual(len(self.handler.get_error_history()), 0)
+    
+    def test_history_is_bounded(self):
+        handler = ErrorHandler(capacity=5, sample_after=1000)
+        for i in range(20):
+            handler.handle(ValueError(f"error {i}"))
+        
+        history = handler.get_error_history()
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history[-1]["message"], "error 19")
+    
+    def test_traceback_formatted_on_read(self):
+        try:
+            raise KernelError("boom", ErrorCode.EXECUTION_FAILED, {"module": "calc"})
+        except KernelError as e:
+            self.handler.handle(e)
+        
+        entry = self.handler.get_error_history()[0]
+        self.assertIn("Traceback (most recent call last)", entry["traceback"])
+        self.assertIn("test_traceback_formatted_on_read", entry["traceback"])
+        self.assertIn("boom", entry["traceback"])
+    
+    def test_aggregates_and_sampling(self):
+        handler = ErrorHandler(sample_after=2, sample_every=10)
+        for _ in range(30):
+            handler.handle(ValueError("flaky"), {"module": "calc"})
+        handler.handle(ModuleNotFoundError("other"))
+        
+        stats = handler.get_error_stats()
+        self.assertEqual(stats["total"], 31)
+        self.assertEqual(stats["errors"][0]["count"], 30)
+        self.assertEqual(
+            (stats["errors"][0]["code"], stats["errors"][0]["type"], stats["errors"][0]["module"]),
+            (ErrorCode.UNKNOWN, "ValueError", "calc")
+        )
+        self.assertEqual(stats["errors"][1]["module"], "other")
+        # occurrences 1, 2, 10, 20 and 30 of the storm, plus the other error
+        self.assertEqual(stats["recorded"], 6)
+        self.assertEqual(stats["sampled_out"], 25)
 
 
 if __name__ == "__main__":
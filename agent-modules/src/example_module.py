@@ -27,6 +27,19 @@ class ExampleModule(BaseModule):
                 "status",
                 "configure"
             ],
+            "params": {
+                "echo": {
+                    "type": "object",
+                    "properties": {"message": {"type": "string"}}
+                },
+                "add": {
+                    "type": "object",
+                    "properties": {
+                        "a": {"type": "number"},
+                        "b": {"type": "number"}
+                    }
+                }
+            },
             "kernel_version": "1.0.0"
         }
     